@@ -1,8 +1,15 @@
 import streamlit as st
 import pandas as pd
-import plotly.graph_objects as go
-from src.ingestion import load_monthly_features, load_priority_table
-import streamlit.components.v1 as components
+from src.shared import DataStore
+from src.visualization import figure_spec
+from src.choropleth import geometry_url, state_boundaries
+from src.image_utils import get_image_derivative
+from src.config import (DATA_FILES, DATA_WATCH_ENABLED, DEFAULT_RISK_WEIGHTS, VIEW_CACHE_ENTRIES,
+                        TABLE_ROW_LIMITS, TABLE_PAGE_SIZE, CHOROPLETH_LEVELS, CHOROPLETH_DEFAULT_LEVEL)
+from src.tables import paginate
+from src.export import EXPORT_FORMATS, export_stream
+from src import views
+import functools
 import os
 
 # ==============================
@@ -17,14 +24,10 @@ st.set_page_config(
 # ==============================
 # Load Data
 # ==============================
-@st.cache_data
-def load_data():
-    monthly = load_monthly_features("data/feature_engineered_monthly.csv")
-    priority = load_priority_table("data/state_priority_classification_final.csv")
-    
+@st.cache_resource
+def ensure_forecasts():
     # Check if forecast file exists, if not generate it
-    forecast_path = "data/state_forecasts_3month.csv"
-    if not os.path.exists(forecast_path):
+    if not os.path.exists(DATA_FILES["forecasts"]):
         with st.spinner('Generating forecasts for the first time... (this may take a minute)'):
             try:
                 from src.generate_all_forecasts import main as generate_forecasts
@@ -32,29 +35,146 @@ def load_data():
             except Exception as e:
                 st.error(f"Failed to generate forecasts: {str(e)}")
 
-    # Load analytical CSVs with proper error handling
-    analytics = {}
-    files_to_load = [
-        ('stat_summary', 'data/statistical_summary.csv'),
-        ('regional', 'data/regional_summary.csv'),
-        ('forecasts', 'data/state_forecasts_3month.csv'),
-        ('benchmarking', 'data/state_benchmarking.csv'),
-        ('effect_size', 'data/effect_size_analysis.csv')
-    ]
-    
-    for name, path in files_to_load:
-        try:
-            if os.path.exists(path):
-                analytics[name] = pd.read_csv(path)
-            else:
-                analytics[name] = pd.DataFrame()
-        except PermissionError:
-            st.error(f"Error: Permission denied accessing {path}")
-            analytics[name] = pd.DataFrame()
-    
-    return monthly, priority, analytics
-
-df_monthly, df_priority, analytics = load_data()
+@st.cache_resource
+def data_store():
+    # One read-only snapshot per process, shared by every session. The
+    # watcher swaps in a new snapshot when data files change, reloading
+    # only what was derived from them
+    store = DataStore(DATA_FILES)
+    if DATA_WATCH_ENABLED:
+        store.watch()
+    return store
+
+ensure_forecasts()
+store = data_store()
+# Taken once per run: a reload never changes the data mid-run
+data = store.current()
+for path in sorted(store.unreadable):
+    st.error(f"Error: Permission denied accessing {path}")
+
+def dep(view):
+    # Version of only the data files a view is built from
+    return views.view_version(data, view)
+
+# ==============================
+# Cached View Models
+# ==============================
+# Each section is cached on the inputs it actually uses plus the version
+# of the files it reads, so a rerun triggered by an unrelated widget is a
+# cache lookup and a changed file only rebuilds the views that use it.
+# cache_resource shares one read-only copy across sessions.
+@st.cache_resource(max_entries=VIEW_CACHE_ENTRIES)
+def sidebar_view(version):
+    return views.sidebar_view(data)
+
+@st.cache_resource(max_entries=VIEW_CACHE_ENTRIES)
+def overview_summary_view(window, version):
+    return views.overview_summary_view(data, window)
+
+@st.cache_resource(max_entries=VIEW_CACHE_ENTRIES)
+def overview_state_view(state, risk_weights, window, version):
+    return views.overview_state_view(data, state, risk_weights, window)
+
+@st.cache_resource(max_entries=VIEW_CACHE_ENTRIES)
+def priority_matrix_view(status_filter, risk_weights, window, version):
+    return views.priority_matrix_view(data, status_filter, risk_weights, window=window)
+
+@st.cache_resource(max_entries=VIEW_CACHE_ENTRIES)
+def statistics_view(version):
+    return views.statistics_view(data)
+
+@st.cache_resource(max_entries=VIEW_CACHE_ENTRIES)
+def correlation_figure(region, start, end, version):
+    return views.correlation_view(data, region, start, end)
+
+@st.cache_resource(max_entries=VIEW_CACHE_ENTRIES)
+def geographic_view(version):
+    return views.geographic_view(data)
+
+@st.cache_resource(max_entries=VIEW_CACHE_ENTRIES)
+def forecast_view(state, version):
+    return views.forecast_view(data, state)
+
+@st.cache_resource(max_entries=VIEW_CACHE_ENTRIES)
+def state_details_view(state, version):
+    return views.state_details_view(data, state)
+
+@st.cache_resource(max_entries=VIEW_CACHE_ENTRIES)
+def similar_states_view(state, metric, version):
+    return views.similar_states_view(data, state, metric)
+
+@st.cache_resource(max_entries=VIEW_CACHE_ENTRIES)
+def map_view(metric, status_filter, state, level, window, version):
+    return views.map_view(data, metric, status_filter, state, map_geometry(level), state_boundaries().codes, window)
+
+@st.cache_resource
+def map_geometry(level):
+    # Simplified and published once per level; figures only embed the URL
+    return geometry_url(level)
+
+def image_bytes(name, width):
+    # Pre-sized JPEG (<= 1440px), passed through by st.image without re-encoding.
+    # Not cached here: image_utils keeps recent derivatives in a size-bounded
+    # LRU keyed by the source file's content hash.
+    path = DATA_FILES[name]
+    return get_image_derivative(path, width) if os.path.exists(path) else None
+
+def paged_table(name, df, version):
+    """
+    Render a table one page at a time. Filtering, sorting and paging run
+    on the cached frame; only the visible rows are sent to the browser.
+    """
+    page_size = TABLE_ROW_LIMITS.get(name, TABLE_PAGE_SIZE)
+    if len(df) <= page_size:
+        st.dataframe(df, hide_index=True, use_container_width=True)
+        return
+
+    col1, col2, col3, col4 = st.columns([3, 2, 1, 1])
+    with col1:
+        query = st.text_input("Filter", key=f"{name}_filter", placeholder="Search rows")
+    with col2:
+        sort_by = st.selectbox("Sort by", ["Default"] + list(df.columns), key=f"{name}_sort")
+    with col3:
+        descending = st.toggle("Descending", key=f"{name}_desc", disabled=sort_by == "Default")
+
+    page_key = f"{name}_page"
+    result = paginate(
+        df,
+        page=st.session_state.get(page_key, 1),
+        page_size=page_size,
+        sort_by=None if sort_by == "Default" else sort_by,
+        ascending=not descending,
+        query=query,
+        cache_key=(name, version),
+    )
+    # Clamp before the widget exists: filtering can shrink the page count
+    st.session_state[page_key] = result["page"]
+    with col4:
+        st.number_input("Page", min_value=1, max_value=result["pages"], step=1, key=page_key)
+
+    st.dataframe(result["rows"], hide_index=True, use_container_width=True)
+    if result["total"]:
+        st.caption(f"Rows {result['start'] + 1}–{result['start'] + len(result['rows'])} "
+                   f"of {result['total']}")
+    else:
+        st.caption("No matching rows")
+
+def export_buttons(dataset, file_stem, **filters):
+    """
+    CSV and Parquet downloads of a dataset. The file is only generated
+    when a button is clicked (deferred data needs Streamlit >= 1.52);
+    Streamlit then reads the whole stream into memory before sending it.
+    """
+    for col, (fmt, (mime, extension)) in zip(st.columns([1, 1, 4]), EXPORT_FORMATS.items()):
+        with col:
+            st.download_button(
+                f"Download {fmt.upper()}",
+                data=functools.partial(export_stream, data, dataset, fmt, **filters),
+                file_name=f"{file_stem}{extension}",
+                mime=mime,
+                key=f"export_{dataset}_{fmt}",
+                on_click="ignore",
+            )
 
 # ==============================
 # CSS Styling - Clean & Simple
@@ -304,10 +424,11 @@ page = st.sidebar.radio(
 st.sidebar.markdown("---")
 
 # State Selection
+sidebar = sidebar_view(dep("sidebar"))
 st.sidebar.markdown("### State Selection")
 selected_state = st.sidebar.selectbox(
     "Choose a state",
-    sorted(df_priority["state"].unique()),
+    sidebar["states"],
     label_visibility="collapsed"
 )
 
@@ -321,10 +442,31 @@ status_filter = st.sidebar.radio(
     label_visibility="collapsed"
 )
 
-filtered_priority = df_priority if status_filter == "All" else df_priority[df_priority["state_status"] == status_filter]
+# Date window for status, priority and the map (None: the precomputed all-time tables)
+window = None
+all_months = sidebar["months"]
+if len(all_months) > 1:
+    window_start, window_end = st.sidebar.select_slider(
+        "Date Range",
+        options=all_months,
+        value=(all_months[0], all_months[-1])
+    )
+    if (window_start, window_end) != (all_months[0], all_months[-1]):
+        window = (window_start, window_end)
 
 st.sidebar.markdown("---")
 
+# Risk Score Weights (re-rank states live on the Overview page)
+risk_weights = DEFAULT_RISK_WEIGHTS
+if page == "Overview":
+    st.sidebar.markdown("### Risk Score Weights")
+    risk_weights = {
+        "decay": st.sidebar.slider("Decay Signal", 0.0, 2.0, DEFAULT_RISK_WEIGHTS["decay"], 0.1),
+        "volatility": st.sidebar.slider("Update Volatility", 0.0, 2.0, DEFAULT_RISK_WEIGHTS["volatility"], 0.1),
+        "recency": st.sidebar.slider("Low Recent Activity", 0.0, 2.0, DEFAULT_RISK_WEIGHTS["recency"], 0.1),
+    }
+    st.sidebar.markdown("---")
+
 # Info Section
 st.sidebar.markdown("### About")
 st.sidebar.markdown("**UIDAI Data Hackathon 2026**")
@@ -343,45 +485,37 @@ st.markdown("---")
 # PAGE: OVERVIEW
 # ==============================
 if page == "Overview":
+    summary = overview_summary_view(window, dep("overview_summary"))
+    
     # KPIs
     col1, col2, col3 = st.columns(3)
-    
-    total = len(df_priority)
-    decaying = (df_priority["state_status"] == "DECAYING").sum()
-    healthy = (df_priority["state_status"] == "HEALTHY").sum()
-    
     with col1:
-        st.metric("Healthy States", healthy, delta="Good Performance", delta_color="normal")
+        st.metric("Healthy States", summary["healthy"], delta="Good Performance", delta_color="normal")
     with col2:
-        st.metric("Decaying States", decaying, delta="Needs Attention", delta_color="inverse")
+        st.metric("Decaying States", summary["decaying"], delta="Needs Attention", delta_color="inverse")
     with col3:
-        st.metric("Total States", total, delta="Complete Coverage", delta_color="off")
+        st.metric("Total States", summary["total"], delta="Complete Coverage", delta_color="off")
     
     st.markdown("---")
     
     # State Info
     st.subheader(f"Selected State: {selected_state}")
     
-    state_filter = df_priority[df_priority['state'] == selected_state]
-    if state_filter.empty:
+    state_view = overview_state_view(selected_state, risk_weights, window, dep("overview_state"))
+    if state_view is None:
         st.error(f"No data found for {selected_state}")
         st.stop()
-    state_data = state_filter.iloc[0]
-    state_ts = df_monthly[df_monthly['state'] == selected_state].sort_values('year_month')
     
     col1, col2, col3, col4 = st.columns(4)
     with col1:
-        st.metric("Status", state_data['state_status'])
+        st.metric("Status", state_view["status"])
     with col2:
-        st.metric("Priority Rank", f"#{int(state_data['priority_rank'])}")
+        st.metric("Priority Rank", f"#{state_view['rank']}")
     with col3:
-        st.metric("Avg Intensity", f"{state_data['avg_update_intensity']:.2f}")
+        st.metric("Avg Intensity", f"{state_view['avg_intensity']:.2f}")
     with col4:
-        if len(state_ts) >= 2:
-            recent = state_ts.tail(1)['update_intensity'].values[0]
-            prev = state_ts.tail(2).head(1)['update_intensity'].values[0]
-            trend = ((recent - prev) / prev * 100) if prev > 0 else 0
-            st.metric("Monthly Trend", f"{trend:+.1f}%")
+        if state_view["trend"] is not None:
+            st.metric("Monthly Trend", f"{state_view['trend']:+.1f}%")
         else:
             st.metric("Monthly Trend", "N/A")
     
@@ -389,161 +523,107 @@ if page == "Overview":
     
     # Low Activity States Chart
     st.subheader("Low Activity States")
-    bottom_10 = df_priority.nsmallest(10, "avg_update_intensity")
-    fig = go.Figure(go.Bar(
-        y=bottom_10["state"],
-        x=bottom_10["avg_update_intensity"],
-        orientation='h',
-        marker_color='#b91c1c'
-    ))
-    fig.update_layout(
-        height=400,
-        yaxis={'categoryorder': 'total ascending'},
-        showlegend=False,
-        margin=dict(l=0, r=0, t=10, b=0)
-    )
-    st.plotly_chart(fig, use_container_width=True)
+    st.plotly_chart(figure_spec(summary["low_activity_figure"]), use_container_width=True)
     
     st.markdown("---")
     
     # Trend Chart
     st.subheader(f"Update Intensity Trend: {selected_state}")
-    fig = go.Figure()
-    fig.add_trace(go.Scatter(
-        x=state_ts['year_month'],
-        y=state_ts['update_intensity'],
-        mode='lines+markers',
-        name='Intensity',
-        line=dict(color='#0B3C5D', width=3),
-        marker=dict(size=8)
-    ))
-    fig.add_trace(go.Scatter(
-        x=state_ts['year_month'],
-        y=state_ts['update_intensity_3m_avg'],
-        mode='lines',
-        name='3-Month Avg',
-        line=dict(color='#D97706', width=2, dash='dash')
-    ))
-    fig.update_layout(
-        height=400,
-        showlegend=True,
-        margin=dict(l=0, r=0, t=10, b=0)
-    )
-    st.plotly_chart(fig, use_container_width=True)
+    st.plotly_chart(figure_spec(state_view["trend_figure"]), use_container_width=True)
     
     st.markdown("---")
     
     # Priority Table
     st.subheader("Priority Matrix")
-    display_df = filtered_priority.sort_values("priority_rank").head(15)[
-        ["state", "state_status", "avg_update_intensity", "priority_rank"]
-    ].copy()
-    display_df.columns = ["State Name", "Status", "Avg Update Intensity", "Priority Rank"]
-    st.table(display_df)
+    priority_version = dep("priority_matrix")
+    paged_table("priority_matrix", priority_matrix_view(status_filter, risk_weights, window, priority_version),
+                (status_filter, tuple(sorted(risk_weights.items())), window, priority_version))
+    export_buttons("priority", f"priority_matrix_{status_filter.lower()}",
+                   status_filter=status_filter, risk_weights=risk_weights, window=window)
 
 # ==============================
 # PAGE: STATISTICAL ANALYSIS
 # ==============================
 elif page == "Statistical Analysis":
     st.subheader("National Statistics")
+    stats_view = statistics_view(dep("statistics"))
     
-    if not analytics['stat_summary'].empty:
-        # Use actual data count instead of incorrect CSV value
-        actual_states = len(df_priority)
-        col1, col2, col3, col4 = st.columns(4)
-        
-        with col1:
-            st.metric("States/UTs Analyzed", actual_states)
-        if 'states_with_significant_decline' in analytics['stat_summary'].columns:
-            with col2:
-                st.metric("Declining States", int(analytics['stat_summary']['states_with_significant_decline'].values[0]))
-        if 'states_with_large_effect_decay' in analytics['stat_summary'].columns:
-            with col3:
-                st.metric("Critical States", int(analytics['stat_summary']['states_with_large_effect_decay'].values[0]))
-        if 'national_median_intensity' in analytics['stat_summary'].columns:
-            with col4:
-                st.metric("Median Intensity", f"{analytics['stat_summary']['national_median_intensity'].values[0]:.2f}")
+    if stats_view["kpis"]:
+        for col, (label, value) in zip(st.columns(4), stats_view["kpis"]):
+            with col:
+                st.metric(label, value)
     
     st.markdown("---")
     
     # Benchmarking Table
-    if not analytics['benchmarking'].empty:
+    if stats_view["benchmarking"] is not None:
         st.subheader("State Benchmarking")
-        cols = ['state', 'avg_intensity', 'percentile', 'trend']
-        available_cols = [c for c in cols if c in analytics['benchmarking'].columns]
-        display_df = analytics['benchmarking'].nlargest(20, 'avg_intensity')[available_cols].copy()
-        # Rename columns for better readability
-        col_rename = {'state': 'State Name', 'avg_intensity': 'Avg Intensity', 'percentile': 'Percentile', 'trend': 'Trend'}
-        display_df.columns = [col_rename.get(c, c) for c in display_df.columns]
-        st.table(display_df)
+        paged_table("benchmarking", stats_view["benchmarking"], dep("statistics"))
+        export_buttons("benchmarking", "state_benchmarking")
     
     st.markdown("---")
     
     # Effect Size
-    if not analytics['effect_size'].empty:
+    if stats_view["effect_size"] is not None:
         st.subheader("Effect Size Analysis")
-        cols = ['state', 'early_mean', 'recent_mean', 'change', 'cohens_d', 'magnitude']
-        available_cols = [c for c in cols if c in analytics['effect_size'].columns]
-        display_df = analytics['effect_size'].nsmallest(10, 'cohens_d')[available_cols].copy()
-        # Rename columns for better readability
-        col_rename = {'state': 'State Name', 'early_mean': 'Early Mean', 'recent_mean': 'Recent Mean', 'change': 'Change', 'cohens_d': "Cohen's D", 'magnitude': 'Magnitude'}
-        display_df.columns = [col_rename.get(c, c) for c in display_df.columns]
-        st.table(display_df)
+        paged_table("effect_size", stats_view["effect_size"], dep("statistics"))
+        export_buttons("effect_size", "effect_size_analysis")
     
     st.markdown("---")
     
-    # Visualization Images
+    # Correlation Heatmap
+    st.subheader("Correlation Heatmap")
+    months = stats_view["months"]
     col1, col2 = st.columns(2)
     with col1:
-        st.subheader("Correlation Heatmap")
-        if os.path.exists("data/correlation_heatmap.png"):
-            st.image("data/correlation_heatmap.png", caption="9×9 Correlation Matrix", use_container_width=True)
+        corr_region = st.selectbox("Region", stats_view["regions"])
     with col2:
-        st.subheader("Confidence Intervals")
-        if os.path.exists("data/confidence_intervals.png"):
-            st.image("data/confidence_intervals.png", caption="95% CI for State Estimates", use_container_width=True)
+        corr_start, corr_end = st.select_slider(
+            "Month Range",
+            options=months,
+            value=(months[0], months[-1])
+        )
+    st.plotly_chart(figure_spec(correlation_figure(corr_region, corr_start, corr_end, dep("correlation"))), use_container_width=True)
+    
+    st.markdown("---")
+    
+    # Confidence Intervals Image
+    st.subheader("Confidence Intervals")
+    ci_image = image_bytes("confidence_intervals_png", 1440)
+    if ci_image:
+        st.image(ci_image, caption="95% CI for State Estimates", use_container_width=True)
 
 # ==============================
 # PAGE: GEOGRAPHIC INSIGHTS  
 # ==============================
 elif page == "Geographic Insights":
     st.subheader("Regional Performance")
+    geo_view = geographic_view(dep("geographic"))
     
-    if not analytics['regional'].empty:
-        reg_df = analytics['regional'].sort_values('mean_intensity', ascending=False)
-        
+    if geo_view["figure"] is not None:
         # Regional Performance Chart (full width)
-        fig = go.Figure(go.Bar(
-            x=reg_df['region'],
-            y=reg_df['mean_intensity'],
-            marker_color='#0B3C5D',
-            text=reg_df['num_states'].apply(lambda x: f"{int(x)} states"),
-            textposition='outside'
-        ))
-        fig.update_layout(
-            height=400,
-            showlegend=False,
-            margin=dict(l=0, r=0, t=10, b=0)
-        )
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(figure_spec(geo_view["figure"]), use_container_width=True)
         
         st.markdown("---")
         
         # Regional Data Table
         st.subheader("Regional Summary")
-        reg_display = reg_df[['region', 'mean_intensity', 'num_states']].copy()
-        reg_display.columns = ['Region', 'Mean Intensity', 'States Count']
-        st.table(reg_display)
+        paged_table("regional", geo_view["table"], dep("geographic"))
     
     st.markdown("---")
     
     # Interactive Map
     st.subheader("Interactive India Map")
-    if os.path.exists("data/india_interactive_map.html"):
-        with open("data/india_interactive_map.html", 'r', encoding='utf-8') as f:
-            components.html(f.read(), height=600, scrolling=True)
-    else:
-        st.info("Interactive map available after running notebook 07")
+    col1, col2 = st.columns([2, 1])
+    with col1:
+        map_metric = st.selectbox("Metric", list(views.MAP_METRICS))
+    with col2:
+        map_level = st.select_slider("Map Detail", options=list(CHOROPLETH_LEVELS)[::-1],
+                                     value=CHOROPLETH_DEFAULT_LEVEL)
+    state_map = map_view(map_metric, status_filter, selected_state, map_level, window, dep("map"))
+    st.plotly_chart(figure_spec(state_map["figure"]), use_container_width=True)
+    if state_map["unmapped"]:
+        st.caption(f"No boundary shape for: {', '.join(state_map['unmapped'])}")
     
     st.markdown("---")
     
@@ -551,12 +631,14 @@ elif page == "Geographic Insights":
     col1, col2 = st.columns(2)
     with col1:
         st.subheader("Regional Comparison")
-        if os.path.exists("data/regional_comparison.png"):
-            st.image("data/regional_comparison.png", caption="Regional Performance Comparison", use_container_width=True)
+        regional_image = image_bytes("regional_comparison_png", 960)
+        if regional_image:
+            st.image(regional_image, caption="Regional Performance Comparison", use_container_width=True)
     with col2:
         st.subheader("State Distribution")
-        if os.path.exists("data/india_state_visualization.png"):
-            st.image("data/india_state_visualization.png", caption="State-wise Update Intensity", use_container_width=True)
+        state_image = image_bytes("state_visualization_png", 960)
+        if state_image:
+            st.image(state_image, caption="State-wise Update Intensity", use_container_width=True)
 
 # ==============================
 # PAGE: FORECASTING
@@ -564,41 +646,20 @@ elif page == "Geographic Insights":
 elif page == "Forecasting":
     st.subheader("ARIMA Forecasting Results")
     
-    if not analytics['forecasts'].empty and selected_state in analytics['forecasts']['state'].values:
-        st_forecast = analytics['forecasts'][analytics['forecasts']['state'] == selected_state]
-        
+    state_forecast = forecast_view(selected_state, dep("forecast"))
+    if state_forecast is not None:
         st.markdown(f"**3-Month Forecast: {selected_state}**")
-        
-        fig = go.Figure()
-        fig.add_trace(go.Scatter(
-            x=st_forecast['forecast_month'],
-            y=st_forecast['forecast_value'],
-            mode='lines+markers',
-            name='Forecast',
-            line=dict(color='#D97706', width=3),
-            marker=dict(size=10)
-        ))
-        fig.add_trace(go.Scatter(
-            x=list(st_forecast['forecast_month']) + list(st_forecast['forecast_month'])[::-1],
-            y=list(st_forecast['upper_bound']) + list(st_forecast['lower_bound'])[::-1],
-            fill='toself',
-            fillcolor='rgba(217,119,6,0.2)',
-            line=dict(color='rgba(255,255,255,0)'),
-            name='95% CI'
-        ))
-        fig.update_layout(height=400, showlegend=True)
-        st.plotly_chart(fig, use_container_width=True)
-        
-        forecast_display = st_forecast[['forecast_month', 'forecast_value', 'lower_bound', 'upper_bound']].copy()
-        forecast_display.columns = ['Month', 'Forecast Value', 'Lower CI', 'Upper CI']
-        st.table(forecast_display)
+        st.plotly_chart(figure_spec(state_forecast["figure"]), use_container_width=True)
+        paged_table("forecast", state_forecast["table"], (selected_state, dep("forecast")))
+        export_buttons("forecasts", f"forecast_{selected_state}", state=selected_state)
     
     st.markdown("---")
     
     # Forecasts Visualization Image
     st.subheader("All State Forecasts Overview")
-    if os.path.exists("data/forecasts_visualization.png"):
-        st.image("data/forecasts_visualization.png", caption="3-Month ARIMA Forecasts for All States", use_container_width=True)
+    forecasts_image = image_bytes("forecasts_png", 1440)
+    if forecasts_image:
+        st.image(forecasts_image, caption="3-Month ARIMA Forecasts for All States", use_container_width=True)
 
 # ==============================
 # PAGE: STATE DETAILS
@@ -606,51 +667,71 @@ elif page == "Forecasting":
 elif page == "State Details":
     st.subheader(f"Detailed Analysis: {selected_state}")
     
-    state_filter = df_priority[df_priority['state'] == selected_state]
-    if state_filter.empty:
+    details = state_details_view(selected_state, dep("state_details"))
+    if details is None:
         st.error(f"No data found for {selected_state}")
         st.stop()
-    state_data = state_filter.iloc[0]
-    state_ts = df_monthly[df_monthly['state'] == selected_state].sort_values('year_month')
     
     # Metrics
     col1, col2, col3 = st.columns(3)
     with col1:
-        st.metric("Status", state_data['state_status'])
+        st.metric("Status", details["status"])
     with col2:
-        st.metric("Priority Rank", f"#{int(state_data['priority_rank'])}")
+        st.metric("Priority Rank", f"#{details['rank']}")
     with col3:
-        st.metric("Avg Intensity", f"{state_data['avg_update_intensity']:.2f}")
+        st.metric("Avg Intensity", f"{details['avg_intensity']:.2f}")
     
     st.markdown("---")
     
     # Time Series
     st.subheader("Complete Time Series")
-    fig = go.Figure()
-    fig.add_trace(go.Scatter(
-        x=state_ts['year_month'],
-        y=state_ts['update_intensity'],
-        mode='lines+markers',
-        name='Update Intensity',
-        line=dict(color='#0B3C5D', width=3)
-    ))
-    fig.add_trace(go.Scatter(
-        x=state_ts['year_month'],
-        y=state_ts['update_intensity_3m_avg'],
-        mode='lines',
-        name='3-Month Moving Average',
-        line=dict(color='#D97706', width=2, dash='dash')
-    ))
-    fig.update_layout(height=450, showlegend=True)
-    st.plotly_chart(fig, use_container_width=True)
+    st.plotly_chart(figure_spec(details["figure"]), use_container_width=True)
+    
+    st.markdown("---")
+    
+    # Similar Trajectories
+    st.subheader("States With Similar Trajectories")
+    similarity_metric = st.radio(
+        "Match by",
+        list(views.SIMILARITY_LABELS),
+        horizontal=True,
+        help="Correlation compares the shape month by month; DTW also matches shapes shifted by a month or two"
+    )
+    similar = similar_states_view(selected_state, similarity_metric, dep("similar_states"))
+    if similar is None:
+        st.info("Not enough overlapping months to compare this state with others")
+    else:
+        col1, col2 = st.columns([2, 3])
+        with col1:
+            st.dataframe(similar["table"], hide_index=True, use_container_width=True)
+        with col2:
+            st.plotly_chart(figure_spec(similar["figure"]), use_container_width=True)
+    
+    st.markdown("---")
+    
+    # Change Points
+    st.subheader("Detected Segments")
+    if details["segments"] is None:
+        st.info("No change points detected for this state")
+    else:
+        paged_table("segments", details["segments"], (selected_state, dep("state_details")))
+    
+    st.markdown("---")
+    
+    # Anomaly Flags
+    st.subheader("Anomaly Flags")
+    if details["anomalies"] is None:
+        st.info("No anomalous months detected for this state")
+    else:
+        paged_table("anomalies", details["anomalies"], (selected_state, dep("state_details")))
+        export_buttons("anomalies", f"anomalies_{selected_state}", state=selected_state)
     
     st.markdown("---")
     
     # Historical Data
     st.subheader("Historical Data")
-    hist_display = state_ts[['year_month', 'update_intensity', 'update_intensity_3m_avg']].sort_values('year_month', ascending=False).copy()
-    hist_display.columns = ['Year-Month', 'Update Intensity', '3-Month Average']
-    st.table(hist_display)
+    paged_table("history", details["history"], (selected_state, dep("state_details")))
+    export_buttons("timeseries", f"timeseries_{selected_state}", state=selected_state)
 
 # ==============================
 # Footer
@@ -0,0 +1,149 @@
+"""
+Load test for the read-only JSON API (src/api.py).
+
+Opens many concurrent keep-alive connections, each issuing requests
+across all endpoints (a share of them conditional with If-None-Match),
+and reports throughput and latency percentiles as JSON.
+
+Usage (from the repository root):
+    python benchmarks/api_load_test.py                       # starts a server
+    python benchmarks/api_load_test.py --url http://127.0.0.1:8765 --connections 500
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+import urllib.request
+from urllib.parse import quote, urlsplit
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def wait_for_server(url, timeout=60.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(f"{url}/api/health", timeout=1) as response:
+                if response.status == 200:
+                    return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"API at {url} did not come up within {timeout:.0f}s")
+
+
+def request_targets(url):
+    with urllib.request.urlopen(f"{url}/api/states") as response:
+        states = json.load(response)["data"]
+    targets = ["/api/health", "/api/states", "/api/priority", "/api/priority?status=DECAYING&limit=10",
+               "/api/benchmarking?limit=20", "/api/forecasts"]
+    for state in states:
+        targets.append(f"/api/states/{quote(state)}")
+        targets.append(f"/api/forecasts/{quote(state)}")
+    return targets
+
+
+async def read_response(reader):
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    status = int(lines[0].split(" ", 2)[1])
+    headers = {}
+    for line in lines[1:]:
+        name, sep, value = line.partition(":")
+        if sep:
+            headers[name.strip().lower()] = value.strip()
+    await reader.readexactly(int(headers.get("content-length", "0")))
+    return status, headers.get("etag")
+
+
+async def client(host, port, targets, n_requests, conditional_share, rng, latencies, statuses):
+    reader, writer = await asyncio.open_connection(host, port)
+    etags = {}
+    try:
+        for _ in range(n_requests):
+            target = rng.choice(targets)
+            lines = [f"GET {target} HTTP/1.1", f"Host: {host}", "Accept-Encoding: gzip"]
+            if target in etags and rng.random() < conditional_share:
+                lines.append(f"If-None-Match: {etags[target]}")
+            start = time.perf_counter()
+            writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+            status, etag = await read_response(reader)
+            latencies.append(time.perf_counter() - start)
+            statuses[status] = statuses.get(status, 0) + 1
+            if etag:
+                etags[target] = etag
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+
+async def run(url, connections, requests_per_connection, conditional_share, seed):
+    split = urlsplit(url)
+    targets = request_targets(url)
+    latencies, statuses = [], {}
+    rng = random.Random(seed)
+    start = time.perf_counter()
+    results = await asyncio.gather(*[
+        client(split.hostname, split.port, targets, requests_per_connection, conditional_share,
+               random.Random(rng.random()), latencies, statuses)
+        for _ in range(connections)
+    ], return_exceptions=True)
+    elapsed = time.perf_counter() - start
+
+    latency_ms = np.array(latencies) * 1000
+    return {
+        "connections": connections,
+        "requests": len(latencies),
+        "failed_connections": sum(isinstance(r, Exception) for r in results),
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(len(latencies) / elapsed, 1),
+        "latency_ms": {
+            name: round(float(np.percentile(latency_ms, q)), 3) if len(latency_ms) else None
+            for name, q in (("p50", 50), ("p95", 95), ("p99", 99), ("max", 100))
+        },
+        "status_counts": {str(k): v for k, v in sorted(statuses.items())},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--url", help="Existing API base URL (default: start a local server)")
+    parser.add_argument("--port", type=int, default=8799, help="Port for the locally started server")
+    parser.add_argument("--connections", type=int, default=300)
+    parser.add_argument("--requests", type=int, default=50, help="Requests per connection")
+    parser.add_argument("--conditional-share", type=float, default=0.5,
+                        help="Share of repeat requests sent with If-None-Match")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Also write the JSON report to this file")
+    args = parser.parse_args()
+
+    server = None
+    url = args.url
+    if url is None:
+        url = f"http://127.0.0.1:{args.port}"
+        server = subprocess.Popen(
+            [sys.executable, "-m", "src.api", "--port", str(args.port), "--no-watch"],
+            cwd=ROOT, stdout=subprocess.DEVNULL,
+        )
+    try:
+        wait_for_server(url)
+        report = asyncio.run(run(url, args.connections, args.requests, args.conditional_share, args.seed))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,316 @@
+"""
+Concurrent-session load test for the Streamlit dashboard (app.py).
+
+Starts one or more `streamlit run app.py` servers (workers) against the
+bundled data/ directory and connects N headless sessions to them over
+Streamlit's websocket protocol, spread round-robin over the workers as a
+load balancer would. Each session clicks through the five pages: every
+step picks a page, a random state and status filter, and on the page it
+is already on also changes that page's widgets (risk weights, region,
+table page). Rerun latency is the time from sending the widget states
+to the script finishing.
+
+The JSON report has p50/p95/p99 rerun latency per page, throughput, and
+the memory (RSS) of each worker, and can be compared against an earlier
+report to spot regressions between versions.
+
+Usage (from the repository root, Linux):
+    python benchmarks/dashboard_load_test.py [--sessions 20] [--workers 1] [--steps 30]
+    python benchmarks/dashboard_load_test.py --output after.json --baseline before.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+import urllib.request
+
+import numpy as np
+import websockets  # Installed with Streamlit
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PAGES = ["Overview", "Statistical Analysis", "Geographic Insights", "Forecasting", "State Details"]
+
+# Widget labels in app.py
+PAGE_RADIO = "Select Page"
+STATE_SELECT = "Choose a state"
+STATUS_RADIO = "Filter by Performance Status"
+WEIGHT_SLIDERS = ("Decay Signal", "Update Volatility", "Low Recent Activity")
+REGION_SELECT = "Region"
+TABLE_PAGE = "Page"
+
+WIDGET_TYPES = ("radio", "selectbox", "slider", "number_input")
+
+
+def rss_mb(pid):
+    """Current RSS of a process in MB, from /proc (Linux)."""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        return None
+
+
+def start_worker(port):
+    command = [
+        sys.executable, "-m", "streamlit", "run", "app.py",
+        "--server.headless", "true",
+        "--server.port", str(port),
+        "--server.fileWatcherType", "none",
+        "--browser.gatherUsageStats", "false",
+    ]
+    env = dict(os.environ, UIDAI_WATCH_DATA="0")
+    return subprocess.Popen(command, cwd=ROOT, env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def wait_for_worker(port, timeout=60.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1):
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"Streamlit worker on port {port} did not come up within {timeout:.0f}s")
+
+
+class Session:
+    """
+    One headless browser session. Keeps the widget states it has set
+    (sent with every rerun, as the browser does) and the widgets the
+    last run rendered, keyed by label.
+    """
+
+    def __init__(self, url):
+        self.url = url
+        self.page = None
+        self.widgets = {}
+        self.states = {}
+        self.socket = None
+
+    async def __aenter__(self):
+        self.socket = await websockets.connect(self.url, subprotocols=["streamlit"], max_size=None)
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.socket.close()
+
+    async def rerun(self, timeout=120.0):
+        """Rerun the script with the current widget states; returns the finish status."""
+        msg = BackMsg()
+        msg.rerun_script.widget_states.widgets.extend(self.states.values())
+        self.widgets = {}
+        await self.socket.send(msg.SerializeToString())
+        while True:
+            forward = ForwardMsg()
+            forward.ParseFromString(await asyncio.wait_for(self.socket.recv(), timeout))
+            kind = forward.WhichOneof("type")
+            if kind == "delta" and forward.delta.WhichOneof("type") == "new_element":
+                element = forward.delta.new_element
+                widget_type = element.WhichOneof("type")
+                if widget_type in WIDGET_TYPES:
+                    widget = getattr(element, widget_type)
+                    self.widgets[widget.label] = (widget_type, widget)
+            elif kind == "script_finished":
+                return ForwardMsg.ScriptFinishedStatus.Name(forward.script_finished)
+
+    def has(self, label):
+        return label in self.widgets
+
+    def options(self, label):
+        return list(self.widgets[label][1].options)
+
+    def set(self, label, value):
+        widget_type, widget = self.widgets[label]
+        state = self.states.get(widget.id)
+        if state is None:
+            state = self.states[widget.id] = BackMsg().rerun_script.widget_states.widgets.add()
+            state.id = widget.id
+        if widget_type in ("radio", "selectbox"):
+            state.string_value = value
+        elif widget_type == "slider":
+            state.double_array_value.data[:] = [value]
+        elif widget_type == "number_input":
+            state.int_value = int(value)
+
+
+def interact(session, page, rng):
+    """Set the widgets a user might touch before the rerun that shows `page`."""
+    on_page = session.page == page
+    session.set(PAGE_RADIO, page)
+    session.set(STATE_SELECT, rng.choice(session.options(STATE_SELECT)))
+    session.set(STATUS_RADIO, rng.choice(session.options(STATUS_RADIO)))
+    if not on_page:
+        return
+    if page == "Overview":
+        session.set(rng.choice(WEIGHT_SLIDERS), round(rng.uniform(0.0, 2.0), 1))
+    if session.has(REGION_SELECT):
+        session.set(REGION_SELECT, rng.choice(session.options(REGION_SELECT)))
+    if session.has(TABLE_PAGE) and rng.random() < 0.5:
+        pager = session.widgets[TABLE_PAGE][1]
+        session.set(TABLE_PAGE, rng.randint(int(pager.min), int(pager.max)))
+
+
+async def run_session(session_id, url, steps, rng, samples, errors):
+    async with Session(url) as session:
+        start = time.perf_counter()
+        await session.rerun()
+        samples.append(("first_render", time.perf_counter() - start))
+        session.page = PAGES[0]
+        for _ in range(steps):
+            page = rng.choice(PAGES)
+            try:
+                interact(session, page, rng)
+                start = time.perf_counter()
+                status = await session.rerun()
+                elapsed = time.perf_counter() - start
+            except Exception as e:
+                errors.append(f"session {session_id} {page}: {type(e).__name__}: {e}")
+                return
+            if status != "FINISHED_SUCCESSFULLY":
+                errors.append(f"session {session_id} {page}: {status}")
+            samples.append((page, elapsed))
+            session.page = page
+
+
+async def sample_memory(pids, peaks, stop):
+    while not stop.is_set():
+        for pid in pids:
+            current = rss_mb(pid)
+            if current is not None:
+                peaks[pid] = max(peaks.get(pid, 0.0), current)
+        try:
+            await asyncio.wait_for(stop.wait(), 0.25)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def load(ports, pids, sessions, steps, seed):
+    rng = random.Random(seed)
+    samples, errors, peaks = [], [], {}
+    stop = asyncio.Event()
+    sampler = asyncio.create_task(sample_memory(pids, peaks, stop))
+    start = time.perf_counter()
+    await asyncio.gather(*[
+        run_session(i, f"ws://127.0.0.1:{ports[i % len(ports)]}/_stcore/stream",
+                    steps, random.Random(rng.random()), samples, errors)
+        for i in range(sessions)
+    ])
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await sampler
+    return samples, errors, peaks, elapsed
+
+
+def percentiles(seconds):
+    ms = np.array(seconds) * 1000
+    return {
+        "count": len(ms),
+        **{name: round(float(np.percentile(ms, q)), 1) for name, q in
+           (("p50", 50), ("p95", 95), ("p99", 99), ("max", 100))},
+    }
+
+
+def git_revision():
+    try:
+        result = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                                capture_output=True, text=True, check=True)
+        return result.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(report, baseline):
+    print(f"{'page':<22}{'p50':>20}{'p95':>20}{'p99':>20}", file=sys.stderr)
+    for page, stats in report["latency_ms"].items():
+        before = baseline.get("latency_ms", {}).get(page)
+        if before is None:
+            continue
+        cells = []
+        for q in ("p50", "p95", "p99"):
+            change = (stats[q] - before[q]) / before[q] * 100 if before[q] else 0.0
+            cells.append(f"{before[q]:.0f}->{stats[q]:.0f} ({change:+.0f}%)")
+        print(f"{page:<22}" + "".join(f"{cell:>20}" for cell in cells), file=sys.stderr)
+    before, after = baseline.get("throughput_rps"), report["throughput_rps"]
+    if before:
+        print(f"throughput: {before} -> {after} reruns/s", file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent-session load test for the dashboard")
+    parser.add_argument("--sessions", type=int, default=20, help="Concurrent sessions in total")
+    parser.add_argument("--workers", type=int, default=1, help="Streamlit server processes to spread sessions over")
+    parser.add_argument("--steps", type=int, default=30, help="Interactions per session")
+    parser.add_argument("--port", type=int, default=8601, help="Port of the first worker")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Also write the JSON report to this file")
+    parser.add_argument("--baseline", help="Earlier JSON report to compare latencies against")
+    args = parser.parse_args()
+
+    ports = [args.port + i for i in range(args.workers)]
+    workers = [start_worker(port) for port in ports]
+    try:
+        for port in ports:
+            wait_for_worker(port)
+        pids = [worker.pid for worker in workers]
+        idle = {pid: rss_mb(pid) for pid in pids}
+        samples, errors, peaks, elapsed = asyncio.run(load(ports, pids, args.sessions, args.steps, args.seed))
+        final = {pid: rss_mb(pid) for pid in pids}
+    finally:
+        for worker in workers:
+            worker.terminate()
+            worker.wait()
+
+    by_page = {}
+    for page, seconds in samples:
+        by_page.setdefault(page, []).append(seconds)
+    reruns = sum(len(v) for k, v in by_page.items() if k != "first_render")
+    per_worker = [args.sessions // args.workers + (i < args.sessions % args.workers)
+                  for i in range(args.workers)]
+
+    report = {
+        "revision": git_revision(),
+        "sessions": args.sessions,
+        "workers": args.workers,
+        "steps_per_session": args.steps,
+        "seed": args.seed,
+        "elapsed_s": round(elapsed, 2),
+        "reruns": reruns,
+        "errors": len(errors),
+        "throughput_rps": round(reruns / elapsed, 2),
+        "latency_ms": {page: percentiles(by_page[page]) for page in ["first_render"] + PAGES if page in by_page},
+        "all_pages_ms": percentiles([s for k, v in by_page.items() if k != "first_render" for s in v]),
+        "workers_memory_mb": [
+            {
+                "sessions": sessions,
+                "rss_idle": round(idle[pid], 1),
+                "rss_peak": round(peaks.get(pid, final[pid]), 1),
+                "rss_end": round(final[pid], 1),
+                "growth_per_session": round((final[pid] - idle[pid]) / sessions, 2) if sessions else None,
+            }
+            for pid, sessions in zip(pids, per_worker)
+        ],
+        "error_samples": errors[:10],
+    }
+
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    if args.baseline:
+        with open(args.baseline) as f:
+            compare(report, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
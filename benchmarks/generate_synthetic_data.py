@@ -0,0 +1,202 @@
+"""
+Synthetic raw Aadhaar extracts for scaling benchmarks.
+
+Writes enrolment/, demographic/ and biometric/ folders of CSV files in
+the schema notebook 01 reads (date, state, district, pincode and the age
+columns), with dates as DD-MM-YYYY like the original extracts. State
+names are mostly canonical, but a configurable share are written as the
+variants in STATE_NAME_MAPPING or as case and spacing variants, and some
+rows carry invalid states (city names from INVALID_STATE_ENTRIES or bare
+numbers) for the cleaning stage to drop.
+
+The bundled data has about 570 state-month rows. The scale presets grow
+both the raw row count and the number of state-month rows (more months,
+plus "SYNTHETIC STATE nnnn" entries beyond the 36 real ones). The same
+arguments and seed always produce the same files.
+
+Build the processed data files with the pipeline, then point the
+dashboard at the output folder:
+    python benchmarks/generate_synthetic_data.py --scale 10x --output synthetic/10x --build
+    UIDAI_DATA_DIR=synthetic/10x streamlit run app.py
+
+Usage (from the repository root):
+    python benchmarks/generate_synthetic_data.py --scale 100x --output synthetic/100x
+    python benchmarks/generate_synthetic_data.py --districts 10 --months 36 --rows-per-day 500 --files 4
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from src.preprocessing import STATE_NAME_MAPPING, INVALID_STATE_ENTRIES  # noqa: E402
+from src.state_names import CANONICAL_STATES  # noqa: E402
+
+# Preset -> generator parameters; state-month rows are states x months
+# (1x: 36 x 12 ~ the bundled data, 1000x: 2,400 x 240)
+SCALES = {
+    "1x": {"states": 36, "districts": 20, "months": 12, "rows_per_day": 2_500, "files": 3},
+    "10x": {"states": 120, "districts": 20, "months": 48, "rows_per_day": 5_000, "files": 8},
+    "100x": {"states": 480, "districts": 20, "months": 120, "rows_per_day": 10_000, "files": 24},
+    "1000x": {"states": 2_400, "districts": 10, "months": 240, "rows_per_day": 20_000, "files": 96},
+}
+
+# Source folder -> raw age columns and mean count per row for each
+SOURCES = {
+    "enrolment": {"age_0_5": 1.5, "age_5_17": 0.8, "age_18_greater": 0.1},
+    "demographic": {"demo_age_5_17": 6.0, "demo_age_17_": 40.0},
+    "biometric": {"bio_age_5_17": 30.0, "bio_age_17_": 35.0},
+}
+
+LAST_MONTH = pd.Period("2025-12", freq="M")  # Series end here, as in the bundled data
+
+
+def state_names(n_states):
+    """The 36 real states/UTs, then synthetic ones up to n_states."""
+    names = sorted(CANONICAL_STATES)[:n_states]
+    names += [f"SYNTHETIC STATE {i:04d}" for i in range(1, n_states - len(names) + 1)]
+    return names
+
+
+def name_variants(names):
+    """
+    Flat array of alternative spellings with each state's (start, count):
+    mapped variants from STATE_NAME_MAPPING plus title case and padded
+    spacing, which cleaning normalises.
+    """
+    mapped = {}
+    for variant, canonical in STATE_NAME_MAPPING.items():
+        mapped.setdefault(canonical, []).append(variant)
+    flat, start, count = [], [], []
+    for name in names:
+        variants = mapped.get(name, []) + [name.title(), f" {name.lower()} ", name.replace(" ", "  ")]
+        start.append(len(flat))
+        count.append(len(variants))
+        flat.extend(variants)
+    return np.array(flat, dtype=object), np.array(start), np.array(count)
+
+
+def build_geography(names, districts, rng):
+    """Per-state weight and trend, and the (state, district, pincode) table."""
+    n = len(names)
+    weight = rng.lognormal(0.0, 1.0, n)
+    geography = {
+        "weight": weight / weight.sum(),
+        "trend": rng.normal(-0.01, 0.03, n),  # Monthly log-change in update activity; mostly decaying
+        "level": rng.lognormal(0.0, 0.5, n),
+        "district_state": np.repeat(np.arange(n), districts),
+        "district_name": np.array([f"{name[:12].strip()} DISTRICT {d + 1:02d}"
+                                   for name in names for d in range(districts)], dtype=object),
+        "pincode": rng.integers(110_000, 856_000, n * districts),
+    }
+    geography["district_weight"] = np.repeat(geography["weight"] / districts, districts)
+    return geography
+
+
+def generate_file(source, days, first, args, names, variants, geography, seed):
+    """One raw CSV's rows for a contiguous block of days (series start at `first`)."""
+    rng = np.random.default_rng(seed)
+    rows = len(days) * args.rows_per_day
+    day = np.repeat(days, args.rows_per_day)
+    district = rng.choice(len(geography["district_state"]), size=rows, p=geography["district_weight"])
+    state = geography["district_state"][district]
+
+    month = (day.year - first.year) * 12 + day.month - first.month
+    # Updates follow each state's level and trend; enrolment stays flat
+    activity = geography["level"][state] * np.exp(geography["trend"][state] * month)
+    df = pd.DataFrame({
+        "date": np.repeat(days.strftime("%d-%m-%Y").to_numpy(dtype=object), args.rows_per_day),
+        "state": np.array(names, dtype=object)[state],
+        "district": geography["district_name"][district],
+        "pincode": geography["pincode"][district],
+    })
+    for column, mean in SOURCES[source].items():
+        df[column] = rng.poisson(np.full(rows, mean) if source == "enrolment" else mean * activity)
+
+    flat, start, count = variants
+    renamed = rng.random(rows) < args.variant_rate
+    pick = start[state[renamed]] + (rng.random(renamed.sum()) * count[state[renamed]]).astype(int)
+    df.loc[renamed, "state"] = flat[pick]
+
+    invalid = rng.random(rows) < args.invalid_rate
+    garbage = np.array(INVALID_STATE_ENTRIES + ["100000", "560043"], dtype=object)
+    df.loc[invalid, "state"] = garbage[rng.integers(0, len(garbage), invalid.sum())]
+
+    undated = rng.random(rows) < args.bad_date_rate
+    df.loc[undated, "date"] = "00-00-0000"
+    return df
+
+
+def generate(args):
+    names = state_names(args.states)
+    seeds = np.random.SeedSequence(args.seed)
+    geo_seed, *file_seeds = seeds.spawn(1 + len(SOURCES) * args.files)
+    geography = build_geography(names, args.districts, np.random.default_rng(geo_seed))
+    variants = name_variants(names)
+
+    first = LAST_MONTH - (args.months - 1)
+    days = pd.date_range(first.start_time, LAST_MONTH.end_time.normalize(), freq="D")
+    blocks = np.array_split(np.arange(len(days)), args.files)
+
+    totals = {}
+    for s, source in enumerate(SOURCES):
+        folder = os.path.join(args.output, source)
+        os.makedirs(folder, exist_ok=True)
+        for f in os.listdir(folder):
+            if f.endswith(".csv"):
+                os.remove(os.path.join(folder, f))
+        rows = 0
+        for i, block in enumerate(blocks):
+            df = generate_file(source, days[block], first, args, names, variants, geography,
+                               file_seeds[s * args.files + i])
+            df.to_csv(os.path.join(folder, f"{source}_{i + 1:03d}.csv"), index=False)
+            rows += len(df)
+        totals[source] = rows
+        print(f"{source}: {rows:,} rows in {len(blocks)} files", file=sys.stderr)
+    return totals
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic raw extracts for scaling benchmarks")
+    parser.add_argument("--scale", choices=list(SCALES), default="1x", help="Preset (individual options override it)")
+    parser.add_argument("--states", type=int, help="States/UTs (36 real, then synthetic)")
+    parser.add_argument("--districts", type=int, help="Districts per state")
+    parser.add_argument("--months", type=int, help="Months of data, ending 2025-12")
+    parser.add_argument("--rows-per-day", type=int, help="Raw rows per day and source")
+    parser.add_argument("--files", type=int, help="CSV files per source")
+    parser.add_argument("--variant-rate", type=float, default=0.05, help="Share of rows with a state name variant")
+    parser.add_argument("--invalid-rate", type=float, default=0.001, help="Share of rows with an invalid state")
+    parser.add_argument("--bad-date-rate", type=float, default=0.0, help="Share of rows with an unparseable date")
+    parser.add_argument("--seed", type=int, default=2026)
+    parser.add_argument("--output", default=None, help="Output folder (default: synthetic/<scale>)")
+    parser.add_argument("--build", action="store_true", help="Run the data pipeline on the output afterwards")
+    args = parser.parse_args()
+
+    for key, value in SCALES[args.scale].items():
+        if getattr(args, key) is None:
+            setattr(args, key, value)
+    if args.output is None:
+        args.output = os.path.join("synthetic", args.scale)
+
+    start = time.perf_counter()
+    totals = generate(args)
+    params = {key: value for key, value in vars(args).items() if key not in ("output", "build")}
+    with open(os.path.join(args.output, "generator_params.json"), "w") as f:
+        json.dump({**params, "rows": totals}, f, indent=2)
+    print(f"Generated in {time.perf_counter() - start:.1f}s: {args.output}", file=sys.stderr)
+
+    if args.build:
+        env = dict(os.environ, UIDAI_DATA_DIR=os.path.abspath(args.output))
+        env.pop("UIDAI_RAW_DATA_DIR", None)
+        subprocess.run([sys.executable, "-m", "src.pipeline", "--force"], cwd=ROOT, env=env, check=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,282 @@
+"""
+Micro-benchmarks for the src hot paths at bundled and scaled sizes.
+
+Cases: load_monthly_features, load_priority_table, standardize_state_names,
+filter_states_with_history, get_state_timeseries, compute_rolling_average
+(every state), classify_state (every state), build_similarity_index (correlation,
+every state), similarity_top (one lookup), forecast_state_arima (one
+state) and create_visualization (every state's forecast).
+
+Each case runs against the bundled data/ and against scaled copies of it:
+at scale N every state appears N times under a synthetic name, with its
+values jittered, so state-month rows grow N-fold. A folder built by
+generate_synthetic_data.py can be added with --data-dir.
+
+Results are written as JSON (default benchmarks/results/<revision>.json)
+with min/median/mean per case and size, so runs from different commits
+can be compared with --baseline.
+
+Usage (from the repository root):
+    python benchmarks/hot_paths.py [--scales 10 100] [--cases classify_state ...]
+    python benchmarks/hot_paths.py --data-dir synthetic/10x --baseline benchmarks/results/abc1234.json
+"""
+import argparse
+import contextlib
+import hashlib
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# Keep files the cases write as a side effect (image derivatives from
+# create_visualization, the state-name lookup for scaled names) out of data/
+_SCRATCH_DIR = tempfile.TemporaryDirectory()
+os.environ["UIDAI_IMAGE_CACHE_DIR"] = _SCRATCH_DIR.name
+os.environ["UIDAI_STATE_LOOKUP_FILE"] = os.path.join(_SCRATCH_DIR.name, "state_name_lookup.json")
+
+import matplotlib  # noqa: E402
+matplotlib.use("Agg")
+
+from src.config import DATA_FILES  # noqa: E402
+from src.ingestion import load_monthly_features, load_priority_table  # noqa: E402
+from src.metrics import compute_decay_signal, compute_rolling_average, classify_state  # noqa: E402
+from src.preprocessing import (  # noqa: E402
+    standardize_state_names, filter_states_with_history, get_state_timeseries,
+)
+from src.similarity import series_matrix, build_similarity_index  # noqa: E402
+from src import generate_all_forecasts as forecasting  # noqa: E402
+
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+
+# create_visualization draws a panel per state; past ~300 states the PNG is
+# over Pillow's size limit, and each call already takes tens of seconds
+MAX_CHART_STATES = 100
+
+
+def git_revision():
+    try:
+        result = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                                capture_output=True, text=True, check=True)
+        return result.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def synthetic_state(state, k):
+    """
+    Opaque name for copy k of a state. It shares no text with the real
+    name, so the loaders' fuzzy state-name matching never folds it back.
+    """
+    return f"SYN{k:04d}-{hashlib.blake2b(state.encode(), digest_size=4).hexdigest().upper()}"
+
+
+def scale_frame(df, factor, rng):
+    """Repeat every state `factor` times under new names, jittering numeric columns."""
+    if factor == 1:
+        return df
+    copies = [df]
+    numeric = df.select_dtypes("number").columns.drop("priority_rank", errors="ignore")
+    for k in range(1, factor):
+        copy = df.copy()
+        copy["state"] = copy["state"].map(lambda state: synthetic_state(state, k))
+        copy[numeric] = copy[numeric] * rng.uniform(0.8, 1.2, size=(len(copy), len(numeric)))
+        copies.append(copy)
+    return pd.concat(copies, ignore_index=True)
+
+
+class Fixture:
+    """One data size: CSV paths plus the frames and inputs the cases use."""
+
+    def __init__(self, label, features_path, priority_path):
+        self.label = label
+        self.features_path = features_path
+        self.priority_path = priority_path
+        self.raw = pd.read_csv(features_path)
+        self.df = load_monthly_features(features_path).sort_values(["state", "year_month"])
+        self.priority = load_priority_table(priority_path)
+        self.states = self.df["state"].unique().tolist()
+        self.series = [group["update_intensity"] for _, group in self.df.groupby("state", sort=False)]
+        self.summaries = [
+            (s.mean(), s.tail(3).mean(), compute_decay_signal(s)) for s in self.series
+        ]
+        self.trajectories = series_matrix(self.df)
+        self._forecast = None
+        self._similarity = None
+
+    @property
+    def similarity(self):
+        if self._similarity is None:
+            self._similarity = build_similarity_index(*self.trajectories)
+        return self._similarity
+
+    @property
+    def forecast(self):
+        """One state's forecast, repeated for every state (for the chart case)."""
+        if self._forecast is None:
+            result = forecasting.forecast_state_arima(self.states[0], self.df)
+            self._forecast = {state: result for state in self.states}
+        return self._forecast
+
+
+def fixtures(scales, data_dirs, workdir, seed):
+    rng = np.random.default_rng(seed)
+    raw_features = pd.read_csv(DATA_FILES["monthly_features"])
+    raw_priority = pd.read_csv(DATA_FILES["priority_table"])
+    bundled = Fixture("bundled", DATA_FILES["monthly_features"], DATA_FILES["priority_table"])
+    yield bundled
+    for factor in scales:
+        features_path = os.path.join(workdir, f"features_{factor}x.csv")
+        priority_path = os.path.join(workdir, f"priority_{factor}x.csv")
+        scale_frame(raw_features, factor, rng).to_csv(features_path, index=False)
+        scale_frame(raw_priority, factor, rng).to_csv(priority_path, index=False)
+        fx = Fixture(f"{factor}x", features_path, priority_path)
+        # Every copy must load as its own state, or groups and months get merged
+        expected = len(bundled.states) * factor
+        if len(fx.states) != expected:
+            raise RuntimeError(f"{fx.label}: {len(fx.states)} states loaded, expected {expected}")
+        yield fx
+    for data_dir in data_dirs:
+        yield Fixture(os.path.basename(os.path.normpath(data_dir)),
+                      os.path.join(data_dir, os.path.basename(DATA_FILES["monthly_features"])),
+                      os.path.join(data_dir, os.path.basename(DATA_FILES["priority_table"])))
+
+
+def _rolling_all(fx):
+    for series in fx.series:
+        compute_rolling_average(series)
+
+
+def _classify_all(fx):
+    for avg, recent, decay in fx.summaries:
+        classify_state(avg, recent, decay)
+
+
+def _chart(fx, path):
+    if len(fx.states) > MAX_CHART_STATES:
+        return None
+    forecasts = fx.forecast
+    return lambda: forecasting.create_visualization(forecasts, path)
+
+
+def cases(workdir):
+    """Case name -> builder returning a zero-argument callable (or None to skip)."""
+    chart_path = os.path.join(workdir, "forecasts.png")
+    return {
+        "load_monthly_features": lambda fx: lambda: load_monthly_features(fx.features_path),
+        "load_priority_table": lambda fx: lambda: load_priority_table(fx.priority_path),
+        "standardize_state_names": lambda fx: lambda: standardize_state_names(fx.raw),
+        "filter_states_with_history": lambda fx: lambda: filter_states_with_history(fx.df),
+        "get_state_timeseries": lambda fx: lambda: get_state_timeseries(fx.df, fx.states[len(fx.states) // 2]),
+        "compute_rolling_average": lambda fx: lambda: _rolling_all(fx),
+        "classify_state": lambda fx: lambda: _classify_all(fx),
+        "build_similarity_index": lambda fx: lambda: build_similarity_index(*fx.trajectories),
+        "similarity_top": lambda fx: lambda: fx.similarity.top(fx.states[len(fx.states) // 2]),
+        "forecast_state_arima": lambda fx: lambda: forecasting.forecast_state_arima(fx.states[0], fx.df),
+        "create_visualization": lambda fx: _chart(fx, chart_path),
+    }
+
+
+def measure(func, rounds, budget):
+    """Time `func` after one warm-up call: up to `rounds` runs or `budget` seconds."""
+    func()
+    times = []
+    deadline = time.perf_counter() + budget
+    while len(times) < rounds and (len(times) < 3 or time.perf_counter() < deadline):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return {
+        "rounds": len(times),
+        "min_ms": round(min(times) * 1000, 3),
+        "median_ms": round(statistics.median(times) * 1000, 3),
+        "mean_ms": round(statistics.mean(times) * 1000, 3),
+        "stdev_ms": round(statistics.stdev(times) * 1000, 3) if len(times) > 1 else 0.0,
+    }
+
+
+def compare(report, baseline, threshold):
+    """Print median changes against a baseline report; returns the regressions."""
+    regressions = []
+    print(f"{'case':<30}{'size':<10}{'before ms':>12}{'after ms':>12}{'change':>9}", file=sys.stderr)
+    for case, sizes in report["results"].items():
+        for size, stats in sizes.items():
+            before = baseline.get("results", {}).get(case, {}).get(size)
+            if not before or stats is None:
+                continue
+            change = (stats["median_ms"] - before["median_ms"]) / before["median_ms"] * 100
+            flag = "  slower" if change > threshold else ""
+            if flag:
+                regressions.append((case, size, change))
+            print(f"{case:<30}{size:<10}{before['median_ms']:>12.2f}{stats['median_ms']:>12.2f}"
+                  f"{change:>+8.0f}%{flag}", file=sys.stderr)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the src hot paths")
+    parser.add_argument("--scales", type=int, nargs="*", default=[10, 100],
+                        help="Scale factors of the bundled data to benchmark")
+    parser.add_argument("--data-dir", action="append", default=[],
+                        help="Extra data folder (e.g. built by generate_synthetic_data.py)")
+    parser.add_argument("--cases", nargs="+", help="Only these cases")
+    parser.add_argument("--rounds", type=int, default=20, help="Maximum timed runs per case")
+    parser.add_argument("--budget", type=float, default=5.0, help="Seconds per case after 3 runs")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Report path (default benchmarks/results/<revision>.json)")
+    parser.add_argument("--baseline", help="Earlier report to compare medians against")
+    parser.add_argument("--threshold", type=float, default=20.0, help="Slowdown (%%) reported as a regression")
+    args = parser.parse_args()
+
+    revision = git_revision()
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        table = cases(workdir)
+        selected = args.cases or list(table)
+        for fx in fixtures(args.scales, args.data_dir, workdir, args.seed):
+            print(f"{fx.label}: {len(fx.df):,} rows, {len(fx.states):,} states", file=sys.stderr)
+            for name in selected:
+                with contextlib.redirect_stdout(io.StringIO()):  # Forecasting prints progress
+                    func = table[name](fx)
+                    stats = None if func is None else measure(func, args.rounds, args.budget)
+                if stats is not None:
+                    stats["rows"] = len(fx.df)
+                    stats["states"] = len(fx.states)
+                results.setdefault(name, {})[fx.label] = stats
+                shown = "skipped" if stats is None else f"{stats['median_ms']:.2f} ms (n={stats['rounds']})"
+                print(f"  {name:<30}{shown}", file=sys.stderr)
+
+    report = {
+        "revision": revision,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "results": results,
+    }
+    output = args.output or os.path.join(RESULTS_DIR, f"{revision or 'local'}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Report written to {output}", file=sys.stderr)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(report, json.load(f), args.threshold)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Process memory (RSS) against the number of concurrent dashboard sessions.
+
+Each simulated session fetches the dashboard data the way app.py does and
+keeps it alive, as a session does while its script runs. Two strategies
+are compared, each in a fresh interpreter per session count:
+
+  copy    the previous approach: st.cache_data loaders, which unpickle a
+          fresh copy of every frame (and derived dict) on each call
+  shared  st.cache_resource around src.shared.load_shared_data, which
+          hands every session the same read-only bundle
+
+Usage (from the repository root, Linux):
+    python benchmarks/session_memory.py [--sessions 1 10 50 100] [--output report.json]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SESSION_SCRIPT = """
+import gc, json, logging, sys
+logging.disable(logging.WARNING)  # Bare-mode cache warnings
+import streamlit as st
+from src.config import DATA_FILES
+from src.ingestion import data_version
+
+def rss_mb():
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+
+mode, sessions = sys.argv[1], int(sys.argv[2])
+version = data_version(DATA_FILES.values())
+derived = ["state_index", "anomalies", "changepoints", "correlation_stats", "risk_components"]
+
+if mode == "copy":
+    from src.ingestion import load_monthly_features, load_priority_table, load_analytics
+    from src.preprocessing import index_state_timeseries
+    from src.anomaly import detect_anomalies
+    from src.changepoint import detect_changepoints
+    from src.correlation import compute_sufficient_stats
+    from src.metrics import compute_risk_components
+
+    def by_state(df):
+        return {state: group.reset_index(drop=True) for state, group in df.groupby("state")}
+
+    @st.cache_data
+    def load_data():
+        return (load_monthly_features(DATA_FILES["monthly_features"]),
+                load_priority_table(DATA_FILES["priority_table"]),
+                load_analytics(DATA_FILES))
+
+    loaders = {
+        "state_index": st.cache_data(lambda _m, v: index_state_timeseries(_m)),
+        "anomalies": st.cache_data(lambda _m, v: by_state(detect_anomalies(_m)[0])),
+        "changepoints": st.cache_data(lambda _m, v: by_state(detect_changepoints(_m))),
+        "correlation_stats": st.cache_data(lambda _m, v: compute_sufficient_stats(_m)),
+        "risk_components": st.cache_data(lambda _m, v: compute_risk_components(_m)),
+    }
+
+    def session():
+        monthly, priority, analytics = load_data()
+        return [monthly, priority, analytics] + [loaders[key](monthly, version) for key in derived]
+else:
+    from src.shared import load_shared_data
+
+    load_data = st.cache_resource(load_shared_data)
+
+    def session():
+        data = load_data(DATA_FILES)
+        return [data] + [data[key] for key in derived]
+
+session()  # Warm the caches; the first load is not per-session cost
+gc.collect()
+baseline = rss_mb()
+alive = [session() for _ in range(sessions)]
+gc.collect()
+print(json.dumps({"baseline_mb": baseline, "rss_mb": rss_mb()}))
+"""
+
+
+def measure(mode, sessions):
+    result = subprocess.run(
+        [sys.executable, "-c", SESSION_SCRIPT, mode, str(sessions)],
+        cwd=ROOT, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="RSS against simulated sessions, copied vs shared data")
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 10, 25, 50, 100])
+    parser.add_argument("--output", help="Also write the JSON report to this file")
+    args = parser.parse_args()
+
+    report = {"unit": "MB", "results": []}
+    for sessions in args.sessions:
+        row = {"sessions": sessions}
+        for mode in ("copy", "shared"):
+            sample = measure(mode, sessions)
+            row[f"{mode}_rss"] = round(sample["rss_mb"], 1)
+            row[f"{mode}_per_session"] = round((sample["rss_mb"] - sample["baseline_mb"]) / sessions, 3)
+        report["results"].append(row)
+        print(f"{sessions:>5} sessions: copy {row['copy_rss']:>8.1f} MB   shared {row['shared_rss']:>8.1f} MB",
+              file=sys.stderr)
+
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
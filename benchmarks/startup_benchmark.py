@@ -0,0 +1,134 @@
+"""
+Startup benchmark for the dashboard.
+
+Measures, each in a fresh interpreter:
+  * the import cost of app.py's top-level imports, with a `-X importtime`
+    breakdown by top-level package (self time) and the slowest modules
+  * time-to-first-render of the Overview page: interpreter start to the
+    end of the first full script run (empty caches), via Streamlit's
+    AppTest harness
+
+Usage (from the repository root):
+    python benchmarks/startup_benchmark.py [--runs 5] [--output report.json]
+"""
+import argparse
+import ast
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = os.path.join(ROOT, "app.py")
+
+FIRST_RENDER = """
+import time
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file({app!r}, default_timeout=600)
+at.run()
+elapsed = time.perf_counter() - start
+if at.exception:
+    raise SystemExit(f"App raised: {{at.exception[0].message}}")
+import sys
+heavy = ["statsmodels", "matplotlib", "scipy", "PIL", "plotly.express"]
+print(elapsed)
+print(",".join(name for name in heavy if name in sys.modules))
+"""
+
+
+def app_imports():
+    """
+    Source of app.py's top-level import statements.
+    """
+    with open(APP) as f:
+        tree = ast.parse(f.read())
+    return "\n".join(
+        ast.unparse(node) for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom))
+    )
+
+
+def run_python(args, code):
+    result = subprocess.run(
+        [sys.executable, *args, "-c", code], cwd=ROOT, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    return result
+
+
+def import_breakdown(code, top=15):
+    """
+    Parse `-X importtime` output into per-package self time and the
+    slowest modules by cumulative time (all in milliseconds).
+    """
+    stderr = run_python(["-X", "importtime"], code).stderr
+    packages, modules = {}, []
+    total = 0
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = [part.strip() for part in line[len("import time:"):].split("|")]
+        package = name.strip().split(".")[0]
+        packages[package] = packages.get(package, 0) + int(self_us)
+        modules.append((int(cumulative_us), name.strip()))
+        total += int(self_us)
+    return {
+        "total_ms": round(total / 1000, 1),
+        "by_package_ms": {
+            name: round(us / 1000, 1)
+            for name, us in sorted(packages.items(), key=lambda item: -item[1])[:top]
+        },
+        "slowest_modules_ms": {name: round(us / 1000, 1) for us, name in sorted(modules, reverse=True)[:top]},
+    }
+
+
+def wall_time(code, runs):
+    timings = []
+    for _ in range(runs):
+        timings.append(float(run_python([], f"import time; t = time.perf_counter()\n{code}\nprint(time.perf_counter() - t)").stdout.split()[-1]))
+    return timings
+
+
+def first_render(runs):
+    timings, loaded = [], ""
+    for _ in range(runs):
+        lines = run_python([], FIRST_RENDER.format(app=APP)).stdout.strip().splitlines()
+        timings.append(float(lines[-2]))
+        loaded = lines[-1]
+    return timings, [name for name in loaded.split(",") if name]
+
+
+def summarize(timings):
+    return {
+        "median_s": round(statistics.median(timings), 3),
+        "min_s": round(min(timings), 3),
+        "max_s": round(max(timings), 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure dashboard import time and time-to-first-render")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per measurement")
+    parser.add_argument("--output", help="Also write the JSON report to this file")
+    args = parser.parse_args()
+
+    imports = app_imports()
+    render_timings, heavy_loaded = first_render(args.runs)
+    report = {
+        "python": sys.version.split()[0],
+        "runs": args.runs,
+        "app_imports": dict(summarize(wall_time(imports, args.runs)), importtime=import_breakdown(imports)),
+        "first_render_overview": dict(summarize(render_timings), heavy_modules_loaded=heavy_loaded),
+    }
+
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,42 +1,173 @@
 # UIDAI Analytics - Source Module
+#
+# Exports are resolved on first access (PEP 562 module __getattr__), so
+# importing one submodule, e.g. src.ingestion from app.py, does not load
+# Plotly, SciPy or the HTTP server with it.
 
-from .ingestion import load_monthly_features, load_priority_table
-from .preprocessing import (
-    standardize_state_names,
-    filter_states_with_history,
-    get_state_timeseries,
-    STATE_NAME_MAPPING,
-    INVALID_STATE_ENTRIES
-)
-from .visualization import low_update_bar_chart, update_trend_chart
-from .metrics import compute_rolling_average, compute_decay_signal, classify_state
-from .config import (
-    ENV, IS_PRODUCTION, DATA_DIR, DATA_FILES,
-    STAGNANT_THRESHOLD, DECAY_THRESHOLD,
-    TABLE_ROW_LIMITS, COLORS, EXPECTED_STATES_COUNT
-)
-
-__all__ = [
+import importlib
+
+# Submodule -> exported names
+_EXPORTS = {
     # Ingestion
-    'load_monthly_features',
-    'load_priority_table',
+    'ingestion': (
+        'load_monthly_features',
+        'load_priority_table',
+        'load_analytics',
+        'file_fingerprints',
+    ),
     # Preprocessing
-    'standardize_state_names',
-    'filter_states_with_history',
-    'get_state_timeseries',
-    'STATE_NAME_MAPPING',
-    'INVALID_STATE_ENTRIES',
+    'preprocessing': (
+        'standardize_state_names',
+        'filter_states_with_history',
+        'get_state_timeseries',
+        'STATE_NAME_MAPPING',
+        'INVALID_STATE_ENTRIES',
+        'state_name_resolver',
+    ),
+    # State name resolution
+    'state_names': (
+        'StateNameResolver',
+        'CANONICAL_STATES',
+        'STATE_CODES',
+    ),
+    # Data validation
+    'validation': (
+        'SCHEMAS',
+        'Validator',
+        'ValidationReport',
+        'validate_frame',
+    ),
     # Visualization
-    'low_update_bar_chart',
-    'update_trend_chart',
+    'visualization': (
+        'low_update_bar_chart',
+        'update_trend_chart',
+        'add_segment_means',
+        'add_anomaly_markers',
+        'regional_bar_chart',
+        'choropleth_map',
+        'similar_trajectories_chart',
+        'forecast_chart',
+        'correlation_heatmap',
+        'cached_figure_json',
+        'clear_figure_cache',
+    ),
+    # Choropleth geometry
+    'choropleth': (
+        'BoundarySet',
+        'state_boundaries',
+        'geometry_url',
+        'douglas_peucker',
+    ),
     # Metrics
-    'compute_rolling_average',
-    'compute_decay_signal',
-    'classify_state',
+    'metrics': (
+        'compute_rolling_average',
+        'compute_decay_signal',
+        'classify_state',
+        'classify_states',
+        'compute_risk_components',
+        'compute_risk_scores',
+        'rank_by_risk',
+    ),
+    # Date-range aggregates
+    'windows': (
+        'compute_prefix_sums',
+        'window_summary',
+        'window_priority',
+    ),
+    # Trajectory similarity
+    'similarity': (
+        'SimilarityIndex',
+        'build_similarity_index',
+        'similarity_index',
+        'series_matrix',
+        'znormalize',
+        'dtw_distance',
+    ),
+    # Anomaly detection
+    'anomaly': (
+        'detect_anomalies',
+        'score_new_months',
+    ),
+    # Change points
+    'changepoint': (
+        'pelt',
+        'detect_changepoints',
+        'summarize_segments',
+    ),
+    # Bootstrap
+    'bootstrap': (
+        'bootstrap_confidence_intervals',
+    ),
+    # Table paging
+    'tables': (
+        'paginate',
+    ),
+    # Shared read-only data
+    'shared': (
+        'load_shared_data',
+        'ReadOnlyFrame',
+        'freeze',
+        'DataStore',
+    ),
+    # Data file watching
+    'watcher': (
+        'DataWatcher',
+    ),
+    # Export
+    'export': (
+        'export_frames',
+        'iter_export',
+        'write_export',
+        'export_stream',
+        'EXPORT_DATASETS',
+    ),
+    # Tracing
+    'tracing': (
+        'traced',
+        'span',
+        'write_trace',
+    ),
+    # Pipeline
+    'pipeline': (
+        'run_pipeline',
+        'STAGES',
+    ),
+    # Static assets
+    'assets': (
+        'publish_static_content',
+    ),
+    # HTTP API
+    'api': (
+        'AnalyticsAPI',
+    ),
+    # Correlation
+    'correlation': (
+        'CORRELATION_COLUMNS',
+        'compute_sufficient_stats',
+        'merge_stats',
+        'correlation_from_stats',
+    ),
     # Config
-    'ENV', 'IS_PRODUCTION', 'DATA_DIR', 'DATA_FILES',
-    'STAGNANT_THRESHOLD', 'DECAY_THRESHOLD',
-    'TABLE_ROW_LIMITS', 'COLORS', 'EXPECTED_STATES_COUNT',
-]
+    'config': (
+        'ENV', 'IS_PRODUCTION', 'DATA_DIR', 'DATA_FILES',
+        'STAGNANT_THRESHOLD', 'DECAY_THRESHOLD', 'DEFAULT_RISK_WEIGHTS',
+        'TABLE_ROW_LIMITS', 'TABLE_PAGE_SIZE', 'COLORS', 'EXPECTED_STATES_COUNT',
+    ),
+}
+
+_MODULE_OF = {name: module for module, names in _EXPORTS.items() for name in names}
+
+__all__ = list(_MODULE_OF)
+
+
+def __getattr__(name):
+    module = _MODULE_OF.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value  # Later lookups skip __getattr__
+    return value
 
 
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
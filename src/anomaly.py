@@ -0,0 +1,246 @@
+"""
+Anomaly detection over the state-month update intensity panel.
+
+Every score is computed for all states and months at once on a dense
+(states x months) array. Baselines fitted on history can be stored and
+reused to score only newly arrived months.
+"""
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from .config import ANOMALY_Z_THRESHOLD, LEVEL_SHIFT_WINDOW, LEVEL_SHIFT_THRESHOLD
+
+# Scales MAD so that it estimates the standard deviation of normal data
+MAD_SCALE = 1.4826
+# Scales mean absolute deviation the same way (fallback when MAD is zero)
+MEAN_AD_SCALE = 1.2533
+
+SCORE_COLUMNS = [
+    "state", "year_month", "update_intensity", "robust_z", "seasonal_z",
+    "level_shift_score", "level_shift", "is_anomaly",
+]
+
+
+def build_panel(df: pd.DataFrame, value_column: str = "update_intensity"):
+    """
+    Pivot long state-month data into a dense (states x months) array.
+    Duplicate state-months are averaged and missing months are NaN.
+
+    Returns:
+        Tuple of (states, months, values)
+    """
+    panel = df.pivot_table(
+        index="state", columns="year_month", values=value_column, aggfunc="mean"
+    )
+    panel = panel.sort_index().sort_index(axis=1)
+    return panel.index.to_numpy(), panel.columns.to_numpy(), panel.to_numpy(dtype=float)
+
+
+def _nan_median(values, axis):
+    # All-NaN rows (states without data) legitimately produce NaN here
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        return np.nanmedian(values, axis=axis)
+
+
+def _robust_location_scale(values):
+    """
+    Per-row median and MAD-based scale, falling back to the mean absolute
+    deviation for rows whose MAD is zero (mostly-constant series).
+    """
+    median = _nan_median(values, axis=1)
+    deviation = np.abs(values - median[:, None])
+    scale = _nan_median(deviation, axis=1) * MAD_SCALE
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        fallback = np.nanmean(deviation, axis=1) * MEAN_AD_SCALE
+    scale = np.where(scale > 0, scale, fallback)
+    return median, scale
+
+
+def _standardize(values, location, scale):
+    """
+    (values - location) / scale per row; rows with zero scale score 0.
+    """
+    safe_scale = np.where(scale > 0, scale, 1.0)
+    z = (values - location[:, None]) / safe_scale[:, None]
+    return np.where((scale > 0)[:, None] | np.isnan(z), z, 0.0)
+
+
+def _month_effect(log_residuals):
+    """
+    Month effect shared by all states (median across states per month).
+    With a single year of history this is the only seasonal signal available.
+    """
+    return _nan_median(log_residuals, axis=0)
+
+
+def fit_baselines(states, months, values, window: int = LEVEL_SHIFT_WINDOW) -> dict:
+    """
+    Fit per-state baselines used to score months against history.
+
+    Args:
+        states: Array of state names (panel rows)
+        months: Array of months (panel columns)
+        values: (states x months) update intensity array
+        window: Level-shift window length in months
+
+    Returns:
+        Dictionary of per-state arrays plus the trailing history needed
+        to compute level shifts for the next months.
+    """
+    median, scale = _robust_location_scale(values)
+
+    log_values = np.log1p(np.clip(values, 0, None))
+    log_median = _nan_median(log_values, axis=1)
+    log_residuals = log_values - log_median[:, None]
+    residuals = log_residuals - _month_effect(log_residuals)[None, :]
+    residual_median, residual_scale = _robust_location_scale(residuals)
+
+    history_length = 2 * window - 1
+    history = np.full((len(states), history_length), np.nan)
+    tail = values[:, -history_length:]
+    history[:, history_length - tail.shape[1]:] = tail
+
+    return {
+        "states": np.asarray(states),
+        "last_month": months[-1] if len(months) else None,
+        "window": window,
+        "median": median,
+        "scale": scale,
+        "log_median": log_median,
+        "residual_median": residual_median,
+        "residual_scale": residual_scale,
+        "history": history,
+    }
+
+
+def level_shift_scores(values, scale, window: int = LEVEL_SHIFT_WINDOW):
+    """
+    Shift between the median of the trailing `window` months and the median
+    of the `window` months before them, in units of each state's scale.
+    The first 2 * window - 1 months have no score (NaN).
+    """
+    n_states, n_months = values.shape
+    scores = np.full((n_states, n_months), np.nan)
+    span = 2 * window
+    if n_months < span:
+        return scores
+
+    # windows[:, i, :] covers months i .. i + span - 1
+    windows = np.lib.stride_tricks.sliding_window_view(values, span, axis=1)
+    before = _nan_median(windows[:, :, :window], axis=2)
+    after = _nan_median(windows[:, :, window:], axis=2)
+    safe_scale = np.where(scale > 0, scale, 1.0)[:, None]
+    shift = np.where(scale[:, None] > 0, (after - before) / safe_scale, 0.0)
+    scores[:, span - 1:] = shift
+    return scores
+
+
+def _score(values, baselines, threshold, shift_threshold, history=None):
+    """
+    Score a (states x months) block against fitted baselines.
+    Level shifts are computed over `history` (if given) followed by the block.
+    """
+    window = baselines["window"]
+    robust_z = _standardize(values, baselines["median"], baselines["scale"])
+
+    log_residuals = np.log1p(np.clip(values, 0, None)) - baselines["log_median"][:, None]
+    residuals = log_residuals - _month_effect(log_residuals)[None, :]
+    seasonal_z = _standardize(
+        residuals, baselines["residual_median"], baselines["residual_scale"]
+    )
+
+    extended = values if history is None else np.concatenate([history, values], axis=1)
+    shift = level_shift_scores(extended, baselines["scale"], window)[:, -values.shape[1]:]
+
+    level_shift = np.abs(np.nan_to_num(shift)) > shift_threshold
+    is_anomaly = (
+        (np.abs(np.nan_to_num(robust_z)) > threshold)
+        | (np.abs(np.nan_to_num(seasonal_z)) > threshold)
+        | level_shift
+    )
+    return robust_z, seasonal_z, shift, level_shift, is_anomaly
+
+
+def _to_frame(states, months, values, scores):
+    """
+    Flatten panel scores into a long state-month frame, dropping empty cells.
+    """
+    robust_z, seasonal_z, shift, level_shift, is_anomaly = scores
+    frame = pd.DataFrame({
+        "state": np.repeat(states, len(months)),
+        "year_month": np.tile(months, len(states)),
+        "update_intensity": values.ravel(),
+        "robust_z": robust_z.ravel(),
+        "seasonal_z": seasonal_z.ravel(),
+        "level_shift_score": shift.ravel(),
+        "level_shift": level_shift.ravel(),
+        "is_anomaly": is_anomaly.ravel(),
+    })
+    return frame[frame["update_intensity"].notna()].reset_index(drop=True)
+
+
+def detect_anomalies(
+    df: pd.DataFrame,
+    threshold: float = ANOMALY_Z_THRESHOLD,
+    window: int = LEVEL_SHIFT_WINDOW,
+    shift_threshold: float = LEVEL_SHIFT_THRESHOLD,
+):
+    """
+    Score every state-month of the monthly feature table.
+
+    Args:
+        df: Monthly feature data with state, year_month and update_intensity
+        threshold: Absolute z-score above which a month is anomalous
+        window: Level-shift window length in months
+        shift_threshold: Level shift size (in scale units) that raises a flag
+
+    Returns:
+        Tuple of (scores, baselines): a long frame with robust_z, seasonal_z,
+        level_shift_score, level_shift and is_anomaly per state-month, and the
+        fitted baselines for incremental scoring with score_new_months.
+    """
+    states, months, values = build_panel(df)
+    baselines = fit_baselines(states, months, values, window)
+    scores = _score(values, baselines, threshold, shift_threshold)
+    return _to_frame(states, months, values, scores), baselines
+
+
+def score_new_months(
+    baselines: dict,
+    df_new: pd.DataFrame,
+    threshold: float = ANOMALY_Z_THRESHOLD,
+    shift_threshold: float = LEVEL_SHIFT_THRESHOLD,
+):
+    """
+    Score only newly arrived months against stored baselines.
+
+    Months at or before the baseline's last month are ignored, as are states
+    the baselines were not fitted on. History is not rescanned: only the
+    stored trailing window is used for level shifts.
+
+    Returns:
+        Tuple of (scores, updated_baselines). The per-state location and
+        scale are kept; only the trailing history and last month advance.
+    """
+    if baselines["last_month"] is not None:
+        df_new = df_new[df_new["year_month"] > baselines["last_month"]]
+    if df_new.empty:
+        return pd.DataFrame(columns=SCORE_COLUMNS), baselines
+
+    panel = df_new.pivot_table(
+        index="state", columns="year_month", values="update_intensity", aggfunc="mean"
+    )
+    panel = panel.reindex(baselines["states"]).sort_index(axis=1)
+    months = panel.columns.to_numpy()
+    values = panel.to_numpy(dtype=float)
+
+    scores = _score(values, baselines, threshold, shift_threshold, baselines["history"])
+
+    history_length = baselines["history"].shape[1]
+    extended = np.concatenate([baselines["history"], values], axis=1)
+    updated = dict(baselines, history=extended[:, -history_length:], last_month=months[-1])
+    return _to_frame(baselines["states"], months, values, scores), updated
@@ -0,0 +1,369 @@
+"""
+Read-only HTTP JSON API over the dashboard analytics.
+
+Serves the same data the dashboard shows (state time series, priority
+ranking, benchmarking and forecasts) to other tools, using the loaders
+from shared.py (the same read-only bundle the dashboard holds). The
+data is indexed in memory once per data version and every encoded
+response (JSON, gzip and ETag) is cached, so a request is a dictionary
+lookup. A single asyncio event loop handles many keep-alive clients.
+
+Run with: python -m src.api [--host HOST] [--port PORT]
+
+Endpoints (GET/HEAD):
+    /api/health
+    /api/states
+    /api/states/{state}            monthly time series
+    /api/priority?status=&limit=   priority ranking
+    /api/benchmarking?limit=
+    /api/forecasts
+    /api/forecasts/{state}
+"""
+import argparse
+import asyncio
+import contextlib
+import gzip
+import hashlib
+import json
+import logging
+from collections import OrderedDict
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import pandas as pd
+
+from .config import (
+    DATA_FILES,
+    API_HOST,
+    API_PORT,
+    API_KEEPALIVE_SECONDS,
+    API_RESPONSE_CACHE_SIZE,
+    API_GZIP_MIN_BYTES,
+    API_MAX_BODY_BYTES,
+)
+from .shared import DataStore
+
+logger = logging.getLogger(__name__)
+
+REASONS = {
+    200: "OK",
+    304: "Not Modified",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+}
+
+
+def build_index(data) -> dict:
+    """
+    Index a shared data snapshot for lookups by state.
+    """
+    priority = data["priority"]
+    forecasts = data["analytics"]["forecasts"]
+    return {
+        "version": data.version,
+        "states": sorted(priority["state"].unique()),
+        "state_index": data["state_index"],
+        "priority": priority.sort_values("priority_rank").reset_index(drop=True),
+        "benchmarking": data["analytics"]["benchmarking"],
+        "forecasts": forecasts,
+        "forecast_index": (
+            {state: group for state, group in forecasts.groupby("state", sort=False)}
+            if not forecasts.empty else {}
+        ),
+    }
+
+
+def _records(df: pd.DataFrame) -> str:
+    # JSON array of row objects; NaN becomes null and dates ISO strings
+    return df.to_json(orient="records", date_format="iso")
+
+
+def _limit(query: dict, total: int) -> int:
+    value = query.get("limit", [None])[0]
+    if value is None:
+        return total
+    if not (value.isascii() and value.isdigit()):
+        raise ValueError("limit must be a non-negative integer")
+    return int(value)
+
+
+def _state_timeseries(index, state, query):
+    ts = index["state_index"].get(state.upper())
+    return None if ts is None else _records(ts)
+
+
+def _priority(index, query):
+    priority = index["priority"]
+    status = query.get("status", [None])[0]
+    if status is not None:
+        priority = priority[priority["state_status"] == status.upper()]
+    return _records(priority.head(_limit(query, len(priority))))
+
+
+def _benchmarking(index, query):
+    benchmarking = index["benchmarking"]
+    if not benchmarking.empty:
+        benchmarking = benchmarking.sort_values("avg_intensity", ascending=False)
+    return _records(benchmarking.head(_limit(query, len(benchmarking))))
+
+
+def _state_forecast(index, state, query):
+    forecast = index["forecast_index"].get(state.upper())
+    return None if forecast is None else _records(forecast)
+
+
+# Exact paths and /prefix/{state} paths -> builder returning a JSON fragment
+ROUTES = {
+    "/api/health": lambda index, query: "null",
+    "/api/states": lambda index, query: json.dumps(index["states"]),
+    "/api/priority": _priority,
+    "/api/benchmarking": _benchmarking,
+    "/api/forecasts": lambda index, query: _records(index["forecasts"]),
+}
+STATE_ROUTES = {
+    "/api/states/": _state_timeseries,
+    "/api/forecasts/": _state_forecast,
+}
+
+
+def _encode(status: int, payload: dict, data: str = None):
+    """
+    Encoded response: (status, body, gzip body or None, etag).
+    `data` is an already serialised JSON fragment placed under "data".
+    """
+    body = json.dumps(payload)
+    if data is not None:
+        body = f'{body[:-1]}, "data": {data}}}'
+    body = body.encode()
+    compressed = gzip.compress(body, mtime=0) if len(body) >= API_GZIP_MIN_BYTES else None
+    etag = f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+    return status, body, compressed, etag
+
+
+def _error(status: int, message: str):
+    return _encode(status, {"error": message})
+
+
+def _accepts_gzip(header: str) -> bool:
+    for token in header.split(","):
+        name, _, params = token.strip().partition(";")
+        if name.strip().lower() in ("gzip", "*"):
+            return params.replace(" ", "") not in ("q=0", "q=0.0", "q=0.00", "q=0.000")
+    return False
+
+
+def _etag_matches(header: str, etags) -> bool:
+    for token in header.split(","):
+        token = token.strip()
+        if token == "*" or token.removeprefix("W/") in etags:
+            return True
+    return False
+
+
+def _content_length(headers: dict) -> int:
+    """
+    Declared request body size; ValueError unless a non-negative integer
+    up to API_MAX_BODY_BYTES.
+    """
+    value = headers.get("content-length", "").strip()
+    if not value:
+        return 0
+    if not (value.isascii() and value.isdigit()):
+        raise ValueError(f"Invalid Content-Length: {value[:40]!r}")
+    length = int(value)
+    if length > API_MAX_BODY_BYTES:
+        raise ValueError(f"Request body too large ({length} bytes, at most {API_MAX_BODY_BYTES})")
+    return length
+
+
+class AnalyticsAPI:
+    """
+    Request routing and response caching over one in-memory data index.
+    The index and its response cache are swapped together when the data
+    files change, so requests always see a consistent version.
+    """
+
+    def __init__(self, files: dict = DATA_FILES):
+        self.files = files
+        self.store = None
+        self._state = (None, OrderedDict())
+
+    @property
+    def version(self):
+        index = self._state[0]
+        return None if index is None else index["version"]
+
+    def load(self):
+        """
+        Load the data store and index its current snapshot.
+        """
+        self.store = DataStore(self.files)
+        self._use(self.store.current())
+
+    def _use(self, snapshot, changed=None):
+        self._state = (build_index(snapshot), OrderedDict())
+        if changed:
+            logger.info("Reloaded data version %s (%s changed)", self.version, ", ".join(sorted(changed)))
+
+    @staticmethod
+    def _route(path):
+        """
+        Builder for a path and its extra arguments, or None if unknown.
+        """
+        builder = ROUTES.get(path)
+        if builder is not None:
+            return builder, ()
+        for prefix, builder in STATE_ROUTES.items():
+            if path.startswith(prefix) and len(path) > len(prefix):
+                return builder, (unquote(path[len(prefix):]),)
+        return None
+
+    def response(self, target: str):
+        """
+        Encoded response for a request target (path and query string).
+        Successful responses are cached per data version.
+        """
+        index, cache = self._state
+        split = urlsplit(target)
+        path = split.path.rstrip("/") or "/"
+        query = parse_qs(split.query)
+        key = (path, tuple(sorted((k, tuple(v)) for k, v in query.items())))
+
+        cached = cache.get(key)
+        if cached is not None:
+            cache.move_to_end(key)
+            return cached
+
+        route = self._route(path)
+        if route is None:
+            return _error(404, f"Unknown endpoint: {path}")
+        builder, args = route
+        try:
+            data = builder(index, *args, query)
+        except ValueError as e:
+            return _error(400, str(e))
+        if data is None:
+            return _error(404, f"No data for {unquote(path.rsplit('/', 1)[-1])}")
+
+        encoded = _encode(200, {"version": index["version"]}, data)
+        cache[key] = encoded
+        while len(cache) > API_RESPONSE_CACHE_SIZE:
+            cache.popitem(last=False)
+        return encoded
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """
+        Serve HTTP/1.1 requests on one connection until it is closed or idle.
+        """
+        try:
+            while True:
+                try:
+                    head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), API_KEEPALIVE_SECONDS)
+                except (asyncio.TimeoutError, asyncio.IncompleteReadError,
+                        asyncio.LimitOverrunError, ConnectionError):
+                    break
+
+                lines = head.decode("latin-1").split("\r\n")
+                try:
+                    method, target, http_version = lines[0].split(" ", 2)
+                except ValueError:
+                    writer.write(self._serialize(_error(400, "Malformed request line"), {}, "GET", False))
+                    break
+                headers = {}
+                for line in lines[1:]:
+                    name, sep, value = line.partition(":")
+                    if sep:
+                        headers[name.strip().lower()] = value.strip()
+
+                # Request bodies are not used, but must be consumed on a kept-alive connection
+                try:
+                    length = _content_length(headers)
+                except ValueError as e:
+                    # The body cannot be framed, so the connection cannot be reused
+                    writer.write(self._serialize(_error(400, str(e)), headers, "GET", False))
+                    break
+                if length:
+                    try:
+                        await reader.readexactly(length)
+                    except (asyncio.IncompleteReadError, ConnectionError):
+                        break
+
+                connection = headers.get("connection", "").lower()
+                keep_alive = connection == "keep-alive" or (http_version == "HTTP/1.1" and connection != "close")
+
+                if method in ("GET", "HEAD"):
+                    response = self.response(target)
+                else:
+                    response = _error(405, f"Method {method} not allowed")
+                writer.write(self._serialize(response, headers, method, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+            with contextlib.suppress(ConnectionError):
+                await writer.wait_closed()
+
+    @staticmethod
+    def _serialize(response, headers: dict, method: str, keep_alive: bool) -> bytes:
+        status, body, compressed, etag = response
+        # The gzip representation gets its own entity tag
+        gzip_etag = f'{etag[:-1]}-gzip"'
+        use_gzip = compressed is not None and _accepts_gzip(headers.get("accept-encoding", ""))
+
+        out = [
+            "Content-Type: application/json; charset=utf-8",
+            "Cache-Control: no-cache",
+            "Vary: Accept-Encoding",
+            f"Connection: {'keep-alive' if keep_alive else 'close'}",
+        ]
+        if status == 200:
+            out.append(f"ETag: {gzip_etag if use_gzip else etag}")
+            if _etag_matches(headers.get("if-none-match", ""), (etag, gzip_etag)):
+                status, body = 304, b""
+        if status != 304 and use_gzip:
+            body = compressed
+            out.append("Content-Encoding: gzip")
+        if status == 405:
+            out.append("Allow: GET, HEAD")
+        if status != 304:  # A 304 has no body and no length of its own
+            out.append(f"Content-Length: {len(body)}")
+
+        head = f"HTTP/1.1 {status} {REASONS[status]}\r\n" + "\r\n".join(out) + "\r\n\r\n"
+        return head.encode("latin-1") + (b"" if method == "HEAD" else body)
+
+    async def serve(self, host: str = API_HOST, port: int = API_PORT, watch: bool = True):
+        """
+        Load the data and serve until cancelled. With `watch`, changed data
+        files are reloaded and the index is swapped without a restart.
+        """
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self.load)
+        if watch:
+            self.store.watch(on_swap=self._use)
+        server = await asyncio.start_server(self.handle, host, port, backlog=1024)
+        logger.info("Serving data version %s on http://%s:%s", self.version, host, port)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.store.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Read-only JSON API over the UIDAI analytics")
+    parser.add_argument("--host", default=API_HOST)
+    parser.add_argument("--port", type=int, default=API_PORT)
+    parser.add_argument("--no-watch", action="store_true", help="Do not reload changed data files")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(levelname)s %(message)s")
+    try:
+        asyncio.run(AnalyticsAPI().serve(args.host, args.port, watch=not args.no_watch))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""
+Static asset publishing for large generated artifacts.
+
+Generated content such as the simplified map geometry is written once
+into Streamlit's static folder under a content-hashed name, so pages
+embed only a URL instead of pushing the data through the websocket on
+every rerun. New content gets a new name, so a browser never reuses a
+stale copy. Streamlit serves the folder with its own caching and
+compression headers; nothing here changes those.
+"""
+import hashlib
+import os
+
+from .config import STATIC_DIR, STATIC_URL_PREFIX
+
+
+def _write_atomic(path: str, content: bytes):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+
+def publish_static_content(content: bytes, filename: str, static_dir: str = STATIC_DIR,
+                           url_prefix: str = STATIC_URL_PREFIX) -> str:
+    """
+    Publish generated content (e.g. simplified map geometry) like a file
+    named `filename`; returns its relative URL.
+    """
+    stem, suffix = os.path.splitext(filename)
+    digest = hashlib.blake2b(content, digest_size=8).hexdigest()
+    name = f"{stem}.{digest}{suffix}"
+    target = os.path.join(static_dir, name)
+
+    os.makedirs(static_dir, exist_ok=True)
+    if not os.path.exists(target):
+        _write_atomic(target, content)
+
+    # Remove earlier versions of the same asset
+    for entry in os.listdir(static_dir):
+        if entry.startswith(f"{stem}.") and entry != name:
+            os.remove(os.path.join(static_dir, entry))
+
+    return f"{url_prefix}/{name}"
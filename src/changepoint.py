@@ -0,0 +1,212 @@
+"""
+Change-point detection on state update intensity series.
+
+Replaces the fixed first-3 vs last-3 months split of the effect size
+analysis with data-driven segments found by PELT (pruned exact linear
+time search) under a Gaussian change-in-mean cost. Results are cached
+per series hash, and uncached series are spread across processes when
+there are enough of them.
+"""
+import hashlib
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from .config import (
+    CHANGEPOINT_MIN_SIZE,
+    CHANGEPOINT_PENALTY_FACTOR,
+    CHANGEPOINT_CACHE_SIZE,
+    CHANGEPOINT_PARALLEL_MIN_SERIES,
+)
+
+# series hash -> tuple of segment end indices
+_SEGMENT_CACHE = {}
+
+
+def default_penalty(values, factor: float = CHANGEPOINT_PENALTY_FACTOR) -> float:
+    """
+    BIC-style penalty: factor * log(n) * noise variance, with the noise
+    estimated from the MAD of first differences (robust to the shifts
+    being searched for).
+    """
+    n = len(values)
+    if n < 2:
+        return 0.0
+    diffs = np.diff(values)
+    sigma = np.median(np.abs(diffs - np.median(diffs))) * 1.4826 / math.sqrt(2)
+    if sigma == 0:
+        sigma = np.std(values)
+    return factor * math.log(n) * max(sigma, 1e-12) ** 2
+
+
+def _total_cost(s1, s2, best, candidates, end):
+    """Best cost up to each candidate split plus the cost of the segment from it to `end`."""
+    length = np.maximum(end - candidates, 1)
+    segment_sum = s1[end] - s1[candidates]
+    cost = (s2[end] - s2[candidates]) - segment_sum * segment_sum / length
+    return best[candidates] + cost
+
+
+def pelt(values, penalty: float = None, min_size: int = CHANGEPOINT_MIN_SIZE):
+    """
+    Optimal segmentation of a series under a change-in-mean cost.
+
+    Args:
+        values: 1-D array of observations
+        penalty: Cost added per segment (defaults to default_penalty)
+        min_size: Minimum number of points per segment
+
+    Returns:
+        List of segment end indices (exclusive), the last one being len(values)
+    """
+    x = np.asarray(values, dtype=float)
+    n = len(x)
+    if n < 2 * min_size:
+        return [n]
+    if penalty is None:
+        penalty = default_penalty(x)
+
+    # Segment cost from prefix sums: sum of squared deviations from the mean
+    s1 = np.r_[0.0, np.cumsum(x)]
+    s2 = np.r_[0.0, np.cumsum(x * x)]
+
+    best = np.full(n + 1, np.inf)
+    best[0] = -penalty
+    previous = np.zeros(n + 1, dtype=int)
+    candidates = np.array([0])
+
+    for end in range(min_size, n + 1):
+        # A split point becomes admissible once a full segment fits after it
+        newest = end - min_size
+        if newest >= min_size:
+            candidates = np.append(candidates, newest)
+            # Pruning: a split point that loses to `newest` at newest can never
+            # be optimal for ends from newest + min_size on, i.e. from now on
+            # (ends before that cannot split at newest, so the test waits)
+            candidates = candidates[_total_cost(s1, s2, best, candidates, newest) <= best[newest]]
+
+        total = _total_cost(s1, s2, best, candidates, end)
+        i = np.argmin(total)
+        best[end] = total[i] + penalty
+        previous[end] = candidates[i]
+
+    ends = []
+    end = n
+    while end > 0:
+        ends.append(int(end))
+        end = previous[end]
+    return ends[::-1]
+
+
+def _series_key(values, penalty, min_size):
+    digest = hashlib.blake2b(np.ascontiguousarray(values, dtype=float).tobytes(), digest_size=16)
+    digest.update(repr((penalty, min_size)).encode())
+    return digest.hexdigest()
+
+
+def _pelt_task(args):
+    return tuple(pelt(*args))
+
+
+def _remember(key, ends):
+    if len(_SEGMENT_CACHE) >= CHANGEPOINT_CACHE_SIZE:
+        # Evict the oldest entry (dicts keep insertion order)
+        _SEGMENT_CACHE.pop(next(iter(_SEGMENT_CACHE)))
+    _SEGMENT_CACHE[key] = ends
+
+
+def state_series(df: pd.DataFrame, value_column: str = "update_intensity") -> dict:
+    """
+    Per-state monthly series sorted by month; duplicate months are averaged.
+
+    Returns:
+        Dictionary of state -> (months, values)
+    """
+    monthly = (
+        df.groupby(["state", "year_month"], sort=True)[value_column]
+        .mean()
+        .dropna()
+        .reset_index()
+    )
+    return {
+        state: (group["year_month"].to_numpy(), group[value_column].to_numpy(dtype=float))
+        for state, group in monthly.groupby("state", sort=True)
+    }
+
+
+def detect_changepoints(
+    df: pd.DataFrame,
+    value_column: str = "update_intensity",
+    penalty: float = None,
+    min_size: int = CHANGEPOINT_MIN_SIZE,
+    n_jobs: int = None,
+) -> pd.DataFrame:
+    """
+    Segment every state's series into constant-mean pieces.
+
+    Args:
+        df: Monthly feature data with state and year_month columns
+        value_column: Series to segment
+        penalty: Fixed per-segment penalty (default: per-series default_penalty)
+        min_size: Minimum months per segment
+        n_jobs: Worker processes for uncached series (None = CPU count, 1 = serial)
+
+    Returns:
+        DataFrame with one row per segment: state, segment, start_month,
+        end_month, n_months and mean
+    """
+    series = state_series(df, value_column)
+
+    keys = {state: _series_key(values, penalty, min_size) for state, (_, values) in series.items()}
+    missing = [state for state, key in keys.items() if key not in _SEGMENT_CACHE]
+
+    tasks = [(series[state][1], penalty, min_size) for state in missing]
+    n_jobs = n_jobs or os.cpu_count() or 1
+    if n_jobs > 1 and len(tasks) >= CHANGEPOINT_PARALLEL_MIN_SERIES:
+        with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+            results = list(pool.map(_pelt_task, tasks, chunksize=max(1, len(tasks) // (4 * n_jobs))))
+    else:
+        results = [_pelt_task(task) for task in tasks]
+    for state, ends in zip(missing, results):
+        _remember(keys[state], ends)
+
+    rows = []
+    for state, (months, values) in series.items():
+        ends = _SEGMENT_CACHE.get(keys[state]) or tuple(pelt(values, penalty, min_size))
+        start = 0
+        for segment, end in enumerate(ends):
+            rows.append({
+                "state": state,
+                "segment": segment,
+                "start_month": months[start],
+                "end_month": months[end - 1],
+                "n_months": end - start,
+                "mean": values[start:end].mean(),
+            })
+            start = end
+    return pd.DataFrame(rows, columns=["state", "segment", "start_month", "end_month", "n_months", "mean"])
+
+
+def summarize_segments(segments: pd.DataFrame) -> pd.DataFrame:
+    """
+    Per-state comparison of the first and last detected segments, a
+    data-driven replacement for the fixed early/recent split.
+
+    Returns:
+        DataFrame with state, n_segments, first_mean, last_mean, change and
+        last_change_month (start of the last segment; NaT if no change)
+    """
+    grouped = segments.sort_values(["state", "segment"]).groupby("state", sort=True)
+    first = grouped.first()
+    last = grouped.last()
+    summary = pd.DataFrame({
+        "n_segments": grouped.size(),
+        "first_mean": first["mean"],
+        "last_mean": last["mean"],
+    })
+    summary["change"] = summary["last_mean"] - summary["first_mean"]
+    summary["last_change_month"] = last["start_month"].where(summary["n_segments"] > 1)
+    return summary.reset_index()
@@ -0,0 +1,179 @@
+"""
+Choropleth geometry from bundled boundary GeoJSON.
+
+Boundaries are read once per process from a GeoJSON file whose features
+carry their key in properties.code (ISO 3166-2 codes for states, see
+STATE_CODES). Each level of detail in CHOROPLETH_LEVELS is a
+Douglas-Peucker simplification of the source, computed on first use and
+kept for the life of the process. Metrics are joined to the features by
+state name -> code.
+
+Geometry and metrics are sent separately: geometry_url() publishes a
+level once as a content-hashed static file (see assets.py), and map
+figures refer to it by URL. The browser downloads it from the app
+server (afterwards Streamlit's static handler answers revalidations by
+ETag); changing a filter or metric only sends new location and value
+arrays over the websocket. Nothing is fetched from the internet.
+
+The bundled state boundaries (data/geo/india_states.geojson) were
+converted from echarts-countries-pypkg 0.1.6 (MIT). They predate the
+2019-2020 reorganisation: Ladakh is drawn within Jammu and Kashmir, and
+Lakshadweep has no shape. A district file with the same layout can be
+loaded with BoundarySet.
+"""
+import json
+import threading
+
+import numpy as np
+
+from .assets import publish_static_content
+from .config import CHOROPLETH_LEVELS, STATE_GEOJSON_FILE
+from .state_names import STATE_CODES
+
+
+def douglas_peucker(points: np.ndarray, tolerance: float) -> np.ndarray:
+    """
+    Points of a polyline kept by Douglas-Peucker simplification: every
+    dropped point lies within `tolerance` of the simplified line.
+    """
+    if tolerance <= 0 or len(points) < 3:
+        return points
+    keep = np.zeros(len(points), dtype=bool)
+    keep[0] = keep[-1] = True
+    stack = [(0, len(points) - 1)]
+    while stack:
+        first, last = stack.pop()
+        if last - first < 2:
+            continue
+        start, inner = points[first], points[first + 1:last]
+        dx, dy = points[last] - start
+        length = np.hypot(dx, dy)
+        if length > 0:
+            distance = np.abs(dx * (inner[:, 1] - start[1]) - dy * (inner[:, 0] - start[0])) / length
+        else:  # Closed ring: first and last point coincide
+            distance = np.hypot(inner[:, 0] - start[0], inner[:, 1] - start[1])
+        farthest = int(np.argmax(distance))
+        if distance[farthest] > tolerance:
+            split = first + 1 + farthest
+            keep[split] = True
+            stack.append((first, split))
+            stack.append((split, last))
+    return points[keep]
+
+
+def _signed_area(ring: np.ndarray) -> float:
+    x, y = ring[:, 0], ring[:, 1]
+    return 0.5 * float(np.dot(x[:-1], y[1:]) - np.dot(x[1:], y[:-1]))
+
+
+def _simplify_polygon(rings, tolerance):
+    """Simplified rings of one polygon, or None if its exterior collapses."""
+    simplified = []
+    for i, ring in enumerate(rings):
+        points = douglas_peucker(np.asarray(ring, dtype=float), tolerance)
+        if len(points) < 4 or _signed_area(points) == 0:
+            if i == 0:
+                return None
+            continue  # Collapsed hole
+        # d3 (and so Plotly) fills clockwise exteriors; the other winding fills the globe
+        clockwise = _signed_area(points) < 0
+        if clockwise != (i == 0):
+            points = points[::-1]
+        simplified.append(np.round(points, 4).tolist())
+    return simplified
+
+
+def _polygons(geometry):
+    if geometry["type"] == "Polygon":
+        return [geometry["coordinates"]]
+    if geometry["type"] == "MultiPolygon":
+        return geometry["coordinates"]
+    raise ValueError(f"Unsupported geometry type {geometry['type']}")
+
+
+class BoundarySet:
+    """
+    Boundaries read from one GeoJSON file, with cached levels of detail.
+
+    Args:
+        path: GeoJSON FeatureCollection with a code in each feature's properties
+        levels: Level name -> Douglas-Peucker tolerance (in the file's units)
+    """
+
+    def __init__(self, path: str, levels: dict = CHOROPLETH_LEVELS):
+        self.path = path
+        self.levels = levels
+        with open(path) as f:
+            self._features = json.load(f)["features"]
+        self.codes = [feature["properties"]["code"] for feature in self._features]
+        self._cache = {}  # Level -> (GeoJSON dict, serialised bytes)
+        self._lock = threading.Lock()
+
+    def _build(self, level):
+        tolerance = self.levels[level]
+        features = []
+        for feature in self._features:
+            source = _polygons(feature["geometry"])
+            kept = [p for p in (_simplify_polygon(rings, tolerance) for rings in source) if p is not None]
+            if not kept:  # Too small for this level: keep the source outline
+                kept = [p for p in (_simplify_polygon(rings, 0) for rings in source) if p is not None]
+            geometry = ({"type": "Polygon", "coordinates": kept[0]} if len(kept) == 1
+                        else {"type": "MultiPolygon", "coordinates": kept})
+            features.append({"type": "Feature", "properties": {"code": feature["properties"]["code"]},
+                             "geometry": geometry})
+        geojson = {"type": "FeatureCollection", "features": features}
+        return geojson, json.dumps(geojson, separators=(",", ":")).encode()
+
+    def _level(self, level):
+        with self._lock:
+            if level not in self._cache:
+                self._cache[level] = self._build(level)
+            return self._cache[level]
+
+    def geojson(self, level: str) -> dict:
+        """FeatureCollection at a level of detail (shared; treat as read-only)."""
+        return self._level(level)[0]
+
+    def payload(self, level: str) -> bytes:
+        """Compact JSON bytes of a level, as published."""
+        return self._level(level)[1]
+
+    def vertex_count(self, level: str) -> int:
+        return sum(len(ring) for feature in self.geojson(level)["features"]
+                   for polygon in _polygons(feature["geometry"]) for ring in polygon)
+
+
+_state_boundaries = None
+_state_boundaries_lock = threading.Lock()
+
+
+def state_boundaries() -> BoundarySet:
+    """Process-wide state boundaries, read from STATE_GEOJSON_FILE on first use."""
+    global _state_boundaries
+    with _state_boundaries_lock:
+        if _state_boundaries is None:
+            _state_boundaries = BoundarySet(STATE_GEOJSON_FILE)
+        return _state_boundaries
+
+
+def geometry_url(level: str, boundaries: BoundarySet = None) -> str:
+    """Publish a level of detail as a static file; returns its URL."""
+    boundaries = boundaries or state_boundaries()
+    return publish_static_content(boundaries.payload(level), f"india_states_{level}.geojson")
+
+
+def join_metric(df, column: str, codes) -> dict:
+    """
+    Locations, values and names for a choropleth: rows of `df` (state plus
+    `column`) whose state has a shape among `codes`. States without one
+    are listed under "unmapped".
+    """
+    drawn = set(codes)
+    state_codes = df["state"].map(STATE_CODES)
+    mapped = state_codes.isin(drawn).to_numpy()
+    return {
+        "locations": state_codes[mapped].to_numpy(dtype=object),
+        "values": df[column].to_numpy(dtype=float)[mapped],
+        "names": df["state"].to_numpy(dtype=object)[mapped],
+        "unmapped": sorted(df["state"][~mapped].unique().tolist()),
+    }
@@ -23,24 +23,150 @@ DATA_FILES = {
     "forecasts": os.path.join(DATA_DIR, "state_forecasts_3month.csv"),
     "benchmarking": os.path.join(DATA_DIR, "state_benchmarking.csv"),
     "effect_size": os.path.join(DATA_DIR, "effect_size_analysis.csv"),
+    "geographical": os.path.join(DATA_DIR, "state_geographical_analysis.csv"),
     "india_map": os.path.join(DATA_DIR, "india_interactive_map.html"),
+    "confidence_intervals_png": os.path.join(DATA_DIR, "confidence_intervals.png"),
+    "correlation_heatmap_png": os.path.join(DATA_DIR, "correlation_heatmap.png"),
+    "forecasts_png": os.path.join(DATA_DIR, "forecasts_visualization.png"),
+    "regional_comparison_png": os.path.join(DATA_DIR, "regional_comparison.png"),
+    "state_visualization_png": os.path.join(DATA_DIR, "india_state_visualization.png"),
 }
 
+# ==============================
+# Pipeline
+# ==============================
+# Raw extracts as in notebook 01: <RAW_DATA_DIR>/{enrolment,demographic,biometric}/*.csv
+RAW_DATA_DIR = os.getenv("UIDAI_RAW_DATA_DIR", DATA_DIR)
+PIPELINE_STATE_DIR = os.path.join(DATA_DIR, ".pipeline")  # Hash manifest and intermediate frames
+PIPELINE_JOBS = int(os.getenv("UIDAI_PIPELINE_JOBS", "3"))  # Worker processes for independent stages
+VALIDATION_CHUNK_ROWS = 250_000  # Raw CSV rows read and validated at a time during ingestion
+
+# ==============================
+# State Names
+# ==============================
+# Unknown spellings resolved by edit distance are remembered here (see state_names.py)
+STATE_LOOKUP_FILE = os.getenv("UIDAI_STATE_LOOKUP_FILE", os.path.join(DATA_DIR, "state_name_lookup.json"))
+STATE_MATCH_MIN_SCORE = 0.8  # Minimum similarity (1 - edits / length) to resolve a name
+STATE_MATCH_MAX_EDITS = 3    # And at most this many edits, however long the name
+
+# ==============================
+# Data Reloading
+# ==============================
+DATA_WATCH_ENABLED = os.getenv("UIDAI_WATCH_DATA", "1") == "1"  # Hot-reload changed data files
+DATA_WATCH_POLL_SECONDS = 5.0       # Stat scan interval when native watching is unavailable
+DATA_WATCH_DEBOUNCE_SECONDS = 1.0   # Quiet period before a burst of writes triggers a reload
+
+# ==============================
+# Tracing
+# ==============================
+TRACE_ENABLED = os.getenv("UIDAI_TRACE", "0") == "1"         # Spans are no-ops unless enabled
+TRACE_FILE = os.getenv("UIDAI_TRACE_FILE", "trace.json")     # Chrome trace / Perfetto JSON
+TRACE_MEMORY = os.getenv("UIDAI_TRACE_MEMORY", "1") == "1"  # tracemalloc peaks (slows traced code)
+TRACE_MAX_EVENTS = 100_000    # Most recent spans kept for the trace file
+TRACE_FLUSH_SECONDS = 5.0     # Minimum interval between trace file rewrites
+
+# ==============================
+# Image Derivatives
+# ==============================
+# Web-sized copies of the dpi=300 PNGs, keyed by source content hash
+IMAGE_DERIVATIVE_DIR = os.getenv("UIDAI_IMAGE_CACHE_DIR", os.path.join(DATA_DIR, "derivatives"))
+IMAGE_DERIVATIVE_WIDTHS = (480, 960, 1440)   # 1440 stays under Streamlit's resize limit
+IMAGE_DERIVATIVE_FORMATS = ("jpeg",)   # What st.image is given; add "webp" to also write WebP copies
+IMAGE_MEMORY_CACHE_BYTES = 32 * 1024 * 1024  # Derivative bytes kept in memory
+
+# ==============================
+# Choropleth Map
+# ==============================
+# Bundled boundaries, not part of the generated data (features keyed by properties.code)
+STATE_GEOJSON_FILE = os.getenv("UIDAI_STATE_GEOJSON", os.path.join("data", "geo", "india_states.geojson"))
+# Level of detail -> Douglas-Peucker tolerance in degrees (0: source geometry)
+CHOROPLETH_LEVELS = {"high": 0.0, "medium": 0.02, "low": 0.1}
+CHOROPLETH_DEFAULT_LEVEL = "medium"
+
+# ==============================
+# Static Assets
+# ==============================
+# Streamlit serves <app dir>/static at app/static when static serving is on
+STATIC_DIR = os.getenv("UIDAI_STATIC_DIR", "static")
+STATIC_URL_PREFIX = os.getenv("UIDAI_STATIC_URL", "app/static")
+
+# ==============================
+# HTTP API
+# ==============================
+API_HOST = os.getenv("UIDAI_API_HOST", "127.0.0.1")
+API_PORT = int(os.getenv("UIDAI_API_PORT", "8765"))
+API_KEEPALIVE_SECONDS = 15     # Idle time before a keep-alive connection is closed
+API_RESPONSE_CACHE_SIZE = 1024  # Encoded responses kept per data version
+API_GZIP_MIN_BYTES = 512       # Smaller bodies are sent uncompressed
+API_MAX_BODY_BYTES = 64 * 1024  # Larger request bodies are refused (the API reads none)
+
 # ==============================
 # Classification Thresholds
 # ==============================
 STAGNANT_THRESHOLD = 1e-6  # Below this is considered stagnant
 DECAY_THRESHOLD = -0.01    # Decay signal threshold (1% decline)
 
+# ==============================
+# Risk Score Weights
+# ==============================
+# Notebook 05: risk = -avg_decay_signal + 0.5 * update_volatility + 1 / (recent + 1)
+DEFAULT_RISK_WEIGHTS = {
+    "decay": 1.0,
+    "volatility": 0.5,
+    "recency": 1.0,
+}
+
+# ==============================
+# Anomaly Detection
+# ==============================
+ANOMALY_Z_THRESHOLD = 3.5      # Robust z-score beyond which a month is anomalous
+LEVEL_SHIFT_WINDOW = 3         # Months in each window compared for a level shift
+LEVEL_SHIFT_THRESHOLD = 3.0    # Minimum shift between windows, in MAD units
+
+# ==============================
+# Change-Point Detection
+# ==============================
+CHANGEPOINT_MIN_SIZE = 2            # Minimum months per segment
+CHANGEPOINT_PENALTY_FACTOR = 2.0    # Penalty = factor * log(n) * noise variance
+CHANGEPOINT_CACHE_SIZE = 4096       # Series results kept in the per-hash cache
+CHANGEPOINT_PARALLEL_MIN_SERIES = 64  # Use a process pool from this many uncached series
+
+# ==============================
+# Bootstrap Confidence Intervals
+# ==============================
+BOOTSTRAP_RESAMPLES = 10_000
+BOOTSTRAP_SEED = 2026                         # Fixed for reproducible intervals
+BOOTSTRAP_CHUNK_BYTES = 64 * 1024 * 1024      # Memory budget per resample chunk
+BOOTSTRAP_PARALLEL_MIN_RESAMPLES = 50_000     # Use a process pool from this many resamples
+
+# ==============================
+# Trajectory Similarity
+# ==============================
+SIMILARITY_METRICS = ("correlation", "dtw")  # Compared on z-normalised update intensity
+SIMILARITY_TOP_K = 5                         # Neighbours kept per series
+SIMILARITY_DTW_BAND = 2                      # Sakoe-Chiba band half-width, in months
+SIMILARITY_MIN_OVERLAP = 3                   # Months two series must share to be compared
+SIMILARITY_EXACT_MAX_SERIES = 500            # Larger sets use the approximate index
+SIMILARITY_PAA_SEGMENTS = 16                 # Approximate index: dimensions of the reduced series
+SIMILARITY_CANDIDATES = 100                  # Approximate index: candidates re-ranked per series
+SIMILARITY_BLOCK_BYTES = 64 * 1024 * 1024    # Memory budget per block of pairs
+
 # ==============================
 # Display Settings
 # ==============================
+# Rows per table page (low_activity: bars in the low-activity chart)
 TABLE_ROW_LIMITS = {
     "priority_matrix": 15,
     "benchmarking": 20,
     "effect_size": 10,
     "low_activity": 10,
+    "history": 12,
 }
+TABLE_PAGE_SIZE = 25            # Rows per page for tables not listed above
+TABLE_INDEX_CACHE_SIZE = 256    # Cached sort orders and filter matches
+EXPORT_CHUNK_ROWS = 50_000  # Rows encoded per CSV block / Parquet row group
+VIEW_CACHE_ENTRIES = 512  # Cached view models kept per page section
+FIGURE_CACHE_SIZE = 256   # Serialised figures kept in the per-process LRU
 
 # ==============================
 # Color Palette (UIDAI Theme)
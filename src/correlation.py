@@ -0,0 +1,151 @@
+"""
+Incremental correlation matrix over the monthly feature columns.
+
+Instead of calling df.corr() on the full frame, running sufficient
+statistics (row count, sums and cross-products) are kept per
+(state, month) cell. Appending months only adds cells, and the matrix for
+any subset of states or months is obtained by summing the selected cells.
+"""
+import numpy as np
+import pandas as pd
+
+# Columns of the 9x9 correlation matrix (same set as notebook 06)
+CORRELATION_COLUMNS = [
+    'enrol_age_5_17', 'enrol_age_18_plus',
+    'demo_age_5_17', 'demo_age_18_plus',
+    'bio_age_5_17', 'bio_age_18_plus',
+    'update_intensity', 'update_intensity_3m_avg',
+    'update_consistency'
+]
+
+# Rows per block when accumulating cross-products (bounds the n x p x p buffer)
+CHUNK_ROWS = 100_000
+
+
+def _grouped_sum(codes, values, n_groups):
+    """
+    Sum rows of `values` by integer group code with a single sort + reduceat.
+    """
+    out = np.zeros((n_groups,) + values.shape[1:])
+    if len(codes) == 0:
+        return out
+    order = np.argsort(codes, kind="stable")
+    sorted_codes = codes[order]
+    starts = np.flatnonzero(np.r_[True, sorted_codes[1:] != sorted_codes[:-1]])
+    out[sorted_codes[starts]] = np.add.reduceat(values[order], starts, axis=0)
+    return out
+
+
+def _accumulate(codes, x, n_groups):
+    """
+    Per-group count, sums and cross-products of the rows of x.
+    """
+    count = np.bincount(codes, minlength=n_groups).astype(float)
+    sums = _grouped_sum(codes, x, n_groups)
+    cross = np.zeros((n_groups, x.shape[1], x.shape[1]))
+    for start in range(0, len(x), CHUNK_ROWS):
+        block = x[start:start + CHUNK_ROWS]
+        outer = np.einsum("ni,nj->nij", block, block)
+        cross += _grouped_sum(codes[start:start + CHUNK_ROWS], outer, n_groups)
+    return count, sums, cross
+
+
+def compute_sufficient_stats(df: pd.DataFrame, columns=None, shift=None) -> dict:
+    """
+    Compute correlation sufficient statistics per (state, month) cell.
+    Rows with a missing or infinite value in any column are skipped.
+
+    Args:
+        df: Monthly feature data with state and year_month columns
+        columns: Columns to correlate (defaults to CORRELATION_COLUMNS)
+        shift: Per-column offset subtracted before accumulating. Keeps the
+            cross-products well conditioned; reuse the stored shift when
+            computing statistics for appended months.
+
+    Returns:
+        Dictionary with cell keys (states, months), count, sums and cross
+    """
+    columns = list(columns or CORRELATION_COLUMNS)
+    x = df[columns].to_numpy(dtype=float)
+    valid = np.isfinite(x).all(axis=1)
+    x = x[valid]
+    if shift is None:
+        shift = x.mean(axis=0) if len(x) else np.zeros(len(columns))
+    x = x - shift
+
+    keys = pd.MultiIndex.from_arrays([
+        df["state"].to_numpy()[valid],
+        df["year_month"].to_numpy()[valid],
+    ])
+    codes, cells = pd.factorize(keys)
+    count, sums, cross = _accumulate(codes, x, len(cells))
+    return {
+        "columns": columns,
+        "shift": np.asarray(shift, dtype=float),
+        "states": cells.get_level_values(0).to_numpy(),
+        "months": cells.get_level_values(1).to_numpy(),
+        "count": count,
+        "sums": sums,
+        "cross": cross,
+    }
+
+
+def merge_stats(base: dict, new: dict) -> dict:
+    """
+    Combine two sets of sufficient statistics (e.g. history + new months).
+    Both must have been computed with the same columns and shift.
+    Cells present in both are added together.
+    """
+    if base["columns"] != new["columns"] or not np.array_equal(base["shift"], new["shift"]):
+        raise ValueError("Statistics were computed with different columns or shift")
+
+    keys = pd.MultiIndex.from_arrays([
+        np.concatenate([base["states"], new["states"]]),
+        np.concatenate([base["months"], new["months"]]),
+    ])
+    codes, cells = pd.factorize(keys)
+    n_cells = len(cells)
+    return dict(
+        base,
+        states=cells.get_level_values(0).to_numpy(),
+        months=cells.get_level_values(1).to_numpy(),
+        count=np.bincount(codes, np.concatenate([base["count"], new["count"]]), minlength=n_cells),
+        sums=_grouped_sum(codes, np.concatenate([base["sums"], new["sums"]]), n_cells),
+        cross=_grouped_sum(codes, np.concatenate([base["cross"], new["cross"]]), n_cells),
+    )
+
+
+def correlation_from_stats(stats: dict, states=None, start=None, end=None) -> pd.DataFrame:
+    """
+    Pearson correlation matrix for a subset of cells, without rescanning rows.
+
+    Args:
+        stats: Output of compute_sufficient_stats / merge_stats
+        states: Optional iterable of states to include (e.g. one region)
+        start: Optional first month to include
+        end: Optional last month to include
+
+    Returns:
+        Correlation matrix as a DataFrame (NaN where a column has no variance)
+    """
+    mask = np.ones(len(stats["count"]), dtype=bool)
+    if states is not None:
+        mask &= np.isin(stats["states"], list(states))
+    if start is not None:
+        mask &= stats["months"] >= np.datetime64(pd.Timestamp(start))
+    if end is not None:
+        mask &= stats["months"] <= np.datetime64(pd.Timestamp(end))
+
+    columns = stats["columns"]
+    n = stats["count"][mask].sum()
+    if n < 2:
+        return pd.DataFrame(np.nan, index=columns, columns=columns)
+
+    mean = stats["sums"][mask].sum(axis=0) / n
+    cov = stats["cross"][mask].sum(axis=0) / n - np.outer(mean, mean)
+    std = np.sqrt(np.clip(np.diag(cov), 0, None))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        corr = cov / np.outer(std, std)
+    corr = np.clip(corr, -1.0, 1.0)
+    corr[np.outer(std, std) == 0] = np.nan
+    return pd.DataFrame(corr, index=columns, columns=columns)
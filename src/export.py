@@ -0,0 +1,238 @@
+"""
+Streaming export of dashboard data to CSV or Parquet.
+
+Datasets are read from a loaded data bundle (the shared snapshot in
+app.py, or load_shared_data() on the command line), so an export uses
+the already-loaded frames and per-state indexes instead of re-reading
+source files. Rows are encoded chunk by chunk, CSV as text blocks and
+Parquet as one row group per chunk, so the export code never builds the
+whole file in memory. The dashboard's download buttons pass Streamlit a
+lazy stream, which is encoded only when the button is clicked. Streamlit
+then reads the whole stream into memory and keeps the finished download
+in its media store, so dashboard downloads are not streamed to the
+browser; the command line writes chunk by chunk.
+
+Usage (from the repository root):
+    python -m src.export priority --status DECAYING --format parquet --output priority.parquet
+    python -m src.export timeseries --state KERALA > kerala.csv
+"""
+import argparse
+import io
+import sys
+
+import pandas as pd
+
+from .config import DEFAULT_RISK_WEIGHTS, EXPORT_CHUNK_ROWS
+
+# Format -> (MIME type, file extension)
+EXPORT_FORMATS = {
+    "csv": ("text/csv", ".csv"),
+    "parquet": ("application/vnd.apache.parquet", ".parquet"),
+}
+
+# Dataset -> description; state filters apply to every dataset but priority
+EXPORT_DATASETS = {
+    "priority": "Priority matrix (status filter and risk weights applied)",
+    "timeseries": "Monthly feature series",
+    "forecasts": "3-month ARIMA forecasts",
+    "anomalies": "Anomaly scores and flags",
+    "benchmarking": "State benchmarking",
+    "effect_size": "Effect size analysis",
+}
+
+
+def _chunks(df: pd.DataFrame, chunk_rows: int):
+    for start in range(0, len(df), chunk_rows):
+        yield df.iloc[start:start + chunk_rows]
+
+
+def _per_state(frames, state, chunk_rows):
+    """Chunks of a {state: frame} index, for one state or all of them."""
+    states = [state] if state is not None else list(frames)
+    for name in states:
+        if name in frames:
+            yield from _chunks(frames[name], chunk_rows)
+
+
+def export_frames(data, dataset: str, state: str = None, status_filter: str = "All",
+                  risk_weights: dict = DEFAULT_RISK_WEIGHTS, window=None, chunk_rows: int = EXPORT_CHUNK_ROWS):
+    """
+    Yield a dataset as DataFrame chunks of at most `chunk_rows` rows.
+
+    Args:
+        data: Loaded data bundle (see src.shared)
+        dataset: One of EXPORT_DATASETS
+        state: Restrict to one state (None for all states)
+        status_filter: Priority status filter ("All", "DECAYING", "HEALTHY")
+        risk_weights: Risk score weights for the priority ranking
+        window: (start, end) months the priority ranking is computed over (None: all time)
+        chunk_rows: Maximum rows per chunk
+
+    Yields:
+        DataFrame chunks (a single empty chunk if no rows match)
+    """
+    if dataset == "priority":
+        from .views import priority_matrix_view  # Deferred: pulls in Plotly
+        table = priority_matrix_view(data, status_filter, risk_weights, window=window)
+        chunks, empty = _chunks(table, chunk_rows), table.iloc[0:0]
+    elif dataset in ("timeseries", "anomalies"):
+        index = data["state_index" if dataset == "timeseries" else "anomalies"]
+        chunks = _per_state(index, state, chunk_rows)
+        empty = next(iter(index.values())).iloc[0:0] if index else pd.DataFrame()
+    elif dataset in ("forecasts", "benchmarking", "effect_size"):
+        table = data["analytics"][dataset]
+        if state is not None and "state" in table.columns:
+            table = table[table["state"] == state]
+        chunks, empty = _chunks(table, chunk_rows), table.iloc[0:0]
+    else:
+        raise ValueError(f"Unknown dataset {dataset!r}; expected one of {', '.join(EXPORT_DATASETS)}")
+
+    yielded = False
+    for chunk in chunks:
+        yielded = True
+        yield chunk
+    if not yielded:
+        yield empty
+
+
+def _csv_chunks(frames):
+    header = True
+    for frame in frames:
+        yield frame.to_csv(index=False, header=header).encode("utf-8")
+        header = False
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only stream that hands written bytes back in pieces."""
+
+    def __init__(self):
+        self._pieces = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._pieces.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def drain(self) -> bytes:
+        data, self._pieces = b"".join(self._pieces), []
+        return data
+
+
+def _parquet_chunks(frames):
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise RuntimeError("Parquet export requires pyarrow (pip install pyarrow)")
+
+    sink = _ChunkSink()
+    writer = None
+    for frame in frames:
+        if writer is None:
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+            writer = pq.ParquetWriter(sink, table.schema)
+        else:
+            table = pa.Table.from_pandas(frame, schema=writer.schema, preserve_index=False)
+        writer.write_table(table)
+        yield sink.drain()
+    if writer is not None:
+        writer.close()
+        yield sink.drain()
+
+
+def iter_export(frames, fmt: str = "csv"):
+    """
+    Encode DataFrame chunks as a stream of CSV or Parquet bytes.
+    """
+    if fmt == "csv":
+        return _csv_chunks(frames)
+    if fmt == "parquet":
+        return _parquet_chunks(frames)
+    raise ValueError(f"Unknown export format {fmt!r}; expected one of {', '.join(EXPORT_FORMATS)}")
+
+
+def write_export(data, dataset: str, fmt: str, out, **filters) -> int:
+    """
+    Stream a dataset into a binary file object; returns bytes written.
+    """
+    written = 0
+    for piece in iter_export(export_frames(data, dataset, **filters), fmt):
+        out.write(piece)
+        written += len(piece)
+    return written
+
+
+class ExportStream(io.RawIOBase):
+    """
+    Readable stream over an export; chunks are encoded as they are read.
+    """
+
+    def __init__(self, pieces):
+        self._pieces = iter(pieces)
+        self._buffer = b""
+        self._position = 0
+
+    def readable(self):
+        return True
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        # Readers may rewind before the first read; anything else is unsupported
+        if offset == 0 and whence == io.SEEK_SET and self._position == 0:
+            return 0
+        raise io.UnsupportedOperation("ExportStream is not seekable")
+
+    def readinto(self, buffer):
+        while not self._buffer:
+            piece = next(self._pieces, None)
+            if piece is None:
+                return 0
+            self._buffer = piece
+        size = min(len(buffer), len(self._buffer))
+        buffer[:size] = self._buffer[:size]
+        self._buffer = self._buffer[size:]
+        self._position += size
+        return size
+
+
+def export_stream(data, dataset: str, fmt: str, **filters) -> ExportStream:
+    """
+    Dataset export as a readable stream, e.g. for st.download_button.
+    """
+    return ExportStream(iter_export(export_frames(data, dataset, **filters), fmt))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export dashboard data to CSV or Parquet")
+    parser.add_argument("dataset", choices=list(EXPORT_DATASETS))
+    parser.add_argument("--format", choices=list(EXPORT_FORMATS), default="csv")
+    parser.add_argument("--state", help="Only this state (upper case, as shown in the dashboard)")
+    parser.add_argument("--status", default="All", choices=["All", "DECAYING", "HEALTHY"],
+                        help="Status filter for the priority dataset")
+    parser.add_argument("--window", nargs=2, metavar=("START", "END"),
+                        help="Rank priority over these months (YYYY-MM) instead of all time")
+    parser.add_argument("--chunk-rows", type=int, default=EXPORT_CHUNK_ROWS)
+    parser.add_argument("--output", default="-", help="Output file (default: stdout)")
+    args = parser.parse_args()
+
+    from .shared import load_shared_data
+
+    data = load_shared_data()
+    filters = dict(state=args.state, status_filter=args.status, chunk_rows=args.chunk_rows,
+                   window=tuple(args.window) if args.window else None)
+    if args.output == "-":
+        written = write_export(data, args.dataset, args.format, sys.stdout.buffer, **filters)
+    else:
+        with open(args.output, "wb") as f:
+            written = write_export(data, args.dataset, args.format, f, **filters)
+    print(f"Exported {args.dataset} ({written:,} bytes)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,11 +6,10 @@ not just the top 10 decaying states.
 
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-from statsmodels.tsa.arima.model import ARIMA
 from dateutil.relativedelta import relativedelta
 import warnings
 import os
+import sys
 
 warnings.filterwarnings('ignore')
 
@@ -19,7 +18,16 @@ SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
 DATA_DIR = os.path.join(PROJECT_ROOT, "data")
 
+if __package__:
+    from .image_utils import generate_image_derivatives
+    from .tracing import traced
+else:  # Run as a script: python src/generate_all_forecasts.py
+    sys.path.insert(0, PROJECT_ROOT)
+    from src.image_utils import generate_image_derivatives
+    from src.tracing import traced
 
+
+@traced
 def load_data():
     """Load the feature engineered monthly data and priority classification."""
     df = pd.read_csv(os.path.join(DATA_DIR, "feature_engineered_monthly.csv"))
@@ -35,6 +43,7 @@ def load_data():
     return df, df_priority
 
 
+@traced
 def forecast_state_arima(state_name, data, periods=3):
     """
     Forecast update intensity using ARIMA model with improved robustness.
@@ -47,6 +56,9 @@ def forecast_state_arima(state_name, data, periods=3):
     Returns:
         Dictionary with historical data, forecast, and confidence intervals
     """
+    # Deferred: statsmodels takes ~2s to import and only forecasting needs it
+    from statsmodels.tsa.arima.model import ARIMA
+
     # Filter state data
     state_df = data[data['state'] == state_name].sort_values('year_month').copy()
     
@@ -166,6 +178,7 @@ def forecast_state_arima(state_name, data, periods=3):
         return None
 
 
+@traced
 def generate_all_forecasts(df, df_priority):
     """Generate forecasts for ALL states."""
     # Get all unique states
@@ -206,8 +219,11 @@ def save_forecasts_to_csv(forecasts, output_path):
     return df_forecast
 
 
+@traced
 def create_visualization(forecasts, output_path):
     """Create visualization for all state forecasts matching original notebook style."""
+    import matplotlib.pyplot as plt  # Deferred: only needed when rendering the PNG
+
     n_states = len(forecasts)
     
     # Calculate grid dimensions (5 rows x 2 columns layout like original, scaled up)
@@ -274,6 +290,9 @@ def create_visualization(forecasts, output_path):
     
     print(f"Visualization saved to {output_path}")
 
+    # Pre-generate web-sized derivatives so the dashboard never decodes the PNG
+    generate_image_derivatives(output_path)
+
 
 def main():
     """Main function to generate all forecasts."""
@@ -1,9 +1,53 @@
 """
 Image optimization utilities for memory-efficient display
+
+Static PNG artifacts are rendered at dpi=300 (up to ~6000px wide), while
+the dashboard shows them at most ~1400px wide. Instead of re-encoding
+them on every request, a small set of responsive derivatives (widths x
+formats) is written to disk once per source version, named by a hash of
+the source content. Pages then read the pre-sized bytes, kept in a
+bounded in-memory cache.
 """
-from PIL import Image
 import io
 import base64
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+from .config import (
+    IMAGE_DERIVATIVE_DIR,
+    IMAGE_DERIVATIVE_WIDTHS,
+    IMAGE_DERIVATIVE_FORMATS,
+    IMAGE_MEMORY_CACHE_BYTES,
+)
+
+# Pillow format and file extension per derivative format
+DERIVATIVE_FORMATS = {
+    "webp": ("WEBP", "webp"),
+    "jpeg": ("JPEG", "jpg"),
+}
+
+# (path, mtime_ns, size) -> source content hash
+_SOURCE_HASHES = {}
+# derivative path -> encoded bytes, most recently used last
+_DERIVATIVE_BYTES = OrderedDict()
+_DERIVATIVE_LOCK = threading.Lock()
+
+
+def _flatten_alpha(img):
+    """
+    Composite transparent images onto white (JPEG has no alpha channel).
+    """
+    from PIL import Image
+
+    if img.mode in ('RGBA', 'P', 'LA'):
+        if img.mode == 'P':
+            img = img.convert('RGBA')
+        background = Image.new('RGB', img.size, (255, 255, 255))
+        background.paste(img, mask=img.split()[-1])  # Use alpha channel as mask
+        return background
+    return img.convert('RGB') if img.mode != 'RGB' else img
 
 def optimize_image_for_web(image_path, max_width=1200, quality=75):
     """
@@ -17,6 +61,8 @@ def optimize_image_for_web(image_path, max_width=1200, quality=75):
     Returns:
         Base64 encoded image string or None if error
     """
+    from PIL import Image  # Deferred: cached derivatives are served without decoding
+
     try:
         # Open image
         img = Image.open(image_path)
@@ -29,14 +75,7 @@ def optimize_image_for_web(image_path, max_width=1200, quality=75):
             img = img.resize(new_size, Image.Resampling.LANCZOS)
         
         # Convert to RGB if needed (for JPEG)
-        if img.mode in ('RGBA', 'P', 'LA'):
-            # Create white background
-            background = Image.new('RGB', img.size, (255, 255, 255))
-            if img.mode == 'RGBA' or img.mode == 'LA':
-                background.paste(img, mask=img.split()[-1])  # Use alpha channel as mask
-            else:
-                background.paste(img)
-            img = background
+        img = _flatten_alpha(img)
         
         # Save to bytes with compression
         buffer = io.BytesIO()
@@ -69,3 +108,137 @@ def get_image_html(image_path, max_width=1200, quality=75):
         return f'<img src="{img_data}" style="width: 100%; border-radius: 8px; box-shadow: 0 2px 4px rgba(0,0,0,0.1);">'
     else:
         return f'<p style="color: #64748B;">Unable to load image: {image_path}</p>'
+
+
+def source_hash(image_path):
+    """
+    Short content hash of an image file, memoised on its size and mtime.
+    """
+    stat = os.stat(image_path)
+    key = (os.path.abspath(image_path), stat.st_mtime_ns, stat.st_size)
+    digest = _SOURCE_HASHES.get(key)
+    if digest is None:
+        hasher = hashlib.blake2b(digest_size=8)
+        with open(image_path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                hasher.update(block)
+        digest = hasher.hexdigest()
+        _SOURCE_HASHES[key] = digest
+    return digest
+
+
+def derivative_path(image_path, width, fmt="jpeg", derivative_dir=IMAGE_DERIVATIVE_DIR):
+    """
+    On-disk location of a derivative: {stem}.{source hash}.{width}w.{ext}
+    """
+    stem = os.path.splitext(os.path.basename(image_path))[0]
+    ext = DERIVATIVE_FORMATS[fmt][1]
+    return os.path.join(derivative_dir, f"{stem}.{source_hash(image_path)}.{width}w.{ext}")
+
+
+def generate_image_derivatives(image_path, widths=IMAGE_DERIVATIVE_WIDTHS,
+                               formats=IMAGE_DERIVATIVE_FORMATS, quality=75,
+                               derivative_dir=IMAGE_DERIVATIVE_DIR):
+    """
+    Write resized copies of an image for every width and format.
+
+    The source is decoded once; existing derivatives of the same source
+    version are kept, and derivatives of older versions are removed.
+    Widths larger than the source are stored at the source size.
+
+    Args:
+        image_path: Path to original image
+        widths: Target widths in pixels
+        formats: Derivative formats (keys of DERIVATIVE_FORMATS)
+        quality: Encoder quality 1-100 (default 75)
+        derivative_dir: Output directory
+
+    Returns:
+        List of derivative paths
+    """
+    from PIL import Image
+
+    os.makedirs(derivative_dir, exist_ok=True)
+    targets = [(width, fmt, derivative_path(image_path, width, fmt, derivative_dir))
+               for width in widths for fmt in formats]
+    missing = [target for target in targets if not os.path.exists(target[2])]
+
+    if missing:
+        with Image.open(image_path) as source:
+            source.load()  # Decode before the file closes; RGB sources pass through as-is
+            img = _flatten_alpha(source)
+        resized = {}
+        for width, fmt, path in missing:
+            if width not in resized:
+                if img.width > width:
+                    size = (width, max(1, round(img.height * width / img.width)))
+                    resized[width] = img.resize(size, Image.Resampling.LANCZOS)
+                else:
+                    resized[width] = img
+            tmp_path = f"{path}.tmp"
+            resized[width].save(tmp_path, format=DERIVATIVE_FORMATS[fmt][0], quality=quality, optimize=True)
+            os.replace(tmp_path, path)
+
+    # Remove derivatives of previous versions of this image
+    stem = os.path.splitext(os.path.basename(image_path))[0]
+    current = {os.path.basename(path) for _, _, path in targets}
+    prefix = f"{stem}."
+    for name in os.listdir(derivative_dir):
+        rest = name[len(prefix):] if name.startswith(prefix) else ""
+        # Only names of the form {stem}.{hash}.{width}w.{ext}
+        if rest.count(".") == 2 and rest.split(".")[1].endswith("w") and name not in current:
+            os.remove(os.path.join(derivative_dir, name))
+
+    return [path for _, _, path in targets]
+
+
+def get_image_derivative(image_path, width, fmt="jpeg", derivative_dir=IMAGE_DERIVATIVE_DIR):
+    """
+    Encoded bytes of the smallest configured derivative at least `width`
+    pixels wide (the largest one if none is), generated on first use.
+
+    Args:
+        image_path: Path to original image
+        width: Display width in pixels
+        fmt: Derivative format (default "jpeg")
+        derivative_dir: Derivative directory
+
+    Returns:
+        Image bytes or None if error
+    """
+    try:
+        widths = sorted(IMAGE_DERIVATIVE_WIDTHS)
+        chosen = next((w for w in widths if w >= width), widths[-1])
+        path = derivative_path(image_path, chosen, fmt, derivative_dir)
+
+        with _DERIVATIVE_LOCK:
+            if path in _DERIVATIVE_BYTES:
+                _DERIVATIVE_BYTES.move_to_end(path)
+                return _DERIVATIVE_BYTES[path]
+
+        if not os.path.exists(path):
+            formats = tuple(dict.fromkeys(IMAGE_DERIVATIVE_FORMATS + (fmt,)))
+            generate_image_derivatives(image_path, widths, formats, derivative_dir=derivative_dir)
+        with open(path, "rb") as f:
+            content = f.read()
+
+        with _DERIVATIVE_LOCK:
+            _DERIVATIVE_BYTES[path] = content
+            total = sum(len(v) for v in _DERIVATIVE_BYTES.values())
+            while total > IMAGE_MEMORY_CACHE_BYTES and len(_DERIVATIVE_BYTES) > 1:
+                total -= len(_DERIVATIVE_BYTES.popitem(last=False)[1])
+        return content
+
+    except Exception as e:
+        print(f"Error loading image derivative for {image_path}: {e}")
+        return None
+
+
+if __name__ == "__main__":
+    # Pre-generate derivatives for all image artifacts: python -m src.image_utils
+    from .config import DATA_FILES
+
+    for name, artifact in DATA_FILES.items():
+        if artifact.endswith(".png") and os.path.exists(artifact):
+            paths = generate_image_derivatives(artifact)
+            print(f"{name}: {len(paths)} derivatives")
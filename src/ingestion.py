@@ -1,25 +1,93 @@
+import hashlib
+import logging
+import os
+
 import pandas as pd
+from .config import DATA_FILES
 from .preprocessing import standardize_state_names
+from .tracing import traced
+from .validation import validate_frame
+
+logger = logging.getLogger(__name__)
+
+# Precomputed analysis tables shown alongside the monthly features
+ANALYTICS_TABLES = ("stat_summary", "regional", "forecasts", "benchmarking", "effect_size", "geographical")
 
 
-def load_monthly_features(path: str) -> pd.DataFrame:
+@traced
+def load_monthly_features(path: str, validate: bool = True) -> pd.DataFrame:
     """
     Load state-level monthly feature data.
     Enforces datetime parsing, drops invalid rows, and standardizes state names.
+    With validate, logs the violation report (see validation.py) as a warning if any.
     """
     df = pd.read_csv(path)
     df["year_month"] = pd.to_datetime(df["year_month"])
-    df = df[df["year_month"].notna()]
     df = standardize_state_names(df)
+    if validate:
+        _report(validate_frame(df, "monthly_features"))
+    df = df[df["year_month"].notna()]
     return df
 
 
-def load_priority_table(path: str) -> pd.DataFrame:
+@traced
+def load_priority_table(path: str, validate: bool = True) -> pd.DataFrame:
     """
     Load final state priority classification table.
     Applies state name standardization.
     """
     df = pd.read_csv(path)
     df = standardize_state_names(df)
+    if validate:
+        _report(validate_frame(df, "priority_table"))
     return df
 
+
+def _report(report):
+    # Violations are reported, not raised: the dashboard still shows the data
+    if not report.ok:
+        logger.warning("%s", report)
+
+
+@traced
+def load_analytics_table(path: str, on_error=None) -> pd.DataFrame:
+    """
+    Load one analytical CSV. A missing or unreadable file yields an empty
+    DataFrame; `on_error` is called with the path of an unreadable file.
+    """
+    try:
+        if os.path.exists(path):
+            return pd.read_csv(path)
+    except PermissionError:
+        if on_error is not None:
+            on_error(path)
+    return pd.DataFrame()
+
+
+def load_analytics(files: dict = DATA_FILES, on_error=None) -> dict:
+    """
+    Load the analytical CSVs listed in ANALYTICS_TABLES.
+    """
+    return {name: load_analytics_table(files[name], on_error) for name in ANALYTICS_TABLES}
+
+
+def data_version(paths) -> str:
+    """
+    Short fingerprint of the given files (path, size and modification time).
+    Changes whenever any file is rewritten, so it can key derived caches.
+    Missing files contribute only their path.
+    """
+    digest = hashlib.blake2b(digest_size=8)
+    for path in sorted(paths):
+        digest.update(path.encode())
+        if os.path.exists(path):
+            stat = os.stat(path)
+            digest.update(f"{stat.st_size}:{stat.st_mtime_ns}".encode())
+    return digest.hexdigest()
+
+
+def file_fingerprints(files: dict = DATA_FILES) -> dict:
+    """
+    data_version of each file separately, keyed like `files`.
+    """
+    return {name: data_version([path]) for name, path in files.items()}
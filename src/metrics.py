@@ -1,5 +1,9 @@
 import math
 
+import numpy as np
+
+from .config import DEFAULT_RISK_WEIGHTS, DECAY_THRESHOLD, STAGNANT_THRESHOLD
+
 
 def compute_rolling_average(series, window: int = 3):
     """
@@ -57,3 +61,88 @@ def classify_state(
         return "DECAYING"
 
     return "HEALTHY"
+
+
+def classify_states(avg_update_intensity, recent_update_intensity, decay_signal) -> np.ndarray:
+    """
+    classify_state over aligned arrays (one entry per state).
+    """
+    avg = np.asarray(avg_update_intensity, dtype=float)
+    recent = np.asarray(recent_update_intensity, dtype=float)
+    decay = np.nan_to_num(np.asarray(decay_signal, dtype=float))
+    status = np.full(len(avg), "HEALTHY", dtype=object)
+    status[(decay < DECAY_THRESHOLD) & (recent < avg)] = "DECAYING"
+    status[np.isnan(avg) | np.isnan(recent) | (np.abs(avg) < STAGNANT_THRESHOLD)] = "STAGNANT"
+    return status
+
+
+def compute_risk_components(df, recent_months: int = 3) -> dict:
+    """
+    Precompute the per-state inputs of the notebook 05 risk score.
+
+    Args:
+        df: Monthly feature data (state, year_month, update_intensity,
+            update_decay_signal, update_consistency)
+        recent_months: Number of latest months averaged for recent intensity
+
+    Returns:
+        Dictionary of aligned arrays: states, decay (-avg decay signal),
+        volatility (avg update consistency) and recency (1 / (recent + 1))
+    """
+    df = df.sort_values(["state", "year_month"])
+    grouped = df.groupby("state", sort=True)
+    recent = df.groupby("state", sort=True).tail(recent_months).groupby("state")["update_intensity"].mean()
+    return {
+        "states": grouped.size().index.to_numpy(),
+        "decay": -grouped["update_decay_signal"].mean().to_numpy(dtype=float),
+        "volatility": grouped["update_consistency"].mean().to_numpy(dtype=float),
+        "recency": 1.0 / (recent.to_numpy(dtype=float) + 1.0),
+    }
+
+
+def compute_risk_scores(components: dict, weights: dict = None) -> np.ndarray:
+    """
+    Weighted risk score for every state; missing components count as zero.
+    """
+    weights = {**DEFAULT_RISK_WEIGHTS, **(weights or {})}
+    scores = np.zeros(len(components["states"]))
+    for name, weight in weights.items():
+        if weight:
+            scores += weight * np.nan_to_num(components[name])
+    return scores
+
+
+def rank_by_risk(components: dict, weights: dict = None, k: int = None, mask=None):
+    """
+    Top-k states by weighted risk score using a partial sort.
+
+    Args:
+        components: Output of compute_risk_components
+        weights: Per-component weights (defaults to DEFAULT_RISK_WEIGHTS)
+        k: Number of states to return (all if None)
+        mask: Optional boolean array restricting the candidate states
+
+    Returns:
+        Tuple of (states, scores, ranks) arrays for the top-k, highest risk
+        first. Ranks are positions among all states, not just the masked ones.
+    """
+    scores = compute_risk_scores(components, weights)
+    candidates = np.arange(len(scores)) if mask is None else np.flatnonzero(mask)
+    k = len(candidates) if k is None else min(k, len(candidates))
+    if k == 0:
+        return components["states"][:0], scores[:0], np.zeros(0, dtype=int)
+
+    candidate_scores = scores[candidates]
+    if k < len(candidates):
+        top = np.argpartition(-candidate_scores, k - 1)[:k]
+    else:
+        top = np.arange(len(candidates))
+    top = top[np.argsort(-candidate_scores[top], kind="stable")]
+    selected = candidates[top]
+
+    # Rank = 1 + number of states with a strictly higher score; only scores
+    # above the lowest selected one can matter, so only those are sorted
+    selected_scores = scores[selected]
+    higher = np.sort(scores[scores > selected_scores.min()])
+    ranks = len(higher) - np.searchsorted(higher, selected_scores, side="right") + 1
+    return components["states"][selected], scores[selected], ranks
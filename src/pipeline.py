@@ -0,0 +1,363 @@
+"""
+Content-hash cached pipeline that rebuilds the dashboard's data files.
+
+Replaces running notebooks 01-08 by hand. Each stage in STAGES declares
+the files it reads and writes, and the dependency graph follows from
+which stage writes which input. A stage is skipped when the content
+hashes of its inputs and of its code (the stages module and the src
+modules it imports) match its last successful run
+(recorded in PIPELINE_STATE_DIR/manifest.json) and its outputs are
+unchanged. Stages whose dependencies are done run in parallel worker
+processes, so statistics, geospatial and forecasting overlap.
+
+The raw extracts (RAW_DATA_DIR/{enrolment,demographic,biometric}) are
+not bundled with the repository. When a stage's inputs are missing but
+its outputs exist, the outputs are kept as they are and downstream
+stages run from them.
+
+Usage (from the repository root):
+    python -m src.pipeline                      # rebuild what changed
+    python -m src.pipeline --dry-run            # show what would run
+    python -m src.pipeline --force              # rebuild everything
+    python -m src.pipeline --only forecasting   # just these stages
+"""
+import argparse
+import ast
+import functools
+import hashlib
+import importlib
+import inspect
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from . import stages
+from .config import DATA_DIR, DATA_FILES, RAW_DATA_DIR, PIPELINE_STATE_DIR, PIPELINE_JOBS
+
+MANIFEST_PATH = os.path.join(PIPELINE_STATE_DIR, "manifest.json")
+
+
+def _state(name):
+    return os.path.join(PIPELINE_STATE_DIR, name)
+
+
+def _data(name):
+    return os.path.join(DATA_DIR, name)
+
+
+_MONTHLY = {f"{source}_monthly": _data(f"{source}_clean_monthly.csv") for source in stages.RAW_SOURCES}
+
+# Stage -> function, inputs and outputs (name -> path), in notebook order
+STAGES = {
+    "ingestion": {
+        "func": stages.ingest,
+        "inputs": {source: os.path.join(RAW_DATA_DIR, source) for source in stages.RAW_SOURCES},
+        "outputs": {source: _state(f"raw_{source}.pkl") for source in stages.RAW_SOURCES},
+    },
+    "cleaning": {
+        "func": stages.clean,
+        "inputs": {source: _state(f"raw_{source}.pkl") for source in stages.RAW_SOURCES},
+        "outputs": _MONTHLY,
+    },
+    "features": {
+        "func": stages.engineer_features,
+        "inputs": _MONTHLY,
+        "outputs": {"features": DATA_FILES["monthly_features"]},
+    },
+    "classification": {
+        "func": stages.classify,
+        "inputs": {"features": DATA_FILES["monthly_features"]},
+        "outputs": {"priority": DATA_FILES["priority_table"]},
+    },
+    "statistics": {
+        "func": stages.compute_statistics,
+        "inputs": {"features": DATA_FILES["monthly_features"]},
+        "outputs": {
+            "correlation_heatmap": DATA_FILES["correlation_heatmap_png"],
+            "benchmarking": DATA_FILES["benchmarking"],
+            "confidence_intervals": DATA_FILES["confidence_intervals_png"],
+            "effect_size": DATA_FILES["effect_size"],
+            "summary": DATA_FILES["stat_summary"],
+        },
+    },
+    "geospatial": {
+        "func": stages.analyse_geography,
+        "inputs": {"features": DATA_FILES["monthly_features"], "priority": DATA_FILES["priority_table"]},
+        "outputs": {
+            "state_chart": DATA_FILES["state_visualization_png"],
+            "interactive_map": DATA_FILES["india_map"],
+            "geographical": DATA_FILES["geographical"],
+            "regional": DATA_FILES["regional"],
+        },
+    },
+    "forecasting": {
+        "func": stages.forecast,
+        "inputs": {"features": DATA_FILES["monthly_features"], "priority": DATA_FILES["priority_table"]},
+        "outputs": {
+            "forecasts": DATA_FILES["forecasts"],
+            "chart": DATA_FILES["forecasts_png"],
+            "scenarios": _data("forecast_scenarios.csv"),
+        },
+    },
+}
+
+
+def dependencies(stage_table=STAGES) -> dict:
+    """
+    Upstream stages of each stage: those writing one of its inputs.
+    """
+    writers = {path: name for name, stage in stage_table.items() for path in stage["outputs"].values()}
+    return {
+        name: sorted({writers[path] for path in stage["inputs"].values() if path in writers} - {name})
+        for name, stage in stage_table.items()
+    }
+
+
+# ==============================
+# Content hashing
+# ==============================
+class _Hasher:
+    """
+    File digests, reusing the manifest's digest while a file's size and
+    mtime are unchanged so unchanged inputs are not re-read.
+    """
+
+    def __init__(self, known):
+        self.known = known  # path -> [size, mtime_ns, digest]
+
+    def file(self, path):
+        stat = os.stat(path)
+        entry = self.known.get(path)
+        if entry and entry[0] == stat.st_size and entry[1] == stat.st_mtime_ns:
+            return entry[2]
+        digest = hashlib.blake2b(digest_size=16)
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        self.known[path] = [stat.st_size, stat.st_mtime_ns, digest.hexdigest()]
+        return digest.hexdigest()
+
+    def path(self, path):
+        """Digest of a file, or of a folder's CSV files; None if missing."""
+        if os.path.isdir(path):
+            files = sorted(f for f in os.listdir(path) if f.endswith(".csv"))
+            if not files:
+                return None
+            digest = hashlib.blake2b(digest_size=16)
+            for name in files:
+                digest.update(f"{name}:{self.file(os.path.join(path, name))}\n".encode())
+            return digest.hexdigest()
+        if not os.path.isfile(path):
+            return None
+        return self.file(path)
+
+
+@functools.lru_cache(maxsize=None)
+def code_digest(func) -> str:
+    """
+    Digest of the source of the module defining a stage and of the src
+    modules it imports from (deferred imports included), so editing a
+    stage, a shared helper or a constant such as REGION_MAPPING reruns it.
+    """
+    module = inspect.getmodule(inspect.unwrap(func))
+    source = inspect.getsource(module)
+    names = {module.__name__}
+    for node in ast.walk(ast.parse(source)):
+        if isinstance(node, ast.ImportFrom) and node.level == 1:
+            if node.module:
+                names.add(f"{module.__package__}.{node.module}")
+            else:
+                names.update(f"{module.__package__}.{alias.name}" for alias in node.names)
+    digest = hashlib.blake2b(digest_size=16)
+    for name in sorted(names):
+        digest.update(f"{name}\n".encode())
+        digest.update(inspect.getsource(importlib.import_module(name)).encode())
+    return digest.hexdigest()
+
+
+def stage_key(name, input_digests) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(code_digest(STAGES[name]["func"]).encode())
+    for key in sorted(input_digests):
+        digest.update(f"{key}:{input_digests[key]}\n".encode())
+    return digest.hexdigest()
+
+
+def load_manifest(path: str = MANIFEST_PATH) -> dict:
+    try:
+        with open(path) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        manifest = {}
+    manifest.setdefault("files", {})
+    manifest.setdefault("stages", {})
+    return manifest
+
+
+def save_manifest(manifest: dict, path: str = MANIFEST_PATH):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+# ==============================
+# Scheduling
+# ==============================
+def plan_stage(name, manifest, hasher, force=False):
+    """
+    Decide whether a stage needs to run.
+
+    Returns:
+        (action, key): action is "run", "fresh" (up to date), "kept"
+        (inputs missing, existing outputs kept) or "missing" (inputs and
+        outputs missing); key is the stage's cache key, or None when its
+        inputs are missing
+    """
+    stage = STAGES[name]
+    inputs = {key: hasher.path(path) for key, path in stage["inputs"].items()}
+    outputs = {key: hasher.path(path) for key, path in stage["outputs"].items()}
+    if None in inputs.values():
+        if None in outputs.values():
+            missing = [stage["inputs"][key] for key, digest in inputs.items() if digest is None]
+            print(f"  {name}: missing {', '.join(missing)}", file=sys.stderr)
+            return "missing", None
+        return "kept", None
+    key = stage_key(name, inputs)
+    previous = manifest["stages"].get(name, {})
+    if not force and previous.get("key") == key and previous.get("outputs") == outputs:
+        return "fresh", key
+    return "run", key
+
+
+def _run_stage(name):
+    """Run one stage (in a worker process); returns its CPU seconds."""
+    import matplotlib
+    matplotlib.use("Agg")  # Worker processes have no display
+
+    stage = STAGES[name]
+    for path in stage["outputs"].values():
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    cpu = time.process_time()
+    stage["func"](dict(stage["inputs"]), dict(stage["outputs"]))
+    return time.process_time() - cpu
+
+
+def run_pipeline(only=None, force=False, dry_run=False, n_jobs=PIPELINE_JOBS) -> list:
+    """
+    Run the stages whose inputs changed, in dependency order.
+
+    Args:
+        only: Stage names to consider (None for all); other stages are
+            treated as done and their outputs used as they are
+        force: Run every considered stage regardless of hashes
+        dry_run: Only report what would run
+        n_jobs: Worker processes (1 runs stages in this process)
+
+    Returns:
+        One dict per considered stage: stage, status, seconds, cpu_seconds
+    """
+    selected = list(STAGES) if only is None else [name for name in STAGES if name in only]
+    upstream = dependencies()
+    manifest = load_manifest()
+    hasher = _Hasher(manifest["files"])
+
+    results = {}
+    pending = list(selected)
+    running = {}  # future -> (name, key, start)
+    changed = set()  # Stages that ran (or would run, in a dry run)
+    pool = ProcessPoolExecutor(max_workers=n_jobs) if n_jobs > 1 and not dry_run else None
+
+    def finish(name, key, status, seconds=0.0, cpu=None):
+        results[name] = {"stage": name, "status": status, "seconds": seconds, "cpu_seconds": cpu}
+        if status == "ran":
+            stage = STAGES[name]
+            manifest["stages"][name] = {
+                "key": key,
+                "outputs": {out: hasher.path(path) for out, path in stage["outputs"].items()},
+                "finished": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            }
+            save_manifest(manifest)
+
+    try:
+        while pending or running:
+            for name in list(pending):
+                deps = [dep for dep in upstream[name] if dep in selected]
+                if any(results.get(dep, {}).get("status") in ("failed", "blocked") for dep in deps):
+                    pending.remove(name)
+                    finish(name, None, "blocked")
+                    continue
+                if not all(dep in results for dep in deps):
+                    continue
+                pending.remove(name)
+                if dry_run and changed & set(deps):
+                    action, key = "run", None  # Inputs are about to change
+                else:
+                    action, key = plan_stage(name, manifest, hasher, force)
+                if action != "run":
+                    finish(name, key, action)
+                elif dry_run:
+                    changed.add(name)
+                    finish(name, key, "would run")
+                elif pool is None:
+                    start = time.perf_counter()
+                    try:
+                        cpu = _run_stage(name)
+                    except Exception as e:
+                        print(f"  {name} failed: {type(e).__name__}: {e}", file=sys.stderr)
+                        finish(name, key, "failed", time.perf_counter() - start)
+                        continue
+                    finish(name, key, "ran", time.perf_counter() - start, cpu)
+                else:
+                    running[pool.submit(_run_stage, name)] = (name, key, time.perf_counter())
+
+            if running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name, key, start = running.pop(future)
+                    seconds = time.perf_counter() - start
+                    try:
+                        cpu = future.result()
+                    except Exception as e:
+                        print(f"  {name} failed: {type(e).__name__}: {e}", file=sys.stderr)
+                        finish(name, key, "failed", seconds)
+                        continue
+                    finish(name, key, "ran", seconds, cpu)
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+        if not dry_run:
+            save_manifest(manifest)  # Keep file digests computed this run
+
+    return [results[name] for name in selected]
+
+
+def print_summary(results, elapsed):
+    print(f"{'stage':<16}{'status':<12}{'wall s':>9}{'cpu s':>9}")
+    for row in results:
+        cpu = "" if row["cpu_seconds"] is None else f"{row['cpu_seconds']:.2f}"
+        print(f"{row['stage']:<16}{row['status']:<12}{row['seconds']:>9.2f}{cpu:>9}")
+    busy = sum(row["seconds"] for row in results)
+    print(f"{'total':<28}{elapsed:>9.2f}  (stage time {busy:.2f}s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild the dashboard data files from changed inputs")
+    parser.add_argument("--only", nargs="+", choices=list(STAGES), help="Run only these stages")
+    parser.add_argument("--force", action="store_true", help="Ignore cached hashes and rerun")
+    parser.add_argument("--dry-run", action="store_true", help="Report what would run without running it")
+    parser.add_argument("--jobs", type=int, default=PIPELINE_JOBS, help="Worker processes")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    results = run_pipeline(only=args.only, force=args.force, dry_run=args.dry_run, n_jobs=args.jobs)
+    print_summary(results, time.perf_counter() - start)
+    if any(row["status"] in ("failed", "blocked") for row in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,11 @@
+import threading
+
+import numpy as np
 import pandas as pd
 
+from .state_names import INVALID, StateNameResolver
+from .tracing import traced
+
 # Standard state name mapping for data consistency
 STATE_NAME_MAPPING = {
     # Andaman and Nicobar
@@ -52,10 +58,29 @@ INVALID_STATE_ENTRIES = [
 ]
 
 
+_RESOLVER = None
+_RESOLVER_LOCK = threading.Lock()
+
+
+def state_name_resolver() -> StateNameResolver:
+    """
+    Shared resolver over STATE_NAME_MAPPING and INVALID_STATE_ENTRIES,
+    created (and its lookup file read) on first use.
+    """
+    global _RESOLVER
+    with _RESOLVER_LOCK:
+        if _RESOLVER is None:
+            _RESOLVER = StateNameResolver(aliases=STATE_NAME_MAPPING, invalid=INVALID_STATE_ENTRIES)
+        return _RESOLVER
+
+
+@traced
 def standardize_state_names(df: pd.DataFrame, state_column: str = 'state') -> pd.DataFrame:
     """
     Standardize state names to remove duplicates and typos.
-    Applies the STATE_NAME_MAPPING and removes invalid entries.
+    Applies the STATE_NAME_MAPPING, resolves unseen misspellings by edit
+    distance (see state_names.py) and removes invalid entries. Each
+    distinct name is resolved once, however many rows carry it.
     
     Args:
         df: DataFrame with a state column
@@ -65,10 +90,12 @@ def standardize_state_names(df: pd.DataFrame, state_column: str = 'state') -> pd
         DataFrame with standardized state names
     """
     df = df.copy()
-    df[state_column] = df[state_column].str.upper().str.strip()
-    df[state_column] = df[state_column].replace(STATE_NAME_MAPPING)
-    df = df[~df[state_column].isin(INVALID_STATE_ENTRIES)]
-    return df
+    codes, names = pd.factorize(df[state_column])
+    resolved = state_name_resolver().resolve_many(names)
+    valid = np.array([name is not INVALID for name in resolved] + [True])  # Last: missing names
+    lookup = np.array(resolved + [np.nan], dtype=object)
+    df[state_column] = pd.Series(lookup[codes], index=df.index).astype(df[state_column].dtype)
+    return df[valid[codes]]
 
 
 def filter_states_with_history(df, min_months: int = 4):
@@ -90,3 +117,14 @@ def get_state_timeseries(df, state: str):
         .sort_values("year_month")
     )
 
+
+
+def index_state_timeseries(df) -> dict:
+    """
+    Split the frame once into per-state time series sorted by month,
+    so pages can look up a state instead of filtering the full frame.
+    """
+    return {
+        state: group.reset_index(drop=True)
+        for state, group in df.sort_values(["state", "year_month"]).groupby("state", sort=False)
+    }
@@ -0,0 +1,396 @@
+"""
+Read-only data shared by all dashboard sessions.
+
+The loaded frames and everything derived from them are held once per
+process (st.cache_resource in app.py) instead of being unpickled into a
+fresh copy for every session and rerun. To make sharing
+safe, numeric columns are backed by read-only NumPy arrays (text columns
+are already immutable Arrow arrays), shared frames reject column
+assignment and in-place methods, and nested containers are exposed as
+read-only mappings. Filtering, selecting or copying a shared frame gives
+an ordinary DataFrame, so view code can keep working on derived frames.
+"""
+import hashlib
+import logging
+import threading
+from types import MappingProxyType
+
+import numpy as np
+import pandas as pd
+
+from .config import DATA_FILES, SIMILARITY_METRICS
+from .ingestion import (
+    ANALYTICS_TABLES,
+    load_monthly_features,
+    load_priority_table,
+    load_analytics_table,
+    file_fingerprints,
+)
+from .tracing import span, count_rows
+
+logger = logging.getLogger(__name__)
+
+
+_READ_ONLY_MESSAGE = "Shared data is read-only; work on a .copy() instead"
+
+# DataFrame methods that accept inplace=True (the in-place form is refused
+# before pandas changes anything)
+_INPLACE_METHODS = (
+    "rename", "rename_axis", "reset_index", "set_index", "drop", "drop_duplicates",
+    "dropna", "fillna", "ffill", "bfill", "replace", "interpolate", "sort_values",
+    "sort_index", "where", "mask", "clip", "query", "eval",
+)
+
+
+class _ReadOnlyIndexer:
+    """
+    loc / iloc / at / iat of a shared frame: lookups pass through, item
+    assignment raises TypeError.
+    """
+
+    def __init__(self, indexer):
+        self._indexer = indexer
+
+    def __getitem__(self, key):
+        return self._indexer[key]
+
+    def __setitem__(self, key, value):
+        raise TypeError(_READ_ONLY_MESSAGE)
+
+    def __call__(self, *args, **kwargs):
+        return _ReadOnlyIndexer(self._indexer(*args, **kwargs))
+
+    def __getattr__(self, name):
+        return getattr(self._indexer, name)
+
+
+def _refuse_inplace(name):
+    method = getattr(pd.DataFrame, name)
+
+    def wrapper(self, *args, **kwargs):
+        if kwargs.get("inplace"):
+            raise TypeError(_READ_ONLY_MESSAGE)
+        return method(self, *args, **kwargs)
+
+    wrapper.__name__ = name
+    wrapper.__doc__ = method.__doc__
+    return wrapper
+
+
+class ReadOnlyFrame(pd.DataFrame):
+    """
+    DataFrame over read-only column arrays. Value writes to numeric
+    columns fail in NumPy; every write path of the frame itself (column
+    and item assignment through [], loc, iloc, at and iat, attribute and
+    axis assignment, deletion, update and inplace=True methods) raises
+    TypeError before anything is changed. Derived frames (filters,
+    selections, copies) are plain DataFrames.
+    """
+
+    @property
+    def _constructor(self):
+        return pd.DataFrame
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError(_READ_ONLY_MESSAGE)
+
+    __setitem__ = _read_only
+    __delitem__ = _read_only
+    insert = _read_only
+    pop = _read_only
+    update = _read_only
+    _update_inplace = _read_only
+    _set_item = _read_only
+    _set_value = _read_only
+
+    def __setattr__(self, name, value):
+        # Internal state is set through here by pandas; public names are
+        # columns, axes (index, columns) or metadata
+        if not name.startswith("_"):
+            raise TypeError(_READ_ONLY_MESSAGE)
+        super().__setattr__(name, value)
+
+    @property
+    def loc(self):
+        return _ReadOnlyIndexer(super().loc)
+
+    @property
+    def iloc(self):
+        return _ReadOnlyIndexer(super().iloc)
+
+    @property
+    def at(self):
+        return _ReadOnlyIndexer(super().at)
+
+    @property
+    def iat(self):
+        return _ReadOnlyIndexer(super().iat)
+
+
+for _name in _INPLACE_METHODS:
+    setattr(ReadOnlyFrame, _name, _refuse_inplace(_name))
+
+
+def freeze_frame(df: pd.DataFrame) -> ReadOnlyFrame:
+    """
+    Read-only view of a frame, without copying its column data.
+    """
+    columns = {}
+    for name in df.columns:
+        array = df[name].array
+        if isinstance(df[name].dtype, np.dtype):
+            array = df[name].to_numpy().view()
+            array.flags.writeable = False
+        columns[name] = array
+    frozen = ReadOnlyFrame(columns, index=df.index, copy=False)
+    pd.DataFrame.__setattr__(frozen, "attrs", dict(df.attrs))
+    return frozen
+
+
+def freeze(obj):
+    """
+    Recursively freeze frames, arrays and containers for sharing.
+    """
+    if isinstance(obj, ReadOnlyFrame):
+        return obj
+    if isinstance(obj, pd.DataFrame):
+        return freeze_frame(obj)
+    if isinstance(obj, np.ndarray):
+        view = obj.view()
+        view.flags.writeable = False
+        return view
+    if isinstance(obj, dict):
+        return MappingProxyType({key: freeze(value) for key, value in obj.items()})
+    if isinstance(obj, list):
+        return tuple(freeze(value) for value in obj)
+    return obj
+
+
+class LazyBundle(dict):
+    """
+    Immutable snapshot of the dashboard data for one set of file versions.
+
+    Entries are computed on first access by `loaders[key](bundle)` and
+    frozen; each loader runs once even when several sessions ask for the
+    same entry concurrently. `dependencies[key]` names the DATA_FILES
+    entries a key is derived from, so a snapshot for new file versions can
+    keep every entry whose files did not change (see derive).
+    """
+
+    def __init__(self, loaders, dependencies, fingerprints, values=None):
+        super().__init__(values or {})
+        self._loaders = loaders
+        self._dependencies = dependencies
+        self._lock = threading.RLock()  # Loaders read other entries
+        self._versions = {}
+        self.fingerprints = MappingProxyType(dict(fingerprints))
+        self.version = self.version_of(*sorted(self.fingerprints))
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("Shared data is read-only")
+
+    __setitem__ = _read_only
+    __delitem__ = _read_only
+
+    def __missing__(self, key):
+        if key not in self._loaders:
+            raise KeyError(key)
+        with self._lock:
+            if not dict.__contains__(self, key):
+                with span(f"shared.load[{key}]") as current:
+                    value = self._loaders[key](self)
+                    current.rows = count_rows(value)
+                    dict.__setitem__(self, key, freeze(value))
+        return dict.__getitem__(self, key)
+
+    def version_of(self, *names) -> str:
+        """
+        Fingerprint of the given data files only; keys caches that depend
+        on just those files.
+        """
+        version = self._versions.get(names)
+        if version is None:
+            digest = hashlib.blake2b(digest_size=8)
+            for name in names:
+                digest.update(f"{name}={self.fingerprints.get(name)};".encode())
+            version = self._versions[names] = digest.hexdigest()
+        return version
+
+    def derive(self, fingerprints):
+        """
+        Snapshot for new file fingerprints that reuses every loaded entry
+        whose dependencies are unchanged.
+
+        Returns:
+            Tuple of (new bundle, set of changed file names)
+        """
+        changed = {
+            name for name in set(fingerprints) | set(self.fingerprints)
+            if fingerprints.get(name) != self.fingerprints.get(name)
+        }
+        kept = {
+            key: dict.__getitem__(self, key) for key in list(self)
+            if changed.isdisjoint(self._dependencies.get(key, ()))
+        }
+        return LazyBundle(self._loaders, self._dependencies, fingerprints, kept), changed
+
+    def warm(self, keys):
+        """
+        Compute the given entries now (e.g. before the snapshot is published).
+        """
+        for key in keys:
+            self[key]
+
+
+def _by_state(df: pd.DataFrame) -> dict:
+    return {state: group.reset_index(drop=True) for state, group in df.groupby("state")}
+
+
+def _loaders(files: dict, on_error=None):
+    """
+    Loader and data-file dependencies of every bundle entry.
+    """
+    loaders = {
+        "monthly": lambda data: load_monthly_features(files["monthly_features"]),
+        "priority": lambda data: load_priority_table(files["priority_table"]),
+        # Assembled from the per-table entries, so one changed CSV rereads one file
+        "analytics": lambda data: {name: data[f"analytics.{name}"] for name in ANALYTICS_TABLES},
+    }
+    dependencies = {
+        "monthly": ("monthly_features",),
+        "priority": ("priority_table",),
+        "analytics": ANALYTICS_TABLES,
+    }
+    for name in ANALYTICS_TABLES:
+        loaders[f"analytics.{name}"] = lambda data, name=name: load_analytics_table(files[name], on_error)
+        dependencies[f"analytics.{name}"] = (name,)
+
+    def state_index(data):
+        from .preprocessing import index_state_timeseries
+        return index_state_timeseries(data["monthly"])
+
+    def anomalies(data):
+        # Scored once for the whole panel; pages only look up their state
+        from .anomaly import detect_anomalies
+        scores, _ = detect_anomalies(data["monthly"])
+        return _by_state(scores)
+
+    def changepoints(data):
+        from .changepoint import detect_changepoints
+        return _by_state(detect_changepoints(data["monthly"]))
+
+    def correlation_stats(data):
+        # Per state-month sufficient statistics; filtered matrices sum cells only
+        from .correlation import compute_sufficient_stats
+        return compute_sufficient_stats(data["monthly"])
+
+    def risk_components(data):
+        from .metrics import compute_risk_components
+        return compute_risk_components(data["monthly"])
+
+    def prefix_sums(data):
+        # Per-state running totals over months; any date window is a difference
+        from .windows import compute_prefix_sums
+        return compute_prefix_sums(data["monthly"])
+
+    for loader in (state_index, anomalies, changepoints, correlation_stats, risk_components, prefix_sums):
+        loaders[loader.__name__] = loader
+        dependencies[loader.__name__] = ("monthly_features",)
+
+    def similarity(data, metric):
+        # Top-k similar trajectories; a rebuild only searches the series that changed
+        from .similarity import similarity_index
+        return similarity_index(data["monthly"], metric)
+
+    for metric in SIMILARITY_METRICS:
+        loaders[f"similarity.{metric}"] = lambda data, metric=metric: similarity(data, metric)
+        dependencies[f"similarity.{metric}"] = ("monthly_features",)
+    return loaders, dependencies
+
+
+# Entries loaded when a snapshot is created; the rest load on first use
+EAGER_ENTRIES = ("monthly", "priority", "analytics")
+
+
+def load_shared_data(files: dict = DATA_FILES, on_error=None) -> LazyBundle:
+    """
+    Load the dashboard data into a read-only snapshot. Derived data (state
+    index, anomalies, change points, correlation statistics, risk
+    components, prefix sums and similarity indexes) is computed on first
+    access.
+
+    Args:
+        files: Data file paths (defaults to DATA_FILES)
+        on_error: Called with the path of an analytics file that could not be read
+
+    Returns:
+        LazyBundle with monthly, priority and analytics loaded
+    """
+    loaders, dependencies = _loaders(files, on_error)
+    data = LazyBundle(loaders, dependencies, file_fingerprints(files))
+    data.warm(EAGER_ENTRIES)
+    return data
+
+
+class DataStore:
+    """
+    Holds the current data snapshot and replaces it when data files change.
+
+    A refresh builds the next snapshot off to the side, reloading only the
+    entries derived from changed files (and recomputing those that were in
+    use), then publishes it with a single reference swap. A session keeps
+    the snapshot it started its run with, so it never mixes versions.
+    """
+
+    def __init__(self, files: dict = DATA_FILES):
+        self.files = files
+        self.unreadable = set()  # Paths of analytics files that could not be read
+        self._snapshot = load_shared_data(files, self.unreadable.add)
+        self._refresh_lock = threading.Lock()
+        self._listeners = []
+        self._watcher = None
+
+    def current(self) -> LazyBundle:
+        return self._snapshot
+
+    def refresh(self) -> set:
+        """
+        Publish a new snapshot if any data file changed.
+
+        Returns:
+            Set of changed DATA_FILES names (empty if nothing changed)
+        """
+        with self._refresh_lock, span("shared.refresh"):
+            old = self._snapshot
+            new, changed = old.derive(file_fingerprints(self.files))
+            if not changed:
+                return changed
+            self.unreadable.difference_update(self.files[name] for name in changed if name in self.files)
+            try:
+                new.warm(set(EAGER_ENTRIES) | set(old))
+            except Exception as e:
+                # e.g. a CSV caught mid-write; the next change event retries
+                logger.warning("Data reload failed, keeping version %s: %s", old.version, e)
+                return set()
+            self._snapshot = new
+        for listener in self._listeners:
+            listener(new, changed)
+        return changed
+
+    def watch(self, on_swap=None):
+        """
+        Start watching the data files; `on_swap(snapshot, changed)` is
+        called after each published snapshot.
+        """
+        from .watcher import DataWatcher
+
+        if on_swap is not None:
+            self._listeners.append(on_swap)
+        if self._watcher is None:
+            self._watcher = DataWatcher(self.files.values(), lambda paths: self.refresh()).start()
+        return self._watcher
+
+    def close(self):
+        if self._watcher is not None:
+            self._watcher.stop()
+            self._watcher = None
@@ -0,0 +1,357 @@
+"""
+Trajectory similarity: which states' update intensity behaves like this one.
+
+Every series is z-normalised over the months it has, so only its shape
+counts, not its level or scale; months without data are set to the
+series mean (0 after normalisation). Two series are compared over the
+months they share, either by correlation (of the z-scores) or by DTW
+distance with the warping path kept within a Sakoe-Chiba band. Both are
+computed for whole blocks of pairs at once.
+
+A SimilarityIndex holds the top-k neighbours of every series, so the
+states similar to one state are a dictionary lookup and a row slice.
+Beyond SIMILARITY_EXACT_MAX_SERIES series (e.g. district-level series)
+the index is approximate: series are reduced to SIMILARITY_PAA_SEGMENTS
+piecewise means, a k-d tree over the reduced series proposes
+SIMILARITY_CANDIDATES neighbours per series, and only those are
+compared exactly.
+
+Indexes are updated incrementally. Each series is keyed by a hash of its
+values; when the data changes, only changed series are searched again.
+An unchanged series keeps its list, merged with its scores against the
+changed series, unless one of its neighbours changed or disappeared.
+
+Usage (from the repository root):
+    python -m src.similarity KERALA               # most similar states by correlation
+    python -m src.similarity KERALA --metric dtw
+"""
+import argparse
+import hashlib
+import threading
+
+import numpy as np
+import pandas as pd
+
+from .config import (
+    SIMILARITY_METRICS,
+    SIMILARITY_TOP_K,
+    SIMILARITY_DTW_BAND,
+    SIMILARITY_MIN_OVERLAP,
+    SIMILARITY_EXACT_MAX_SERIES,
+    SIMILARITY_PAA_SEGMENTS,
+    SIMILARITY_CANDIDATES,
+    SIMILARITY_BLOCK_BYTES,
+)
+
+
+def series_matrix(df: pd.DataFrame, key: str = "state", value_column: str = "update_intensity"):
+    """
+    One row per key on the common month grid; duplicate months are
+    averaged and months without a finite value are NaN.
+
+    Returns:
+        Tuple of (keys, months, values array of shape keys x months)
+    """
+    df = df[df["year_month"].notna()]
+    grid = df.groupby([key, "year_month"], sort=True)[value_column].mean().unstack("year_month")
+    values = grid.to_numpy(dtype=float)
+    values = np.where(np.isfinite(values), values, np.nan)
+    return grid.index.to_numpy(dtype=object), grid.columns.to_numpy(), values
+
+
+def znormalize(values: np.ndarray):
+    """
+    Z-normalise each row over its observed months.
+
+    Returns:
+        Tuple of (z-scores with unobserved months at 0, observed mask).
+        Constant rows are all 0.
+    """
+    observed = np.isfinite(values)
+    n = np.maximum(observed.sum(axis=1, keepdims=True), 1)
+    mean = np.where(observed, values, 0.0).sum(axis=1, keepdims=True) / n
+    centred = np.where(observed, values - mean, 0.0)
+    std = np.sqrt((centred ** 2).sum(axis=1, keepdims=True) / n)
+    z = np.divide(centred, std, out=np.zeros_like(centred), where=std > 0)
+    return z, observed
+
+
+def dtw_distance(a: np.ndarray, b: np.ndarray, band: int = SIMILARITY_DTW_BAND) -> np.ndarray:
+    """
+    DTW distance between a[p] and b[p] for every row p (equal lengths),
+    with the warping path within `band` steps of the diagonal (None: no
+    band). All pairs advance through the cost matrix together.
+    """
+    a, b = np.atleast_2d(a), np.atleast_2d(b)
+    n_pairs, n = a.shape
+    width = n if band is None else max(int(band), 0)
+    previous = np.full((n_pairs, n + 1), np.inf)
+    previous[:, 0] = 0.0
+    for i in range(1, n + 1):
+        current = np.full((n_pairs, n + 1), np.inf)
+        for j in range(max(1, i - width), min(n, i + width) + 1):
+            step = np.minimum(np.minimum(previous[:, j], previous[:, j - 1]), current[:, j - 1])
+            current[:, j] = (a[:, i - 1] - b[:, j - 1]) ** 2 + step
+        previous = current
+    return np.sqrt(previous[:, n])
+
+
+def _pair_scores(z, observed, rows, cols, metric, band, min_overlap):
+    """Score of each (rows[p], cols[p]) pair; NaN where they share too few months."""
+    shared = observed[rows] & observed[cols]
+    za, zb = z[rows], z[cols]
+    if metric == "correlation":
+        with np.errstate(invalid="ignore", divide="ignore"):
+            score = (za * zb).sum(axis=1) / np.sqrt((za ** 2 * shared).sum(axis=1) * (zb ** 2 * shared).sum(axis=1))
+    else:
+        score = dtw_distance(za, zb, band)
+    return np.where(shared.sum(axis=1) >= min_overlap, score, np.nan)
+
+
+def _correlation_block(z, observed, queries, min_overlap):
+    """Correlations of the query rows with every row, over shared months."""
+    mask = observed.astype(float)
+    squares = z ** 2
+    with np.errstate(invalid="ignore", divide="ignore"):
+        score = (z[queries] @ z.T) / np.sqrt((squares[queries] @ mask.T) * (mask[queries] @ squares.T))
+    return np.where(mask[queries] @ mask.T >= min_overlap, score, np.nan)
+
+
+def _top_k(candidates, scores, k, metric):
+    """Best k candidates per row (padded with -1 / NaN), best first."""
+    rank = np.where(np.isnan(scores), -np.inf, scores if metric == "correlation" else -scores)
+    order = np.argsort(-rank, axis=1, kind="stable")[:, :k]
+    picked = np.take_along_axis(candidates, order, axis=1)
+    picked_scores = np.take_along_axis(scores, order, axis=1)
+    empty = np.isneginf(np.take_along_axis(rank, order, axis=1))
+    picked[empty], picked_scores[empty] = -1, np.nan
+    if picked.shape[1] < k:
+        pad = k - picked.shape[1]
+        picked = np.pad(picked, ((0, 0), (0, pad)), constant_values=-1)
+        picked_scores = np.pad(picked_scores, ((0, 0), (0, pad)), constant_values=np.nan)
+    return picked, picked_scores
+
+
+def paa(z: np.ndarray, segments: int = SIMILARITY_PAA_SEGMENTS) -> np.ndarray:
+    """
+    Piecewise aggregate approximation: the mean of each of `segments`
+    consecutive month ranges, scaled so that Euclidean distances between
+    reduced series lower-bound those between the full series.
+    """
+    bounds = np.array_split(np.arange(z.shape[1]), min(segments, z.shape[1]))
+    starts = np.array([b[0] for b in bounds])
+    lengths = np.array([len(b) for b in bounds])
+    return np.add.reduceat(z, starts, axis=1) / np.sqrt(lengths)
+
+
+def _search(z, observed, comparable, queries, metric, k, band, min_overlap, approximate):
+    """Top-k neighbours of the query rows among the comparable rows."""
+    n_months = z.shape[1]
+    neighbours = np.full((len(queries), k), -1)
+    scores = np.full((len(queries), k), np.nan)
+    targets = np.flatnonzero(comparable)
+    if len(targets) == 0 or len(queries) == 0:
+        return neighbours, scores
+
+    if approximate:
+        # Deferred: scipy is only needed for large series sets
+        from scipy.spatial import cKDTree
+
+        reduced = paa(z)
+        tree = cKDTree(reduced[targets])
+        width = min(SIMILARITY_CANDIDATES + 1, len(targets))
+    else:
+        width = len(targets)
+    per_pair = n_months * 8 * (6 if metric == "dtw" else 3)
+    block = max(1, SIMILARITY_BLOCK_BYTES // (width * per_pair))
+
+    for start in range(0, len(queries), block):
+        rows = np.asarray(queries[start:start + block])
+        if approximate:
+            _, found = tree.query(reduced[rows], k=width)
+            candidates = targets[np.asarray(found).reshape(len(rows), width)]
+        else:
+            candidates = np.broadcast_to(targets, (len(rows), width))
+        if metric == "correlation" and not approximate:
+            block_scores = _correlation_block(z, observed, rows, min_overlap)[:, targets]
+        else:
+            pair_rows = np.repeat(rows, width)
+            block_scores = _pair_scores(z, observed, pair_rows, candidates.ravel(), metric, band,
+                                        min_overlap).reshape(len(rows), width)
+        block_scores = np.where(candidates == rows[:, None], np.nan, block_scores)  # Not its own neighbour
+        neighbours[start:start + len(rows)], scores[start:start + len(rows)] = _top_k(
+            np.array(candidates), block_scores, k, metric)
+    return neighbours, scores
+
+
+def _series_keys(values):
+    return np.array([hashlib.blake2b(row.tobytes(), digest_size=8).hexdigest() for row in values], dtype=object)
+
+
+class SimilarityIndex:
+    """
+    Top-k most similar series of every series (see the module docstring).
+    Built by build_similarity_index; shared between sessions, so read-only.
+    """
+
+    def __init__(self, names, months, z, observed, keys, neighbours, scores, settings):
+        self.names = names
+        self.months = months
+        self.metric = settings["metric"]
+        self.approximate = settings["approximate"]
+        self.settings = settings
+        self.keys = keys
+        self.neighbours = neighbours  # Row positions, -1 where fewer than k series compare
+        self.scores = scores          # Correlation (higher is closer) or DTW distance (lower is closer)
+        self.z = z
+        self.observed = observed
+        for array in (names, keys, neighbours, scores, z, observed):
+            array.flags.writeable = False
+        self._position = {name: i for i, name in enumerate(names)}
+
+    def __contains__(self, name):
+        return name in self._position
+
+    def top(self, name, k: int = None) -> pd.DataFrame:
+        """
+        Most similar series to `name`, closest first (empty if unknown).
+
+        Returns:
+            DataFrame with name and score
+        """
+        i = self._position.get(name)
+        if i is None:
+            return pd.DataFrame({"name": [], "score": []})
+        row = self.neighbours[i, :k]
+        found = row >= 0
+        return pd.DataFrame({"name": self.names[row[found]], "score": self.scores[i, :k][found]})
+
+    def trajectory(self, name) -> np.ndarray:
+        """Z-normalised series on the month grid, NaN where unobserved."""
+        i = self._position[name]
+        return np.where(self.observed[i], self.z[i], np.nan)
+
+
+def build_similarity_index(
+    names,
+    months,
+    values: np.ndarray,
+    metric: str = "correlation",
+    k: int = SIMILARITY_TOP_K,
+    band: int = SIMILARITY_DTW_BAND,
+    min_overlap: int = SIMILARITY_MIN_OVERLAP,
+    approximate: bool = None,
+    previous: SimilarityIndex = None,
+) -> SimilarityIndex:
+    """
+    Index the top-k neighbours of every series.
+
+    Args:
+        names: Series names (e.g. states), one per row of values
+        months: Month grid (columns of values)
+        values: Series values, NaN where a month has no data
+        metric: "correlation" or "dtw"
+        k: Neighbours kept per series
+        band: DTW Sakoe-Chiba band half-width (None: unconstrained)
+        min_overlap: Months two series must share to be compared
+        approximate: Use the PAA + k-d tree candidate search (default: above
+            SIMILARITY_EXACT_MAX_SERIES series)
+        previous: Index built with the same settings and month grid; only
+            the series that changed since are searched again
+
+    Returns:
+        SimilarityIndex
+    """
+    if metric not in SIMILARITY_METRICS:
+        raise ValueError(f"Unknown similarity metric {metric!r}; expected one of {SIMILARITY_METRICS}")
+    names = np.asarray(names, dtype=object)
+    values = np.asarray(values, dtype=float)
+    if approximate is None:
+        approximate = len(names) > SIMILARITY_EXACT_MAX_SERIES
+    settings = {"metric": metric, "k": k, "band": band, "min_overlap": min_overlap, "approximate": approximate,
+                "months": hashlib.blake2b(np.asarray(months).tobytes(), digest_size=8).hexdigest()}
+
+    z, observed = znormalize(values)
+    comparable = (observed.sum(axis=1) >= min_overlap) & (z != 0).any(axis=1)
+    keys = _series_keys(values)
+    search = dict(metric=metric, k=k, band=band, min_overlap=min_overlap, approximate=approximate)
+    all_rows = np.arange(len(names))
+
+    if previous is None or previous.settings != settings:
+        neighbours, scores = _search(z, observed, comparable, all_rows, **search)
+        return SimilarityIndex(names, months, z, observed, keys, neighbours, scores, settings)
+
+    # Map each row to its previous position if the series is unchanged
+    old_position = np.array([previous._position.get(name, -1) for name in names])
+    kept = old_position >= 0
+    kept[kept] = previous.keys[old_position[kept]] == keys[kept]
+    changed = np.flatnonzero(~kept)
+    new_position = np.full(len(previous.names), -1)
+    new_position[old_position[kept]] = np.flatnonzero(kept)  # Old rows that are unchanged
+
+    # An unchanged row whose list names a changed or removed series is searched again
+    old_lists = previous.neighbours[old_position[kept]]
+    mapped = np.where(old_lists >= 0, new_position[np.maximum(old_lists, 0)], -1)
+    stale = ((old_lists >= 0) & (mapped < 0)).any(axis=1)
+    unchanged = np.flatnonzero(kept)
+    redo = np.concatenate([changed, unchanged[stale]])
+    if 2 * len(redo) > len(names):  # Most lists change: a full search is cheaper
+        neighbours, scores = _search(z, observed, comparable, all_rows, **search)
+        return SimilarityIndex(names, months, z, observed, keys, neighbours, scores, settings)
+
+    neighbours = np.full((len(names), k), -1)
+    scores = np.full((len(names), k), np.nan)
+    neighbours[redo], scores[redo] = _search(z, observed, comparable, redo, **search)
+
+    # The rest keep their lists, merged with their scores against the changed series
+    merge = unchanged[~stale]
+    merge_lists, merge_scores = mapped[~stale], previous.scores[old_position[merge]]
+    targets = changed[comparable[changed]]
+    if len(targets) and len(merge):
+        rows = np.repeat(merge, len(targets))
+        fresh = _pair_scores(z, observed, rows, np.tile(targets, len(merge)), metric, band, min_overlap)
+        merge_lists = np.concatenate([merge_lists, np.broadcast_to(targets, (len(merge), len(targets)))], axis=1)
+        merge_scores = np.concatenate([merge_scores, fresh.reshape(len(merge), len(targets))], axis=1)
+    merge_scores = np.where(merge_lists >= 0, merge_scores, np.nan)
+    neighbours[merge], scores[merge] = _top_k(np.array(merge_lists), merge_scores, k, metric)
+    return SimilarityIndex(names, months, z, observed, keys, neighbours, scores, settings)
+
+
+# (metric, key, value column) -> last index built, the base of the next incremental build
+_LAST_INDEX = {}
+_last_index_lock = threading.Lock()
+
+
+def similarity_index(df: pd.DataFrame, metric: str = "correlation", key: str = "state",
+                     value_column: str = "update_intensity") -> SimilarityIndex:
+    """
+    Index over the per-key series of a monthly frame, updated from the last
+    index this process built for the same metric and series.
+    """
+    names, months, values = series_matrix(df, key, value_column)
+    with _last_index_lock:
+        previous = _LAST_INDEX.get((metric, key, value_column))
+        index = build_similarity_index(names, months, values, metric, previous=previous)
+        _LAST_INDEX[(metric, key, value_column)] = index
+    return index
+
+
+def main():
+    from .config import DATA_FILES
+    from .ingestion import load_monthly_features
+
+    parser = argparse.ArgumentParser(description="States with a similar update intensity trajectory")
+    parser.add_argument("states", nargs="+")
+    parser.add_argument("--metric", choices=SIMILARITY_METRICS, default="correlation")
+    parser.add_argument("--k", type=int, default=SIMILARITY_TOP_K)
+    args = parser.parse_args()
+
+    index = similarity_index(load_monthly_features(DATA_FILES["monthly_features"]), args.metric)
+    for state in args.states:
+        print(f"{state} ({args.metric}):")
+        top = index.top(state, args.k)
+        print(top.to_string(index=False) if not top.empty else "  no comparable states")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,477 @@
+"""
+Stage functions for the data pipeline (see pipeline.py).
+
+Each stage ports one step of the notebook chain (notebooks 01-08) and
+has the signature `stage(inputs, outputs)`, where both are dicts of
+name -> path as declared in pipeline.STAGES. A stage reads only its
+inputs and writes exactly its outputs, so the pipeline can decide from
+content hashes alone whether it needs to run.
+"""
+import logging
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .config import VALIDATION_CHUNK_ROWS
+from .preprocessing import standardize_state_names
+from .tracing import traced
+from .validation import Validator
+
+logger = logging.getLogger(__name__)
+
+RAW_SOURCES = ("enrolment", "demographic", "biometric")
+
+# Notebook 02: raw age columns -> dashboard column names
+RAW_AGE_COLUMNS = {
+    "enrolment": {"age_5_17": "enrol_age_5_17", "age_18_greater": "enrol_age_18_plus"},
+    "demographic": {"demo_age_5_17": "demo_age_5_17", "demo_age_17_": "demo_age_18_plus"},
+    "biometric": {"bio_age_5_17": "bio_age_5_17", "bio_age_17_": "bio_age_18_plus"},
+}
+
+CORRELATION_HEATMAP_COLUMNS = [
+    'enrol_age_5_17', 'enrol_age_18_plus',
+    'demo_age_5_17', 'demo_age_18_plus',
+    'bio_age_5_17', 'bio_age_18_plus',
+    'update_intensity', 'update_intensity_3m_avg',
+    'update_consistency',
+]
+
+REGION_MAPPING = {
+    # North
+    'JAMMU AND KASHMIR': 'North', 'LADAKH': 'North', 'HIMACHAL PRADESH': 'North',
+    'PUNJAB': 'North', 'HARYANA': 'North', 'DELHI': 'North', 'UTTARAKHAND': 'North',
+    'CHANDIGARH': 'North',
+    # Central
+    'UTTAR PRADESH': 'Central', 'MADHYA PRADESH': 'Central', 'CHHATTISGARH': 'Central',
+    # East
+    'BIHAR': 'East', 'JHARKHAND': 'East', 'WEST BENGAL': 'East', 'ODISHA': 'East',
+    # Northeast
+    'ASSAM': 'Northeast', 'ARUNACHAL PRADESH': 'Northeast', 'NAGALAND': 'Northeast',
+    'MANIPUR': 'Northeast', 'MIZORAM': 'Northeast', 'TRIPURA': 'Northeast',
+    'MEGHALAYA': 'Northeast', 'SIKKIM': 'Northeast',
+    # West
+    'RAJASTHAN': 'West', 'GUJARAT': 'West', 'GOA': 'West', 'MAHARASHTRA': 'West',
+    'DADRA AND NAGAR HAVELI AND DAMAN AND DIU': 'West',
+    # South
+    'KARNATAKA': 'South', 'ANDHRA PRADESH': 'South', 'TELANGANA': 'South',
+    'TAMIL NADU': 'South', 'KERALA': 'South', 'PUDUCHERRY': 'South',
+    # Islands
+    'ANDAMAN AND NICOBAR ISLANDS': 'Islands', 'LAKSHADWEEP': 'Islands',
+}
+
+STATUS_BAR_COLORS = {"DECAYING": '#b91c1c', "HEALTHY": '#15803d', "STAGNANT": '#64748B'}
+
+
+def _read_features(path):
+    df = pd.read_csv(path)
+    df['year_month'] = pd.to_datetime(df['year_month'])
+    return df
+
+
+def _save_figure(fig, path, dpi=300):
+    import matplotlib.pyplot as plt
+    from .image_utils import generate_image_derivatives
+
+    fig.savefig(path, dpi=dpi, bbox_inches='tight')
+    plt.close(fig)
+    generate_image_derivatives(path)
+
+
+# ==============================
+# Notebooks 01-02: ingestion and cleaning
+# ==============================
+@traced
+def ingest(inputs, outputs):
+    """Concatenate each raw folder of CSV extracts into one frame, validating it chunk by chunk."""
+    for source in RAW_SOURCES:
+        files = sorted(Path(inputs[source]).glob("*.csv"))
+        if not files:
+            raise FileNotFoundError(f"No CSV files in {inputs[source]}")
+        validator = Validator(f"raw_{source}")
+        chunks = []
+        for f in files:
+            for chunk in pd.read_csv(f, chunksize=VALIDATION_CHUNK_ROWS):
+                validator.update(chunk)
+                chunks.append(chunk)
+        # Bad rows are left for cleaning to drop; the report says how many there are
+        report = validator.finish()
+        logger.log(logging.INFO if report.ok else logging.WARNING, "%s", report)
+        df = pd.concat(chunks, ignore_index=True)
+        df.to_pickle(outputs[source])
+
+
+@traced
+def clean(inputs, outputs):
+    """Parse dates, normalise names and aggregate to state-month totals."""
+    for source in RAW_SOURCES:
+        df = pd.read_pickle(inputs[source])
+        df["date"] = pd.to_datetime(df["date"], errors="coerce", dayfirst=True)
+        df = df.dropna(subset=["date"])  # Undated rows are dropped by the dashboard anyway
+        df["year_month"] = df["date"].dt.to_period("M").astype(str)
+        df["state"] = df["state"].astype("string")
+        df = df.loc[~df["state"].str.match(r"^\d+$", na=False)]
+        # Standardise before aggregating so name variants sum into one row
+        df["state"] = df["state"].str.replace(r"\s+", " ", regex=True)
+        df = standardize_state_names(df).rename(columns=RAW_AGE_COLUMNS[source])
+        age_columns = list(RAW_AGE_COLUMNS[source].values())
+        monthly = df.groupby(["state", "year_month"], as_index=False)[age_columns].sum()
+        monthly.to_csv(outputs[f"{source}_monthly"], index=False)
+
+
+# ==============================
+# Notebook 03: feature engineering
+# ==============================
+@traced
+def engineer_features(inputs, outputs):
+    """Join the three monthly tables and derive ratios and intensity signals."""
+    keys = ["state", "year_month"]
+    # Re-aggregate so each (state, month) is one row even in tables whose state
+    # names were standardised after aggregation; the merges then stay 1:1
+    monthly = {
+        name: pd.read_csv(inputs[name]).dropna(subset=keys).groupby(keys, as_index=False).sum()
+        for name in ("enrolment_monthly", "demographic_monthly", "biometric_monthly")
+    }
+    df = (
+        monthly["enrolment_monthly"]
+        .merge(monthly["demographic_monthly"], on=keys, how="left")
+        .merge(monthly["biometric_monthly"], on=keys, how="left")
+    )
+    update_cols = ["demo_age_5_17", "demo_age_18_plus", "bio_age_5_17", "bio_age_18_plus"]
+    df[update_cols] = df[update_cols].fillna(0)
+
+    for kind in ("demo", "bio"):
+        for age in ("5_17", "18_plus"):
+            df[f"{kind}_ratio_{age}"] = df[f"{kind}_age_{age}"] / df[f"enrol_age_{age}"]
+    ratio_cols = ["demo_ratio_5_17", "demo_ratio_18_plus", "bio_ratio_5_17", "bio_ratio_18_plus"]
+    df[ratio_cols] = df[ratio_cols].replace([np.inf], 0).fillna(0)
+
+    df["total_updates"] = df[update_cols].sum(axis=1)
+    df["total_enrolment"] = df["enrol_age_5_17"] + df["enrol_age_18_plus"]
+    df["update_intensity"] = (df["total_updates"] / df["total_enrolment"]).replace([np.inf], 0).fillna(0)
+
+    df = df.sort_values(keys)
+    by_state = df.groupby("state")["update_intensity"]
+    df["update_intensity_3m_avg"] = by_state.transform(lambda s: s.rolling(window=3, min_periods=1).mean())
+    df["update_decay_signal"] = df["update_intensity"] - df["update_intensity_3m_avg"]
+    df["update_consistency"] = by_state.transform("std")
+    df.to_csv(outputs["features"], index=False)
+
+
+# ==============================
+# Notebook 05: classification
+# ==============================
+def _classify(row):
+    if row["avg_update_intensity"] == 0:
+        return "STAGNANT"
+    if row["avg_decay_signal"] < 0 and row["recent_update_intensity"] < row["avg_update_intensity"]:
+        return "DECAYING"
+    return "HEALTHY"
+
+
+@traced
+def classify(inputs, outputs):
+    """Summarise each state, classify its status and rank it by risk."""
+    df = _read_features(inputs["features"])
+    df = df[df["year_month"].notna() & ~df["state"].str.match(r"^\d+$", na=False)]
+    df["state"] = (df["state"].str.strip().str.upper()
+                   .str.replace(r"\s+", " ", regex=True)
+                   .str.replace(r"^THE\s+", "", regex=True))
+    df = standardize_state_names(df)
+
+    summary = df.groupby("state", as_index=False).agg(
+        avg_update_intensity=("update_intensity", "mean"),
+        recent_update_intensity=("update_intensity", lambda x: x.sort_index().tail(3).mean()),
+        avg_decay_signal=("update_decay_signal", "mean"),
+        update_volatility=("update_consistency", "mean"),
+        active_months=("year_month", "nunique"),
+    )
+    summary["state_status"] = summary.apply(_classify, axis=1)
+    summary["risk_score"] = (
+        -summary["avg_decay_signal"]
+        + summary["update_volatility"] * 0.5
+        + 1 / (summary["recent_update_intensity"] + 1)
+    )
+    summary["priority_rank"] = summary["risk_score"].rank(ascending=False, method="dense").astype(int)
+    summary.sort_values("priority_rank")[[
+        "priority_rank", "state", "state_status",
+        "avg_update_intensity", "recent_update_intensity", "active_months",
+    ]].to_csv(outputs["priority"], index=False)
+
+
+# ==============================
+# Notebook 06: statistics
+# ==============================
+def mann_kendall_test(data):
+    """
+    Mann-Kendall trend test.
+    Returns: tau (trend strength), p_value, trend direction
+    """
+    from scipy import stats
+
+    n = len(data)
+    if n < 3:
+        return np.nan, np.nan, 'insufficient_data'
+    diffs = np.sign(data[None, :] - data[:, None])
+    s = np.triu(diffs, k=1).sum()
+    var_s = n * (n - 1) * (2 * n + 5) / 18
+    z = (s - np.sign(s)) / np.sqrt(var_s)
+    p_value = 2 * (1 - stats.norm.cdf(abs(z)))
+    tau = s / (n * (n - 1) / 2)
+    if p_value < 0.05:
+        trend = 'increasing' if tau > 0 else 'decreasing'
+    else:
+        trend = 'no_trend'
+    return tau, p_value, trend
+
+
+def _cohens_d(early, recent):
+    pooled_std = np.sqrt((np.var(early) + np.var(recent)) / 2)
+    return (np.mean(recent) - np.mean(early)) / pooled_std if pooled_std > 0 else 0
+
+
+def _magnitude(d):
+    d = abs(d)
+    return 'negligible' if d < 0.2 else 'small' if d < 0.5 else 'medium' if d < 0.8 else 'large'
+
+
+@traced
+def compute_statistics(inputs, outputs):
+    """Trend tests, benchmarking, confidence intervals and effect sizes."""
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    from scipy import stats
+
+    df = _read_features(inputs["features"]).sort_values(["state", "year_month"])
+    groups = {state: group for state, group in df.groupby("state", sort=False)}
+
+    trends = []
+    for state, group in groups.items():
+        tau, p_value, trend = mann_kendall_test(group['update_intensity'].to_numpy())
+        trends.append({'state': state, 'tau': tau, 'p_value': p_value, 'trend': trend})
+    df_trends = pd.DataFrame(trends)
+
+    # Correlation heatmap
+    corr = df[CORRELATION_HEATMAP_COLUMNS].corr()
+    fig, ax = plt.subplots(figsize=(12, 10))
+    image = ax.imshow(corr.to_numpy(), cmap='RdBu_r', vmin=-1, vmax=1)
+    for i in range(len(corr)):
+        for j in range(len(corr)):
+            ax.text(j, i, f"{corr.iat[i, j]:.2f}", ha='center', va='center', fontsize=8)
+    ax.set_xticks(range(len(corr)), corr.columns, rotation=45, ha='right')
+    ax.set_yticks(range(len(corr)), corr.columns)
+    fig.colorbar(image, shrink=0.8)
+    ax.set_title('Correlation Matrix: Update Activity Metrics', fontsize=16, fontweight='bold', pad=20)
+    fig.tight_layout()
+    _save_figure(fig, outputs["correlation_heatmap"])
+
+    # Benchmarking
+    summary = df.groupby('state').agg({
+        'update_intensity': ['mean', 'std', 'min', 'max'],
+        'update_intensity_3m_avg': 'last',
+        'total_updates': 'sum',
+        'total_enrolment': 'sum',
+    }).reset_index()
+    summary.columns = ['state', 'avg_intensity', 'std_intensity', 'min_intensity',
+                       'max_intensity', 'recent_intensity', 'total_updates', 'total_enrolment']
+    summary['percentile'] = summary['avg_intensity'].rank(pct=True) * 100
+    national_median = summary['avg_intensity'].median()
+    national_mean = summary['avg_intensity'].mean()
+    summary['below_median'] = summary['avg_intensity'] < national_median
+    summary = summary.merge(df_trends, on='state', how='left')
+    summary.to_csv(outputs["benchmarking"], index=False)
+
+    # Confidence intervals (t-based, as in notebook 06)
+    ci_rows = []
+    for state, group in groups.items():
+        values = group['update_intensity'].to_numpy()
+        mean = values.mean()
+        if len(values) < 2:
+            lower = upper = np.nan
+        else:
+            margin = stats.sem(values) * stats.t.ppf(0.975, len(values) - 1)
+            lower, upper = mean - margin, mean + margin
+        ci_rows.append({'state': state, 'mean': mean, 'ci_lower': lower, 'ci_upper': upper})
+    df_ci = pd.DataFrame(ci_rows).sort_values('mean')
+    combined = pd.concat([df_ci.head(10), df_ci.tail(10)])
+
+    fig, ax = plt.subplots(figsize=(12, 8))
+    ax.errorbar(
+        range(len(combined)), combined['mean'],
+        yerr=[combined['mean'] - combined['ci_lower'], combined['ci_upper'] - combined['mean']],
+        fmt='o', capsize=5, capthick=2, markersize=8, color='#0B3C5D', ecolor='#D97706', elinewidth=2,
+    )
+    ax.axhline(y=national_median, color='red', linestyle='--', linewidth=2,
+               label=f'National Median: {national_median:.4f}')
+    ax.set_xticks(range(len(combined)), combined['state'].values, rotation=45, ha='right')
+    ax.set_ylabel('Update Intensity', fontsize=12, fontweight='bold')
+    ax.set_title('Update Intensity with 95% Confidence Intervals\n(Bottom 10 and Top 10 States)',
+                 fontsize=14, fontweight='bold', pad=20)
+    ax.legend()
+    ax.grid(True, alpha=0.3)
+    fig.tight_layout()
+    _save_figure(fig, outputs["confidence_intervals"])
+
+    # Effect size: first 3 vs last 3 months
+    effects = []
+    for state, group in groups.items():
+        if len(group) < 6:
+            continue
+        early = group['update_intensity'].head(3).to_numpy()
+        recent = group['update_intensity'].tail(3).to_numpy()
+        d = _cohens_d(early, recent)
+        effects.append({
+            'state': state,
+            'early_mean': early.mean(),
+            'recent_mean': recent.mean(),
+            'change': recent.mean() - early.mean(),
+            'cohens_d': d,
+            'magnitude': _magnitude(d),
+        })
+    df_effect = pd.DataFrame(effects).sort_values('cohens_d')
+    df_effect.to_csv(outputs["effect_size"], index=False)
+
+    pd.DataFrame([{
+        'total_states': df['state'].nunique(),
+        'total_observations': len(df),
+        'states_with_significant_decline': int((df_trends['trend'] == 'decreasing').sum()),
+        'states_with_large_effect_decay': int((df_effect['cohens_d'] < -0.8).sum()),
+        'states_below_median': int(summary['below_median'].sum()),
+        'national_median_intensity': national_median,
+        'national_mean_intensity': national_mean,
+        'lowest_intensity_state': summary.nsmallest(1, 'avg_intensity')['state'].values[0],
+        'lowest_intensity_value': summary['avg_intensity'].min(),
+        'highest_intensity_state': summary.nlargest(1, 'avg_intensity')['state'].values[0],
+        'highest_intensity_value': summary['avg_intensity'].max(),
+    }]).to_csv(outputs["summary"], index=False)
+
+
+# ==============================
+# Notebook 07: geospatial
+# ==============================
+@traced
+def analyse_geography(inputs, outputs):
+    """Regional aggregates, the state bar chart image and the interactive chart."""
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    import plotly.graph_objects as go
+
+    df = _read_features(inputs["features"])
+    priority = pd.read_csv(inputs["priority"])
+
+    state_geo = df.groupby('state').agg(
+        avg_update_intensity=('update_intensity', 'mean'),
+        total_updates=('total_updates', 'sum'),
+        total_enrolment=('total_enrolment', 'sum'),
+    ).reset_index()
+    state_geo = state_geo.merge(priority[['state', 'state_status', 'priority_rank']], on='state', how='inner')
+    state_geo['region'] = state_geo['state'].map(REGION_MAPPING).fillna('Other')
+
+    # Static chart: states by region, and regional averages
+    ordered = state_geo.sort_values(['region', 'avg_update_intensity']).reset_index(drop=True)
+    colors = ordered['state_status'].map(STATUS_BAR_COLORS).fillna('#9CA3AF').to_numpy()
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(20, 12))
+    ax1.barh(range(len(ordered)), ordered['avg_update_intensity'].to_numpy(),
+             color=colors, edgecolor='black', linewidth=0.5)
+    ax1.set_yticks(range(len(ordered)), ordered['state'].to_numpy(), fontsize=9)
+    ax1.set_xlabel('Average Update Intensity', fontsize=12, fontweight='bold')
+    ax1.set_title('India: Aadhaar Update Intensity by State\n(Red=Decaying, Green=Healthy)',
+                  fontsize=14, fontweight='bold', pad=20)
+    ax1.grid(axis='x', alpha=0.3)
+    ax1.axvline(x=state_geo['avg_update_intensity'].median(), color='blue', linestyle='--',
+                linewidth=2, label='National Median')
+    ax1.legend()
+    for region, start in ordered.groupby('region', sort=False).apply(lambda g: g.index[0], include_groups=False).items():
+        if start > 0:
+            ax1.axhline(y=start - 0.5, color='gray', linestyle='-', linewidth=1, alpha=0.5)
+        ax1.text(-0.02, start + 1, region, transform=ax1.get_yaxis_transform(), fontsize=10,
+                 fontweight='bold', color='#0B3C5D', bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.3))
+
+    regional = state_geo.groupby('region').agg(
+        avg_intensity=('avg_update_intensity', 'mean'),
+        num_states=('state', 'count'),
+    ).reset_index().sort_values('avg_intensity')
+    region_colors = ['#b91c1c' if x < 100 else '#D97706' if x < 200 else '#15803d'
+                     for x in regional['avg_intensity']]
+    ax2.barh(regional['region'], regional['avg_intensity'], color=region_colors,
+             edgecolor='black', linewidth=1.5)
+    for i, row in enumerate(regional.itertuples()):
+        ax2.text(row.avg_intensity + 10, i, f"{int(row.num_states)} states\n{row.avg_intensity:.1f}",
+                 va='center', fontsize=9, fontweight='bold')
+    ax2.set_xlabel('Average Update Intensity', fontsize=12, fontweight='bold')
+    ax2.set_title('Regional Summary\n(Number of States & Avg Intensity)', fontsize=14, fontweight='bold', pad=20)
+    ax2.grid(axis='x', alpha=0.3)
+    fig.tight_layout()
+    _save_figure(fig, outputs["state_chart"])
+
+    # Interactive chart
+    by_intensity = state_geo.sort_values('avg_update_intensity')
+    fig = go.Figure()
+    for region in sorted(state_geo['region'].unique()):
+        region_data = by_intensity[by_intensity['region'] == region]
+        fig.add_trace(go.Bar(
+            y=region_data['state'],
+            x=region_data['avg_update_intensity'],
+            name=region,
+            orientation='h',
+            hovertemplate='<b>%{y}</b><br>Update Intensity: %{x:.2f}<br>'
+                          + 'Status: ' + region_data['state_status'].astype(str) + '<br>'
+                          + 'Priority Rank: #' + region_data['priority_rank'].astype(int).astype(str)
+                          + '<extra></extra>',
+        ))
+    fig.update_layout(
+        title='India: Aadhaar Update Intensity by State (Interactive)',
+        xaxis_title='Average Update Intensity',
+        yaxis_title='State',
+        height=1000,
+        legend=dict(title='Region', orientation='v', yanchor='top', y=1, xanchor='left', x=1.02),
+        font=dict(family='Inter', size=10),
+        hovermode='closest',
+    )
+    fig.write_html(outputs["interactive_map"])
+
+    regional_stats = state_geo.groupby('region').agg({
+        'avg_update_intensity': ['mean', 'std', 'min', 'max'],
+        'total_updates': 'sum',
+        'state': 'count',
+    }).reset_index()
+    regional_stats.columns = ['region', 'mean_intensity', 'std_intensity',
+                              'min_intensity', 'max_intensity', 'total_updates', 'num_states']
+    state_geo.to_csv(outputs["geographical"], index=False)
+    regional_stats.sort_values('mean_intensity').to_csv(outputs["regional"], index=False)
+
+
+# ==============================
+# Notebook 08 / generate_all_forecasts.py: forecasting
+# ==============================
+@traced
+def forecast(inputs, outputs):
+    """ARIMA forecasts for all states, their chart and intervention scenarios."""
+    import matplotlib
+    matplotlib.use("Agg")
+    from . import generate_all_forecasts as forecasting
+
+    df = _read_features(inputs["features"]).sort_values(['state', 'year_month'])
+    priority = pd.read_csv(inputs["priority"])
+
+    forecasts = forecasting.generate_all_forecasts(df, priority)
+    forecasting.save_forecasts_to_csv(forecasts, outputs["forecasts"])
+    forecasting.create_visualization(forecasts, outputs["chart"])
+
+    # Scenarios for the top 10 decaying states, as in notebook 08
+    decaying = priority[priority['state_status'] == 'DECAYING'].nsmallest(10, 'priority_rank')['state']
+    scenarios = []
+    for state in decaying:
+        if state not in forecasts:
+            continue
+        baseline = forecasts[state]['forecast_values'][-1]
+        scenarios.append({
+            'state': state,
+            'baseline_forecast': baseline,
+            'scenario_20pct': baseline * 1.20,
+            'scenario_50pct': baseline * 1.50,
+            'improvement_needed_for_median': 0.05 / baseline if baseline > 0 else np.inf,
+        })
+    pd.DataFrame(scenarios).to_csv(outputs["scenarios"], index=False)
@@ -0,0 +1,285 @@
+"""
+Fuzzy resolution of state names against the 36 canonical states/UTs.
+
+Names are first normalised (case, spacing, "&" -> "AND", a leading
+"THE"), then looked up among the canonical names, the hand-maintained
+aliases (STATE_NAME_MAPPING) and the known invalid entries. A name that
+matches none of these is scored against a BK-tree of the canonical names
+and aliases by edit distance; it resolves when the best score reaches
+STATE_MATCH_MIN_SCORE within STATE_MATCH_MAX_EDITS edits and no other
+state scores as well. Otherwise it is left unchanged. The absolute cap
+keeps a suffix on a long name ("ANDAMAN AND NICOBAR ISLANDS 0003") from
+scoring as a close match.
+
+Every name that needed scoring is remembered, in memory and in a JSON
+lookup file (STATE_LOOKUP_FILE), so each distinct spelling is scored
+once. Entries in the file can be edited by hand: set "method" to
+"manual" and "state" to the right name (or null to drop the name).
+
+Usage (from the repository root):
+    python -m src.state_names                        # report of the lookup file
+    python -m src.state_names "WEST BENGLII" ORRISA  # resolve names
+"""
+import hashlib
+import json
+import logging
+import os
+import re
+import sys
+import threading
+
+from .config import STATE_LOOKUP_FILE, STATE_MATCH_MAX_EDITS, STATE_MATCH_MIN_SCORE
+
+logger = logging.getLogger(__name__)
+
+CANONICAL_STATES = (
+    # States
+    'ANDHRA PRADESH', 'ARUNACHAL PRADESH', 'ASSAM', 'BIHAR', 'CHHATTISGARH', 'GOA',
+    'GUJARAT', 'HARYANA', 'HIMACHAL PRADESH', 'JHARKHAND', 'KARNATAKA', 'KERALA',
+    'MADHYA PRADESH', 'MAHARASHTRA', 'MANIPUR', 'MEGHALAYA', 'MIZORAM', 'NAGALAND',
+    'ODISHA', 'PUNJAB', 'RAJASTHAN', 'SIKKIM', 'TAMIL NADU', 'TELANGANA', 'TRIPURA',
+    'UTTAR PRADESH', 'UTTARAKHAND', 'WEST BENGAL',
+    # Union Territories
+    'ANDAMAN AND NICOBAR ISLANDS', 'CHANDIGARH', 'DADRA AND NAGAR HAVELI AND DAMAN AND DIU',
+    'DELHI', 'JAMMU AND KASHMIR', 'LADAKH', 'LAKSHADWEEP', 'PUDUCHERRY',
+)
+
+# ISO 3166-2:IN subdivision codes (the key the boundary GeoJSON uses)
+STATE_CODES = {
+    'ANDHRA PRADESH': 'IN-AP', 'ARUNACHAL PRADESH': 'IN-AR', 'ASSAM': 'IN-AS', 'BIHAR': 'IN-BR',
+    'CHHATTISGARH': 'IN-CT', 'GOA': 'IN-GA', 'GUJARAT': 'IN-GJ', 'HARYANA': 'IN-HR',
+    'HIMACHAL PRADESH': 'IN-HP', 'JHARKHAND': 'IN-JH', 'KARNATAKA': 'IN-KA', 'KERALA': 'IN-KL',
+    'MADHYA PRADESH': 'IN-MP', 'MAHARASHTRA': 'IN-MH', 'MANIPUR': 'IN-MN', 'MEGHALAYA': 'IN-ML',
+    'MIZORAM': 'IN-MZ', 'NAGALAND': 'IN-NL', 'ODISHA': 'IN-OR', 'PUNJAB': 'IN-PB',
+    'RAJASTHAN': 'IN-RJ', 'SIKKIM': 'IN-SK', 'TAMIL NADU': 'IN-TN', 'TELANGANA': 'IN-TG',
+    'TRIPURA': 'IN-TR', 'UTTAR PRADESH': 'IN-UP', 'UTTARAKHAND': 'IN-UT', 'WEST BENGAL': 'IN-WB',
+    'ANDAMAN AND NICOBAR ISLANDS': 'IN-AN', 'CHANDIGARH': 'IN-CH',
+    'DADRA AND NAGAR HAVELI AND DAMAN AND DIU': 'IN-DH', 'DELHI': 'IN-DL',
+    'JAMMU AND KASHMIR': 'IN-JK', 'LADAKH': 'IN-LA', 'LAKSHADWEEP': 'IN-LD', 'PUDUCHERRY': 'IN-PY',
+}
+
+INVALID = None  # Resolution of names that are not states (rows are dropped)
+_MISSING = object()
+
+_SPACES = re.compile(r"\s+")
+
+
+def normalize_name(name) -> str:
+    """Upper case, single spaces, "&" spelled out and no leading "THE"."""
+    text = _SPACES.sub(" ", str(name).upper().replace("&", " AND ")).strip()
+    return text[4:] if text.startswith("THE ") else text
+
+
+def edit_distance(a: str, b: str) -> int:
+    """Levenshtein distance (insertions, deletions and substitutions)."""
+    if len(a) < len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        previous = current
+    return previous[-1]
+
+
+class BKTree:
+    """
+    Burkhard-Keller tree over strings under edit distance. A search only
+    visits children whose edge distance is within the triangle-inequality
+    band around the query, not every term.
+    """
+
+    def __init__(self, terms=()):
+        self._root = None  # (term, {distance: child})
+        for term in terms:
+            self.add(term)
+
+    def add(self, term: str):
+        if self._root is None:
+            self._root = (term, {})
+            return
+        node = self._root
+        while True:
+            distance = edit_distance(term, node[0])
+            if distance == 0:
+                return
+            child = node[1].get(distance)
+            if child is None:
+                node[1][distance] = (term, {})
+                return
+            node = child
+
+    def search(self, query: str, max_distance: int) -> list:
+        """(distance, term) pairs within max_distance of the query, nearest first."""
+        found, stack = [], [self._root] if self._root else []
+        while stack:
+            term, children = stack.pop()
+            distance = edit_distance(query, term)
+            if distance <= max_distance:
+                found.append((distance, term))
+            for edge, child in children.items():
+                if distance - max_distance <= edge <= distance + max_distance:
+                    stack.append(child)
+        return sorted(found)
+
+
+class StateNameResolver:
+    """
+    Maps raw state names to canonical ones; see the module docstring.
+
+    Args:
+        canonical: Canonical state names
+        aliases: Known variant -> canonical name
+        invalid: Names that are not states (resolve to INVALID)
+        lookup_path: JSON file remembering scored names (None: memory only)
+        min_score: Minimum similarity (1 - distance / longer length) to resolve
+        max_edits: Maximum edit distance to resolve, whatever the length
+    """
+
+    def __init__(self, canonical=CANONICAL_STATES, aliases=None, invalid=(),
+                 lookup_path=STATE_LOOKUP_FILE, min_score=STATE_MATCH_MIN_SCORE,
+                 max_edits=STATE_MATCH_MAX_EDITS):
+        self.min_score = min_score
+        self.max_edits = max_edits
+        self.lookup_path = lookup_path
+        self._exact = {normalize_name(name): name for name in canonical}
+        for variant, name in (aliases or {}).items():
+            self._exact.setdefault(normalize_name(variant), name)
+        for name in invalid:
+            self._exact[normalize_name(name)] = INVALID
+        # Fuzzy candidates: canonical names and aliases (not invalid entries)
+        self._targets = {term: name for term, name in self._exact.items() if name is not INVALID}
+        self._index = BKTree(sorted(self._targets))
+        self._longest = max(map(len, self._targets))
+        self._index_key = hashlib.blake2b("\n".join(sorted(self._targets)).encode(), digest_size=8).hexdigest()
+        self._memo = {}     # Raw name -> resolution, for every name seen
+        self._entries = {}  # Normalised name -> lookup file entry
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        if not self.lookup_path or not os.path.exists(self.lookup_path):
+            return
+        try:
+            with open(self.lookup_path) as f:
+                stored = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning("Ignoring unreadable state lookup file %s: %s", self.lookup_path, e)
+            return
+        current = (stored.get("index") == self._index_key and stored.get("min_score") == self.min_score
+                   and stored.get("max_edits") == self.max_edits)
+        for name, entry in stored.get("names", {}).items():
+            # Scores are only reusable for the same targets and thresholds
+            if entry.get("method") == "manual" or current:
+                self._entries[name] = entry
+
+    def save(self):
+        if not self.lookup_path:
+            return
+        with self._lock:
+            document = {"index": self._index_key, "min_score": self.min_score,
+                        "max_edits": self.max_edits, "names": dict(sorted(self._entries.items()))}
+        try:
+            os.makedirs(os.path.dirname(self.lookup_path) or ".", exist_ok=True)
+            tmp_path = f"{self.lookup_path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(document, f, indent=1)
+            os.replace(tmp_path, self.lookup_path)
+        except OSError as e:  # e.g. a read-only deployment; the memo still applies
+            logger.warning("Could not write state lookup file %s: %s", self.lookup_path, e)
+
+    def score(self, name: str):
+        """
+        Best fuzzy match for a normalised name.
+
+        Returns:
+            Lookup entry dict: state (None if unresolved), score, method
+            ("fuzzy" or "unresolved") and candidate (best state found)
+        """
+        max_distance = min(int((1 - self.min_score) * max(len(name), self._longest)), self.max_edits)
+        best = {}  # Canonical state -> best score
+        for distance, term in self._index.search(name, max_distance):
+            similarity = 1 - distance / max(len(name), len(term))
+            if similarity <= 0:
+                continue
+            state = self._targets[term]
+            best[state] = max(best.get(state, 0.0), similarity)
+        ranked = sorted(best.items(), key=lambda item: -item[1])
+        if not ranked:
+            return {"state": None, "score": 0.0, "method": "unresolved", "candidate": None}
+        candidate, top = ranked[0]
+        clear = len(ranked) == 1 or ranked[1][1] < top  # No other state ties the best
+        resolved = top >= self.min_score and clear
+        return {"state": candidate if resolved else None, "score": round(top, 3),
+                "method": "fuzzy" if resolved else "unresolved", "candidate": candidate}
+
+    def _resolve_new(self, raw):
+        """Resolution of a name not in the memo; returns (resolution, new entry or None)."""
+        name = normalize_name(raw)
+        if name in self._exact:
+            return self._exact[name], None
+        entry = self._entries.get(name)
+        if entry is None:
+            entry = self.score(name)
+            new = (name, entry)
+        else:
+            new = None
+        if entry["method"] == "manual":
+            return entry["state"], new
+        return (entry["state"] if entry["state"] is not None else name), new
+
+    def resolve(self, raw):
+        """Canonical name, INVALID, or the normalised name if unresolved."""
+        return self.resolve_many([raw])[0]
+
+    def resolve_many(self, names) -> list:
+        """Resolve each name; cost grows with names not seen before."""
+        memo = self._memo
+        results, added = [], []
+        for raw in names:
+            resolution = memo.get(raw, _MISSING)
+            if resolution is _MISSING:
+                resolution, new = self._resolve_new(raw)
+                with self._lock:
+                    memo[raw] = resolution
+                    if new is not None:
+                        self._entries[new[0]] = new[1]
+                        added.append(new)
+            results.append(resolution)
+        if added:
+            fixed = [f"{name} -> {entry['state']} ({entry['score']:.2f})"
+                     for name, entry in added if entry["method"] == "fuzzy"]
+            if fixed:
+                logger.info("Auto-resolved %d state name(s): %s", len(fixed), "; ".join(fixed))
+            self.save()
+        return results
+
+    def report(self):
+        """Names resolved by scoring or by hand, and names left unresolved."""
+        import pandas as pd
+
+        with self._lock:
+            rows = [{"name": name, **entry} for name, entry in self._entries.items()]
+        columns = ["name", "state", "method", "score", "candidate"]
+        return pd.DataFrame(rows, columns=columns).sort_values(["method", "name"], ignore_index=True)
+
+
+def main():
+    from .preprocessing import state_name_resolver
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    resolver = state_name_resolver()
+    if len(sys.argv) > 1:
+        for raw in sys.argv[1:]:
+            print(f"{raw!r} -> {resolver.resolve(raw)!r}")
+        return
+    report = resolver.report()
+    if report.empty:
+        print(f"No scored names in {resolver.lookup_path}")
+    else:
+        print(report.to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Server-side paging, sorting and filtering for dashboard tables.
+
+Tables are cut down to the visible page before they reach Streamlit, so
+a rerun serialises only those rows however large the cached frame is.
+Sort orders and filter matches are computed once per table version and
+kept in a bounded LRU cache; a page change is then just a slice.
+"""
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from .config import TABLE_PAGE_SIZE, TABLE_INDEX_CACHE_SIZE
+
+# (cache key, kind, argument) -> row positions, most recently used last
+_INDEX_CACHE = OrderedDict()
+_INDEX_CACHE_LOCK = threading.Lock()
+
+
+def _cached(key, build):
+    if key[0] is None:
+        return build()
+    with _INDEX_CACHE_LOCK:
+        if key in _INDEX_CACHE:
+            _INDEX_CACHE.move_to_end(key)
+            return _INDEX_CACHE[key]
+    positions = build()
+    with _INDEX_CACHE_LOCK:
+        _INDEX_CACHE[key] = positions
+        while len(_INDEX_CACHE) > TABLE_INDEX_CACHE_SIZE:
+            _INDEX_CACHE.popitem(last=False)
+    return positions
+
+
+def sort_order(df: pd.DataFrame, column: str, ascending: bool = True, cache_key=None) -> np.ndarray:
+    """
+    Row positions of `df` sorted by one column (stable, missing values last).
+    """
+    def build():
+        values = df[column].reset_index(drop=True)
+        return values.sort_values(ascending=ascending, kind="stable", na_position="last").index.to_numpy()
+
+    return _cached((cache_key, "sort", (column, ascending)), build)
+
+
+def filter_mask(df: pd.DataFrame, query: str, cache_key=None) -> np.ndarray:
+    """
+    Boolean mask of rows where any column contains `query` (case-insensitive).
+    """
+    def build():
+        needle = query.strip().lower()
+        mask = np.zeros(len(df), dtype=bool)
+        for column in df.columns:
+            text = df[column].astype(str).str.lower()
+            mask |= text.str.contains(needle, regex=False).to_numpy(dtype=bool, na_value=False)
+        return mask
+
+    return _cached((cache_key, "filter", query.strip().lower()), build)
+
+
+def paginate(df: pd.DataFrame, page: int = 1, page_size: int = TABLE_PAGE_SIZE,
+             sort_by: str = None, ascending: bool = True, query: str = "", cache_key=None) -> dict:
+    """
+    One page of a table after filtering and sorting.
+
+    Args:
+        df: Full table (treated as read-only)
+        page: 1-based page number (clamped to the available pages)
+        page_size: Rows per page
+        sort_by: Column to sort by (None keeps the table's own order)
+        ascending: Sort direction
+        query: Case-insensitive substring to match against any column
+        cache_key: Identifies this table and data version (e.g. (name,
+            version)); sort orders and filter matches are cached under it
+
+    Returns:
+        Dictionary with rows (the page as a DataFrame), total (matching
+        rows), pages, page and start (0-based position of the first row)
+    """
+    positions = np.arange(len(df)) if sort_by is None else sort_order(df, sort_by, ascending, cache_key)
+    if query and query.strip():
+        positions = positions[filter_mask(df, query, cache_key)[positions]]
+
+    total = len(positions)
+    pages = max(1, -(-total // page_size))
+    page = min(max(1, int(page)), pages)
+    start = (page - 1) * page_size
+    return {
+        "rows": df.iloc[positions[start:start + page_size]],
+        "total": total,
+        "pages": pages,
+        "page": page,
+        "start": start,
+    }
@@ -0,0 +1,199 @@
+"""
+Lightweight tracing for the data and page-building hot paths.
+
+`traced` (decorator) and `span` (context manager) record wall time, CPU
+time, rows processed and peak allocation for a block of work. Each span
+is logged as one JSON line on the "src.tracing" logger and kept for a
+Chrome trace (chrome://tracing or https://ui.perfetto.dev), written to
+TRACE_FILE on exit and at most every TRACE_FLUSH_SECONDS.
+
+Tracing is off unless UIDAI_TRACE=1. When off, `traced` returns the
+function unchanged and `span` returns a shared no-op, so instrumented
+code pays nothing. Peak allocation comes from tracemalloc, which slows
+the traced process noticeably; UIDAI_TRACE_MEMORY=0 turns it off.
+Allocation peaks are process-wide, so they are approximate when spans
+run concurrently on several threads.
+"""
+import atexit
+import functools
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import deque
+
+from .config import TRACE_ENABLED, TRACE_FILE, TRACE_MEMORY, TRACE_MAX_EVENTS, TRACE_FLUSH_SECONDS
+
+logger = logging.getLogger(__name__)
+
+_EVENTS = deque(maxlen=TRACE_MAX_EVENTS)  # Chrome trace "complete" events
+_LOCK = threading.Lock()
+_LOCAL = threading.local()  # Per-thread stack of open spans
+_EPOCH_NS = time.perf_counter_ns()
+_last_flush = time.monotonic()
+
+
+def count_rows(result, args=()):
+    """
+    Rows in a result (or, failing that, in the first tabular argument).
+    """
+    for value in (result, result[0] if isinstance(result, tuple) and result else None, *args):
+        if hasattr(value, "shape") and getattr(value, "ndim", 0) >= 1:
+            return int(value.shape[0])
+    return None
+
+
+class _Span:
+    __slots__ = ("name", "args", "rows", "_wall", "_cpu", "_mem", "_peak")
+
+    def __init__(self, name, args):
+        self.name = name
+        self.args = args
+        self.rows = None
+
+    def __enter__(self):
+        stack = getattr(_LOCAL, "stack", None)
+        if stack is None:
+            stack = _LOCAL.stack = []
+        if TRACE_MEMORY:
+            current, peak = tracemalloc.get_traced_memory()
+            for parent in stack:  # Keep the parents' peaks across the reset
+                parent._peak = max(parent._peak, peak)
+            tracemalloc.reset_peak()
+            self._mem = self._peak = current
+        stack.append(self)
+        self._cpu = time.thread_time_ns()
+        self._wall = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        wall = time.perf_counter_ns() - self._wall
+        cpu = time.thread_time_ns() - self._cpu
+        stack = _LOCAL.stack
+        stack.pop()
+        peak_kb = None
+        if TRACE_MEMORY:
+            _, peak = tracemalloc.get_traced_memory()
+            self._peak = max(self._peak, peak)
+            for parent in stack:
+                parent._peak = max(parent._peak, self._peak)
+            peak_kb = round((self._peak - self._mem) / 1024, 1)
+        _record(self, wall, cpu, peak_kb, error=exc_type.__name__ if exc_type else None, top=not stack)
+        return False
+
+
+class _NoSpan:
+    """Shared stand-in for `span` when tracing is off."""
+    __slots__ = ()
+    rows = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def __setattr__(self, name, value):
+        pass  # span.rows = ... is a no-op
+
+
+_NO_SPAN = _NoSpan()
+_SCALARS = (str, int, float, bool)
+
+
+def span(name: str, **args):
+    """
+    Context manager tracing the enclosed block. Set `.rows` on the
+    returned span to record how many rows the block processed.
+    """
+    if not TRACE_ENABLED:
+        return _NO_SPAN
+    return _Span(name, args)
+
+
+def traced(func=None, *, name: str = None):
+    """
+    Decorator tracing each call of a function. Rows are taken from the
+    returned frame or array, else from the first tabular argument; plain
+    scalar arguments (e.g. a state name) are recorded with the span.
+    """
+    if func is None:
+        return functools.partial(traced, name=name)
+    if not TRACE_ENABLED:
+        return func
+    label = name or f"{func.__module__.rpartition('.')[2]}.{func.__qualname__}"
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        scalars = {f"arg{i}": value for i, value in enumerate(args) if isinstance(value, _SCALARS)}
+        scalars.update((key, value) for key, value in kwargs.items() if isinstance(value, _SCALARS))
+        with _Span(label, scalars) as current:
+            result = func(*args, **kwargs)
+            current.rows = count_rows(result, args)
+            return result
+
+    return wrapper
+
+
+def _record(current, wall_ns, cpu_ns, peak_kb, error, top):
+    global _last_flush
+    record = {
+        "span": current.name,
+        "wall_ms": round(wall_ns / 1e6, 3),
+        "cpu_ms": round(cpu_ns / 1e6, 3),
+        "rows": current.rows,
+        "peak_kb": peak_kb,
+        "thread": threading.current_thread().name,
+    }
+    if current.args:
+        record["args"] = {key: str(value) for key, value in current.args.items()}
+    if error:
+        record["error"] = error
+    logger.info(json.dumps(record))
+
+    event = {
+        "name": current.name,
+        "ph": "X",
+        "ts": (current._wall - _EPOCH_NS) / 1000,
+        "dur": wall_ns / 1000,
+        "pid": os.getpid(),
+        "tid": threading.get_ident(),
+        "args": {key: value for key, value in record.items() if key not in ("span", "wall_ms", "thread")},
+    }
+    with _LOCK:
+        _EVENTS.append(event)
+        flush = top and time.monotonic() - _last_flush >= TRACE_FLUSH_SECONDS
+        if flush:
+            _last_flush = time.monotonic()
+    if flush:
+        write_trace()
+
+
+def write_trace(path: str = TRACE_FILE) -> str:
+    """
+    Write the recorded spans as Chrome trace JSON (loadable in Perfetto).
+    """
+    with _LOCK:
+        events = list(_EVENTS)
+    metadata = [{"name": "thread_name", "ph": "M", "pid": os.getpid(), "tid": thread.ident,
+                 "args": {"name": thread.name}} for thread in threading.enumerate()]
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump({"traceEvents": metadata + events, "displayTimeUnit": "ms"}, f)
+    os.replace(tmp_path, path)
+    return path
+
+
+if TRACE_ENABLED:
+    if not logger.handlers:
+        handler = logging.StreamHandler(sys.stderr)
+        handler.setFormatter(logging.Formatter("%(asctime)s %(name)s %(message)s"))
+        logger.addHandler(handler)
+        logger.propagate = False
+    logger.setLevel(logging.INFO)
+    if TRACE_MEMORY and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    atexit.register(write_trace)
@@ -0,0 +1,281 @@
+"""
+Declarative data validation for ingested tables.
+
+Each table has a schema in SCHEMAS listing the checks that apply to it:
+
+    required      columns that must be present
+    not_null      columns that must have no missing values
+    non_negative  count columns that must be >= 0
+    finite        ratio columns that must not be +/-inf
+    month         column that must parse as a month ("YYYY-MM" or datetime)
+    date          (column, format) that must parse as a date
+    unique        key columns whose combination must not repeat
+    states        column that must hold exactly the EXPECTED_STATES_COUNT
+                  canonical states (no others)
+    numeric_state column that must not hold bare numbers
+
+A Validator checks one chunk at a time, with one vectorised pass over
+the chunk's numeric block, and carries what it needs across chunks (key
+hashes, states seen). Streaming readers can therefore validate each chunk
+as it arrives, and a whole frame is simply one chunk. finish() returns a
+ValidationReport with one line per violated check.
+
+Usage (from the repository root):
+    python -m src.validation     # validate the data files; exits 1 on violations
+"""
+import sys
+
+import numpy as np
+import pandas as pd
+
+from .config import DATA_FILES, EXPECTED_STATES_COUNT
+from .state_names import CANONICAL_STATES
+
+COUNT_COLUMNS = (
+    "enrol_age_5_17", "enrol_age_18_plus",
+    "demo_age_5_17", "demo_age_18_plus",
+    "bio_age_5_17", "bio_age_18_plus",
+    "total_updates", "total_enrolment",
+)
+RATIO_COLUMNS = (
+    "demo_ratio_5_17", "demo_ratio_18_plus",
+    "bio_ratio_5_17", "bio_ratio_18_plus",
+    "update_intensity", "update_intensity_3m_avg",
+)
+
+SCHEMAS = {
+    "monthly_features": {
+        "required": ("state", "year_month") + COUNT_COLUMNS + RATIO_COLUMNS,
+        "not_null": ("state",),  # Missing months are reported by the month check
+        "non_negative": COUNT_COLUMNS,
+        "finite": RATIO_COLUMNS + ("update_decay_signal",),
+        "month": "year_month",
+        "unique": ("state", "year_month"),
+        "states": "state",
+    },
+    "priority_table": {
+        "required": ("priority_rank", "state", "state_status"),
+        "not_null": ("priority_rank", "state", "state_status"),
+        "non_negative": ("priority_rank", "avg_update_intensity", "recent_update_intensity", "active_months"),
+        "finite": ("avg_update_intensity", "recent_update_intensity"),
+        "unique": ("state",),
+        "states": "state",
+    },
+    # Raw extracts (notebook 01 schema), validated chunk by chunk during ingestion
+    "raw_enrolment": {
+        "required": ("date", "state", "district", "age_5_17", "age_18_greater"),
+        "not_null": ("state",),
+        "non_negative": ("age_0_5", "age_5_17", "age_18_greater"),
+        "date": ("date", "%d-%m-%Y"),
+        "numeric_state": "state",
+    },
+    "raw_demographic": {
+        "required": ("date", "state", "district", "demo_age_5_17", "demo_age_17_"),
+        "not_null": ("state",),
+        "non_negative": ("demo_age_5_17", "demo_age_17_"),
+        "date": ("date", "%d-%m-%Y"),
+        "numeric_state": "state",
+    },
+    "raw_biometric": {
+        "required": ("date", "state", "district", "bio_age_5_17", "bio_age_17_"),
+        "not_null": ("state",),
+        "non_negative": ("bio_age_5_17", "bio_age_17_"),
+        "date": ("date", "%d-%m-%Y"),
+        "numeric_state": "state",
+    },
+}
+
+_SAMPLES = 3  # Example values kept per violation
+
+
+def _bad_values(values: np.ndarray, is_bad) -> np.ndarray:
+    """Row mask from a check run once per distinct value (dates and states repeat heavily)."""
+    codes, uniques = pd.factorize(values)
+    bad = np.append(np.asarray(is_bad(uniques), dtype=bool), False)  # Code -1 (missing) is not bad
+    return bad[codes]
+
+
+def _show(value):
+    if isinstance(value, (pd.Timestamp, np.datetime64)):
+        return pd.Timestamp(value).strftime("%Y-%m")
+    return str(value)
+
+
+class ValidationReport:
+    """Violations found in one table: check, column, count and examples."""
+
+    def __init__(self, table, rows, violations):
+        self.table = table
+        self.rows = rows
+        self.violations = violations  # list of dicts: check, column, count, examples
+
+    @property
+    def ok(self) -> bool:
+        return not self.violations
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame(self.violations, columns=["check", "column", "count", "examples"])
+
+    def __str__(self):
+        if self.ok:
+            return f"{self.table}: {self.rows:,} rows, no violations"
+        lines = [f"{self.table}: {len(self.violations)} violation(s) in {self.rows:,} rows"]
+        for v in self.violations:
+            examples = f" e.g. {', '.join(map(str, v['examples']))}" if v["examples"] else ""
+            lines.append(f"  {v['check']} [{v['column']}]: {v['count']:,}{examples}")
+        return "\n".join(lines)
+
+
+class Validator:
+    """
+    Accumulates violations of a schema over successive chunks.
+
+    Args:
+        table: Table name (a key of SCHEMAS, also used in the report)
+        schema: Check definitions (defaults to SCHEMAS[table])
+    """
+
+    def __init__(self, table: str, schema: dict = None):
+        self.table = table
+        self.schema = SCHEMAS[table] if schema is None else schema
+        self.rows = 0
+        self._counts = {}    # (check, column) -> count
+        self._examples = {}  # (check, column) -> list of example values
+        self._key_hashes = []
+        self._states = {}    # State -> rows
+        self._missing_columns = set()
+
+    def _add(self, check, column, count, examples=()):
+        key = (check, column)
+        if count:
+            self._counts[key] = self._counts.get(key, 0) + int(count)
+        kept = self._examples.setdefault(key, [])
+        for value in examples:
+            if len(kept) >= _SAMPLES:
+                break
+            if value not in kept:
+                kept.append(value)
+
+    def update(self, chunk: pd.DataFrame):
+        """Check one chunk of rows."""
+        schema = self.schema
+        self.rows += len(chunk)
+        columns = set(chunk.columns)
+        self._missing_columns.update(c for c in schema.get("required", ()) if c not in columns)
+        # Column arrays are taken once; examples are only looked up for failing rows
+        arrays = {}
+
+        def array(column):
+            if column not in arrays:
+                arrays[column] = chunk[column].to_numpy()
+            return arrays[column]
+
+        for column in schema.get("not_null", ()):
+            if column in columns:
+                self._add("missing", column, pd.isna(array(column)).sum())
+
+        # One float block for every numeric check
+        non_negative = [c for c in schema.get("non_negative", ()) if c in columns]
+        finite = [c for c in schema.get("finite", ()) if c in columns]
+        numeric = list(dict.fromkeys(non_negative + finite))
+        if numeric:
+            block = np.column_stack([np.asarray(array(c), dtype=float) for c in numeric])
+            n = len(non_negative)
+            negative = block[:, :n] < 0  # non_negative columns come first in the block
+            for i in np.flatnonzero(negative.any(axis=0)):
+                self._add("negative", non_negative[i], negative[:, i].sum(), block[negative[:, i], i][:_SAMPLES])
+            infinite = np.isinf(block[:, [numeric.index(c) for c in finite]])
+            for i in np.flatnonzero(infinite.any(axis=0)):
+                self._add("infinite", finite[i], infinite[:, i].sum())
+
+        month = schema.get("month")
+        if month in columns:
+            if pd.api.types.is_datetime64_any_dtype(chunk[month]):
+                self._add("unparseable_month", month, np.isnat(array(month)).sum())  # Already coerced to NaT
+            else:
+                bad = _bad_values(array(month), lambda u: pd.to_datetime(u, format="%Y-%m", errors="coerce").isna())
+                bad |= pd.isna(array(month))
+                self._add("unparseable_month", month, bad.sum(), array(month)[bad][:_SAMPLES].tolist())
+
+        date = schema.get("date")
+        if date and date[0] in columns:
+            column, fmt = date
+            bad = _bad_values(array(column), lambda u: pd.to_datetime(u, format=fmt, errors="coerce").isna())
+            self._add("unparseable_date", column, bad.sum(), array(column)[bad][:_SAMPLES].tolist())
+
+        unique = schema.get("unique", ())
+        if unique and all(c in columns for c in unique):
+            hashes = pd.util.hash_array(array(unique[0]))
+            for column in unique[1:]:
+                hashes = hashes * np.uint64(1_000_003) ^ pd.util.hash_array(array(column))
+            self._key_hashes.append(hashes)
+            # Examples come from repeats within a chunk; the count covers all chunks
+            repeated = np.flatnonzero(pd.Index(hashes).duplicated())[:_SAMPLES]
+            self._add("duplicate_key", ", ".join(unique), 0,
+                      [" | ".join(_show(array(c)[i]) for c in unique) for i in repeated])
+
+        states = schema.get("states")
+        if states in columns:
+            codes, names = pd.factorize(array(states))
+            counts = np.bincount(codes[codes >= 0], minlength=len(names))
+            for state, count in zip(names.tolist(), counts.tolist()):
+                self._states[state] = self._states.get(state, 0) + count
+
+        numeric_state = schema.get("numeric_state")
+        if numeric_state in columns:
+            bad = _bad_values(array(numeric_state),
+                              lambda u: pd.Series(u, dtype="string").str.fullmatch(r"\s*\d+\s*").fillna(False))
+            self._add("numeric_state", numeric_state, bad.sum(), array(numeric_state)[bad][:_SAMPLES].tolist())
+
+    def finish(self) -> ValidationReport:
+        """Cross-chunk checks (key uniqueness, state coverage) and the report."""
+        for column in sorted(self._missing_columns):
+            self._add("missing_column", column, 1)
+
+        if self._key_hashes:
+            hashes = np.concatenate(self._key_hashes)
+            repeats = len(hashes) - len(np.unique(hashes))
+            self._add("duplicate_key", ", ".join(self.schema["unique"]), repeats)
+
+        states = self.schema.get("states")
+        if states and not any(c == ("missing_column", states) for c in self._counts):
+            canonical = set(CANONICAL_STATES)
+            unknown = {s: n for s, n in self._states.items() if s not in canonical}
+            found = len(self._states) - len(unknown)
+            self._add("unknown_state", states, sum(unknown.values()),
+                      sorted(unknown, key=unknown.get, reverse=True)[:_SAMPLES])
+            if found != EXPECTED_STATES_COUNT:
+                missing = sorted(canonical - set(self._states))
+                self._add("state_count", states, abs(EXPECTED_STATES_COUNT - found),
+                          [f"{found} of {EXPECTED_STATES_COUNT} states"] + missing[:_SAMPLES - 1])
+
+        violations = [
+            {"check": check, "column": column, "count": count, "examples": self._examples.get((check, column), [])}
+            for (check, column), count in self._counts.items()
+        ]
+        return ValidationReport(self.table, self.rows, violations)
+
+
+def validate_frame(df: pd.DataFrame, table: str, schema: dict = None) -> ValidationReport:
+    """Validate a whole DataFrame as a single chunk."""
+    validator = Validator(table, schema)
+    validator.update(df)
+    return validator.finish()
+
+
+def main():
+    from .preprocessing import standardize_state_names
+
+    # The files as stored, with names standardised as the loaders do
+    reports = [
+        validate_frame(standardize_state_names(pd.read_csv(DATA_FILES[table])), table)
+        for table in ("monthly_features", "priority_table")
+    ]
+    for report in reports:
+        print(report)
+    if not all(report.ok for report in reports):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,386 @@
+"""
+View-model builders for the dashboard pages.
+
+Each builder turns the loaded data into ready-to-render metrics, tables
+and figures for one page section. They are pure functions of their
+arguments, so app.py can cache them on exactly the inputs each section
+depends on plus the version of the data files it reads (see
+VIEW_DEPENDENCIES): a rerun triggered by an unrelated widget then costs
+a cache lookup, and a changed file only invalidates the views built
+from it.
+Returned objects are shared between sessions and must be treated as
+read-only. Figures are returned as serialised JSON from the shared
+figure cache in visualization.py.
+"""
+import pandas as pd
+
+from .choropleth import join_metric
+from .config import COLORS, TABLE_ROW_LIMITS
+from .correlation import correlation_from_stats
+from .metrics import rank_by_risk
+from .state_names import STATE_CODES
+from .tracing import traced
+from .windows import window_priority
+from .visualization import (
+    cached_figure_json,
+    low_update_bar_chart,
+    update_trend_chart,
+    add_segment_means,
+    add_anomaly_markers,
+    regional_bar_chart,
+    choropleth_map,
+    similar_trajectories_chart,
+    forecast_chart,
+    correlation_heatmap,
+)
+
+# Map metric label -> priority table column
+MAP_METRICS = {
+    "Avg Update Intensity": "avg_update_intensity",
+    "Recent Update Intensity": "recent_update_intensity",
+    "Active Months": "active_months",
+}
+
+# Similarity metric label -> (index metric, score column label)
+SIMILARITY_LABELS = {
+    "Correlation": ("correlation", "Correlation"),
+    "DTW": ("dtw", "DTW Distance"),
+}
+
+# View -> DATA_FILES entries it is built from
+VIEW_DEPENDENCIES = {
+    "sidebar": ("priority_table", "monthly_features"),
+    "overview_summary": ("priority_table", "monthly_features"),
+    "overview_state": ("priority_table", "monthly_features"),
+    "priority_matrix": ("priority_table", "monthly_features"),
+    "statistics": ("stat_summary", "benchmarking", "effect_size", "geographical",
+                   "priority_table", "monthly_features"),
+    "correlation": ("geographical", "monthly_features"),
+    "geographic": ("regional",),
+    "map": ("priority_table", "monthly_features"),
+    "forecast": ("forecasts",),
+    "state_details": ("priority_table", "monthly_features"),
+    "similar_states": ("priority_table", "monthly_features"),
+}
+
+
+def view_version(data, view) -> str:
+    """
+    Version of the data files a view depends on.
+    """
+    return data.version_of(*VIEW_DEPENDENCIES[view])
+
+
+def _window_priority(data, window):
+    """
+    Priority table and risk components: the precomputed ones, or for a
+    (start, end) month window recomputed from the prefix sums.
+    """
+    if window is None:
+        return data["priority"], data["risk_components"]
+    return window_priority(data["prefix_sums"], *window)
+
+
+def _state_row(priority, state):
+    rows = priority[priority["state"] == state]
+    return None if rows.empty else rows.iloc[0]
+
+
+def _state_ts(data, state, window=None):
+    state_ts = data["state_index"].get(state, data["monthly"].iloc[0:0])
+    if window is not None:
+        months = state_ts["year_month"]
+        state_ts = state_ts[(months >= pd.Timestamp(window[0])) & (months <= pd.Timestamp(window[1]))]
+    return state_ts
+
+
+@traced
+def sidebar_view(data) -> dict:
+    """
+    Options for the sidebar state selector and date range.
+    """
+    return {
+        "states": sorted(data["priority"]["state"].unique()),
+        "months": [str(month)[:7] for month in data["prefix_sums"]["months"]],
+    }
+
+
+@traced
+def overview_summary_view(data, window=None) -> dict:
+    """
+    Status KPIs and the low-activity chart for a date window (all time if None).
+    """
+    priority, _ = _window_priority(data, window)
+    lowest = priority.nsmallest(TABLE_ROW_LIMITS["low_activity"], "avg_update_intensity")
+    figure = cached_figure_json(
+        ("low_activity", window, view_version(data, "overview_summary")),
+        lambda: low_update_bar_chart(lowest, '#b91c1c')
+    )
+    return {
+        "total": len(priority),
+        "decaying": int((priority["state_status"] == "DECAYING").sum()),
+        "healthy": int((priority["state_status"] == "HEALTHY").sum()),
+        "low_activity_figure": figure,
+    }
+
+
+@traced
+def overview_state_view(data, state, risk_weights, window=None) -> dict:
+    """
+    Selected-state metrics (with live priority rank) and trend chart for a
+    date window. Returns None if the state is not in the priority table.
+    """
+    priority, components = _window_priority(data, window)
+    state_data = _state_row(priority, state)
+    if state_data is None:
+        return None
+    state_ts = _state_ts(data, state, window)
+
+    _, _, live_rank = rank_by_risk(components, risk_weights, k=1, mask=components["states"] == state)
+    rank = int(live_rank[0]) if len(live_rank) else int(state_data['priority_rank'])
+
+    trend = None
+    if len(state_ts) >= 2:
+        recent = state_ts.tail(1)['update_intensity'].values[0]
+        prev = state_ts.tail(2).head(1)['update_intensity'].values[0]
+        trend = ((recent - prev) / prev * 100) if prev > 0 else 0
+
+    figure = cached_figure_json(
+        ("overview_trend", state, window, view_version(data, "overview_state")),
+        lambda: update_trend_chart(state_ts, [COLORS["primary"], COLORS["secondary"]], state)
+    )
+    return {
+        "status": state_data['state_status'],
+        "rank": rank,
+        "avg_intensity": state_data['avg_update_intensity'],
+        "trend": trend,
+        "trend_figure": figure,
+    }
+
+
+@traced
+def priority_matrix_view(data, status_filter, risk_weights, limit: int = None, window=None) -> pd.DataFrame:
+    """
+    States ranked by weighted risk score, restricted to a status filter,
+    for a date window (all time if None). All matching states are returned
+    unless `limit` is given; app.py pages through them.
+    """
+    priority, components = _window_priority(data, window)
+    status_mask = None
+    if status_filter != "All":
+        allowed = priority.loc[priority["state_status"] == status_filter, "state"]
+        status_mask = pd.Series(components["states"]).isin(allowed).to_numpy()
+    top_states, top_scores, top_ranks = rank_by_risk(components, risk_weights, k=limit, mask=status_mask)
+    priority_lookup = priority.set_index("state")
+    return pd.DataFrame({
+        "State Name": top_states,
+        "Status": priority_lookup["state_status"].reindex(top_states).to_numpy(),
+        "Avg Update Intensity": priority_lookup["avg_update_intensity"].reindex(top_states).to_numpy(),
+        "Risk Score": top_scores,
+        "Priority Rank": top_ranks,
+    })
+
+
+@traced
+def statistics_view(data) -> dict:
+    """
+    National KPIs plus benchmarking and effect size tables (full tables,
+    ordered for display; app.py pages through them).
+    """
+    analytics = data["analytics"]
+    view = {"kpis": [], "benchmarking": None, "effect_size": None}
+
+    stat_summary = analytics['stat_summary']
+    if not stat_summary.empty:
+        # Use actual data count instead of incorrect CSV value
+        view["kpis"].append(("States/UTs Analyzed", len(data["priority"])))
+        if 'states_with_significant_decline' in stat_summary.columns:
+            view["kpis"].append(("Declining States", int(stat_summary['states_with_significant_decline'].values[0])))
+        if 'states_with_large_effect_decay' in stat_summary.columns:
+            view["kpis"].append(("Critical States", int(stat_summary['states_with_large_effect_decay'].values[0])))
+        if 'national_median_intensity' in stat_summary.columns:
+            view["kpis"].append(("Median Intensity", f"{stat_summary['national_median_intensity'].values[0]:.2f}"))
+
+    benchmarking = analytics['benchmarking']
+    if not benchmarking.empty:
+        cols = ['state', 'avg_intensity', 'percentile', 'trend']
+        available_cols = [c for c in cols if c in benchmarking.columns]
+        display_df = benchmarking.sort_values('avg_intensity', ascending=False, kind='stable')[available_cols].copy()
+        # Rename columns for better readability
+        col_rename = {'state': 'State Name', 'avg_intensity': 'Avg Intensity', 'percentile': 'Percentile', 'trend': 'Trend'}
+        display_df.columns = [col_rename.get(c, c) for c in display_df.columns]
+        view["benchmarking"] = display_df
+
+    effect_size = analytics['effect_size']
+    if not effect_size.empty:
+        cols = ['state', 'early_mean', 'recent_mean', 'change', 'cohens_d', 'magnitude']
+        available_cols = [c for c in cols if c in effect_size.columns]
+        display_df = effect_size.sort_values('cohens_d', kind='stable')[available_cols].copy()
+        # Rename columns for better readability
+        col_rename = {'state': 'State Name', 'early_mean': 'Early Mean', 'recent_mean': 'Recent Mean', 'change': 'Change', 'cohens_d': "Cohen's D", 'magnitude': 'Magnitude'}
+        display_df.columns = [col_rename.get(c, c) for c in display_df.columns]
+        view["effect_size"] = display_df
+
+    geo = analytics['geographical']
+    view["regions"] = ["All"] + (sorted(geo['region'].dropna().unique()) if not geo.empty else [])
+    view["months"] = sorted(data["monthly"]['year_month'].dt.strftime("%Y-%m").unique())
+    return view
+
+
+@traced
+def correlation_view(data, region, start, end) -> str:
+    """
+    Correlation heatmap for a region and month range, from cached statistics.
+    """
+    def build():
+        geo = data["analytics"]['geographical']
+        states = None
+        if region != "All" and not geo.empty:
+            states = geo.loc[geo['region'] == region, 'state']
+        fig = correlation_heatmap(correlation_from_stats(data["correlation_stats"], states, start, end))
+        fig.update_layout(height=550, margin=dict(l=0, r=0, t=10, b=0))
+        return fig
+
+    return cached_figure_json(("correlation", region, start, end, view_version(data, "correlation")), build)
+
+
+@traced
+def geographic_view(data) -> dict:
+    """
+    Regional performance chart and summary table.
+    """
+    regional = data["analytics"]['regional']
+    if regional.empty:
+        return {"figure": None, "table": None}
+
+    reg_df = regional.sort_values('mean_intensity', ascending=False)
+    figure = cached_figure_json(("regional", view_version(data, "geographic")), lambda: regional_bar_chart(reg_df))
+    reg_display = reg_df[['region', 'mean_intensity', 'num_states']].copy()
+    reg_display.columns = ['Region', 'Mean Intensity', 'States Count']
+    return {"figure": figure, "table": reg_display}
+
+
+@traced
+def map_view(data, metric, status_filter, state, geometry, codes, window=None) -> dict:
+    """
+    Choropleth of a priority-table metric for the states matching a status
+    filter in a date window, outlining the selected state. `geometry` is
+    the URL of the published boundaries (see choropleth.py) and `codes`
+    their feature codes; the cached figure holds only the URL and the
+    metric arrays.
+    """
+    priority, _ = _window_priority(data, window)
+    if status_filter != "All":
+        priority = priority[priority["state_status"] == status_filter]
+    joined = join_metric(priority, MAP_METRICS[metric], codes)
+    highlight = STATE_CODES[state] if state in set(joined["names"]) else None
+    figure = cached_figure_json(
+        ("map", metric, status_filter, highlight, geometry, window, view_version(data, "map")),
+        lambda: choropleth_map(geometry, joined["locations"], joined["values"], joined["names"], metric, highlight)
+    )
+    return {"figure": figure, "unmapped": joined["unmapped"]}
+
+
+@traced
+def forecast_view(data, state) -> dict:
+    """
+    Forecast chart and table for a state, or None if it has no forecast.
+    """
+    forecasts = data["analytics"]['forecasts']
+    if forecasts.empty or state not in forecasts['state'].values:
+        return None
+    st_forecast = forecasts[forecasts['state'] == state]
+    figure = cached_figure_json(("forecast", state, view_version(data, "forecast")), lambda: forecast_chart(st_forecast))
+
+    forecast_display = st_forecast[['forecast_month', 'forecast_value', 'lower_bound', 'upper_bound']].copy()
+    forecast_display.columns = ['Month', 'Forecast Value', 'Lower CI', 'Upper CI']
+    return {"figure": figure, "table": forecast_display}
+
+
+@traced
+def state_details_view(data, state) -> dict:
+    """
+    Metrics, annotated time series, segments, anomalies and history for a
+    state. Returns None if the state is not in the priority table.
+    """
+    state_data = _state_row(data["priority"], state)
+    if state_data is None:
+        return None
+    state_ts = _state_ts(data, state)
+
+    segment_display = None
+    state_segments = data["changepoints"].get(state)
+    if state_segments is not None and len(state_segments) > 1:
+        segment_display = state_segments[['start_month', 'end_month', 'n_months', 'mean']].copy()
+        segment_display['start_month'] = segment_display['start_month'].dt.strftime('%Y-%m')
+        segment_display['end_month'] = segment_display['end_month'].dt.strftime('%Y-%m')
+        segment_display.columns = ['From', 'To', 'Months', 'Mean Intensity']
+    else:
+        state_segments = None
+
+    anomaly_display = None
+    flagged = None
+    state_anomalies = data["anomalies"].get(state)
+    if state_anomalies is not None:
+        flagged = state_anomalies[state_anomalies["is_anomaly"]]
+        if flagged.empty:
+            flagged = None
+        else:
+            anomaly_display = flagged[['year_month', 'update_intensity', 'robust_z', 'seasonal_z', 'level_shift']].copy()
+            anomaly_display.columns = ['Year-Month', 'Update Intensity', 'Robust Z', 'Seasonal Z', 'Level Shift']
+
+    def build():
+        fig = update_trend_chart(
+            state_ts, [COLORS["primary"], COLORS["secondary"]], state,
+            height=450, labels=("Update Intensity", "3-Month Moving Average")
+        )
+        if state_segments is not None:
+            add_segment_means(fig, state_segments)
+        if flagged is not None:
+            add_anomaly_markers(fig, flagged)
+        return fig
+
+    figure = cached_figure_json(("state_details", state, view_version(data, "state_details")), build)
+
+    hist_display = state_ts[['year_month', 'update_intensity', 'update_intensity_3m_avg']].sort_values('year_month', ascending=False).copy()
+    hist_display.columns = ['Year-Month', 'Update Intensity', '3-Month Average']
+
+    return {
+        "status": state_data['state_status'],
+        "rank": int(state_data['priority_rank']),
+        "avg_intensity": state_data['avg_update_intensity'],
+        "figure": figure,
+        "segments": segment_display,
+        "anomalies": anomaly_display,
+        "history": hist_display,
+    }
+
+
+@traced
+def similar_states_view(data, state, metric) -> dict:
+    """
+    States whose update intensity trajectory is closest to the state's,
+    looked up in the precomputed similarity index, and their z-normalised
+    trajectories. Returns None if the state has no comparable neighbours.
+    """
+    index_metric, score_label = SIMILARITY_LABELS[metric]
+    index = data[f"similarity.{index_metric}"]
+    top = index.top(state)
+    if top.empty:
+        return None
+
+    priority = data["priority"].set_index("state")
+    table = pd.DataFrame({
+        "State": top["name"].to_numpy(),
+        score_label: top["score"].to_numpy(),
+        "Status": priority["state_status"].reindex(top["name"]).to_numpy(),
+        "Avg Intensity": priority["avg_update_intensity"].reindex(top["name"]).to_numpy(),
+    })
+
+    def build():
+        months = pd.to_datetime(index.months)
+        names = [state] + top["name"].tolist()
+        return similar_trajectories_chart(months, {name: index.trajectory(name) for name in names}, state)
+
+    figure = cached_figure_json(("similar_states", state, metric, view_version(data, "similar_states")), build)
+    return {"table": table, "figure": figure}
@@ -1,39 +1,263 @@
-import plotly.express as px
+import json
+import threading
+from collections import OrderedDict
 
+import numpy as np
+import plotly.graph_objects as go
 
-def low_update_bar_chart(df, color):
+from .config import COLORS, FIGURE_CACHE_SIZE
+
+# Serialised figure JSON by key, most recently used last
+_FIGURE_CACHE = OrderedDict()
+_FIGURE_CACHE_LOCK = threading.Lock()
+
+
+def cached_figure_json(key, build) -> str:
+    """
+    Serialised JSON of the figure identified by `key` (e.g. chart name,
+    state and data version). `build` is only called on a miss, so a figure
+    is built once per process while it stays in the bounded LRU cache.
+    Numeric NumPy traces serialise as base64 typed arrays, which keeps the
+    payload sent to the browser small.
+    """
+    with _FIGURE_CACHE_LOCK:
+        if key in _FIGURE_CACHE:
+            _FIGURE_CACHE.move_to_end(key)
+            return _FIGURE_CACHE[key]
+
+    payload = build().to_json()
+
+    with _FIGURE_CACHE_LOCK:
+        _FIGURE_CACHE[key] = payload
+        while len(_FIGURE_CACHE) > FIGURE_CACHE_SIZE:
+            _FIGURE_CACHE.popitem(last=False)
+    return payload
+
+
+def figure_spec(payload: str) -> dict:
+    """
+    Figure dict from cached JSON, ready for st.plotly_chart.
+    """
+    return json.loads(payload)
+
+
+def clear_figure_cache():
+    """
+    Drop all cached figures (e.g. after the underlying data changed).
+    """
+    with _FIGURE_CACHE_LOCK:
+        _FIGURE_CACHE.clear()
+
+
+def low_update_bar_chart(df, color, title=None):
     """
     Horizontal bar chart showing states with persistently low update intensity.
     """
-    fig = px.bar(
-        df,
-        x="avg_update_intensity",
-        y="state",
+    fig = go.Figure(go.Bar(
+        y=df["state"].to_numpy(),
+        x=df["avg_update_intensity"].to_numpy(dtype=float),
         orientation="h",
-        title="States with Persistently Low Update Activity",
-        labels={
-            "avg_update_intensity": "Average Update Intensity",
-            "state": "State"
-        },
-        color_discrete_sequence=[color]
+        marker_color=color
+    ))
+    fig.update_layout(
+        title=title,
+        height=400,
+        yaxis={"categoryorder": "total ascending"},
+        showlegend=False,
+        margin=dict(l=0, r=0, t=40 if title else 10, b=0)
     )
     return fig
 
 
-def update_trend_chart(df, colors, state_name):
+def update_trend_chart(df, colors, state_name, height=400,
+                       labels=("Intensity", "3-Month Avg"), show_title=False):
     """
     Line chart showing update intensity and rolling average for a selected state.
     """
-    fig = px.line(
-        df,
-        x="year_month",
-        y=["update_intensity", "update_intensity_3m_avg"],
-        title=f"Update Intensity Trend: {state_name}",
-        labels={
-            "year_month": "Month",
-            "value": "Update Intensity",
-            "variable": "Metric"
-        },
-        color_discrete_sequence=colors
+    months = df["year_month"].to_numpy()
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=months,
+        y=df["update_intensity"].to_numpy(dtype=float),
+        mode="lines+markers",
+        name=labels[0],
+        line=dict(color=colors[0], width=3),
+        marker=dict(size=8)
+    ))
+    fig.add_trace(go.Scatter(
+        x=months,
+        y=df["update_intensity_3m_avg"].to_numpy(dtype=float),
+        mode="lines",
+        name=labels[1],
+        line=dict(color=colors[1], width=2, dash="dash")
+    ))
+    fig.update_layout(
+        title=f"Update Intensity Trend: {state_name}" if show_title else None,
+        height=height,
+        showlegend=True,
+        margin=dict(l=0, r=0, t=40 if show_title else 10, b=0)
+    )
+    return fig
+
+
+def add_segment_means(fig, segments, color=COLORS["healthy"]):
+    """
+    Overlay change-point segment means as horizontal lines.
+    Segments are drawn as one trace, separated by NaN gaps.
+    """
+    n = len(segments)
+    x = np.empty(3 * n, dtype="datetime64[ns]")
+    x[0::3] = segments["start_month"].to_numpy(dtype="datetime64[ns]")
+    x[1::3] = segments["end_month"].to_numpy(dtype="datetime64[ns]")
+    x[2::3] = np.datetime64("NaT")
+    y = np.full(3 * n, np.nan)
+    y[0::3] = y[1::3] = segments["mean"].to_numpy(dtype=float)
+    fig.add_trace(go.Scatter(
+        x=x,
+        y=y,
+        mode="lines",
+        name="Segment Mean",
+        line=dict(color=color, width=2)
+    ))
+    return fig
+
+
+def add_anomaly_markers(fig, flagged, color=COLORS["decaying"]):
+    """
+    Mark anomalous months on a time series chart.
+    """
+    fig.add_trace(go.Scatter(
+        x=flagged["year_month"].to_numpy(),
+        y=flagged["update_intensity"].to_numpy(dtype=float),
+        mode="markers",
+        name="Anomaly",
+        marker=dict(color=color, size=12, symbol="x")
+    ))
+    return fig
+
+
+def regional_bar_chart(df, color=COLORS["primary"]):
+    """
+    Mean intensity per region, annotated with the number of states.
+    """
+    fig = go.Figure(go.Bar(
+        x=df["region"].to_numpy(),
+        y=df["mean_intensity"].to_numpy(dtype=float),
+        marker_color=color,
+        text=[f"{int(n)} states" for n in df["num_states"]],
+        textposition="outside"
+    ))
+    fig.update_layout(
+        height=400,
+        showlegend=False,
+        margin=dict(l=0, r=0, t=10, b=0)
+    )
+    return fig
+
+
+def choropleth_map(geometry, locations, values, names, label, highlight=None, height=600):
+    """
+    State choropleth. `geometry` is a GeoJSON dict or the URL of a published
+    one (see choropleth.py); features are matched on properties.code.
+    `highlight` outlines one location (e.g. the selected state).
+    """
+    fig = go.Figure(go.Choropleth(
+        geojson=geometry,
+        featureidkey="properties.code",
+        locations=locations,
+        z=values,
+        text=names,
+        colorscale=[[0, COLORS["decaying"]], [0.5, "#FDE68A"], [1, COLORS["healthy"]]],
+        marker_line_color="white",
+        marker_line_width=0.5,
+        colorbar_title=label,
+        hovertemplate="<b>%{text}</b><br>" + label + ": %{z:,.1f}<extra></extra>"
+    ))
+    if highlight is not None:
+        fig.add_trace(go.Choropleth(
+            geojson=geometry,
+            featureidkey="properties.code",
+            locations=[highlight],
+            z=[0],
+            colorscale=[[0, "rgba(0,0,0,0)"], [1, "rgba(0,0,0,0)"]],
+            showscale=False,
+            marker_line_color=COLORS["primary"],
+            marker_line_width=3,
+            hoverinfo="skip"
+        ))
+    fig.update_geos(fitbounds="locations", visible=False)
+    fig.update_layout(height=height, margin=dict(l=0, r=0, t=10, b=0))
+    return fig
+
+
+def similar_trajectories_chart(months, trajectories, highlight, height=400):
+    """
+    Z-normalised trajectories (name -> values on `months`), with the
+    `highlight` series drawn bold and the others thin.
+    """
+    fig = go.Figure()
+    for name, values in trajectories.items():
+        selected = name == highlight
+        fig.add_trace(go.Scatter(
+            x=months,
+            y=np.asarray(values, dtype=float),
+            mode="lines+markers" if selected else "lines",
+            name=name,
+            line=dict(color=COLORS["primary"], width=4) if selected else dict(width=1.5),
+            opacity=1.0 if selected else 0.7
+        ))
+    fig.update_layout(
+        height=height,
+        showlegend=True,
+        yaxis_title="Update Intensity (z-score)",
+        margin=dict(l=0, r=0, t=10, b=0)
+    )
+    return fig
+
+
+def forecast_chart(df, color=COLORS["secondary"], band_color="rgba(217,119,6,0.2)"):
+    """
+    Forecast line with a shaded confidence band.
+    """
+    months = df["forecast_month"].to_numpy()
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=months,
+        y=df["forecast_value"].to_numpy(dtype=float),
+        mode="lines+markers",
+        name="Forecast",
+        line=dict(color=color, width=3),
+        marker=dict(size=10)
+    ))
+    # Closed polygon: upper bound forwards, lower bound backwards
+    fig.add_trace(go.Scatter(
+        x=np.concatenate([months, months[::-1]]),
+        y=np.concatenate([
+            df["upper_bound"].to_numpy(dtype=float),
+            df["lower_bound"].to_numpy(dtype=float)[::-1]
+        ]),
+        fill="toself",
+        fillcolor=band_color,
+        line=dict(color="rgba(255,255,255,0)"),
+        name="95% CI"
+    ))
+    fig.update_layout(height=400, showlegend=True)
+    return fig
+
+
+def correlation_heatmap(corr):
+    """
+    Interactive heatmap of a correlation matrix (replaces the static PNG).
+    """
+    import plotly.express as px  # Deferred: only the correlation page needs it
+
+    fig = px.imshow(
+        corr,
+        text_auto=".2f",
+        color_continuous_scale="RdBu_r",
+        zmin=-1,
+        zmax=1,
+        aspect="auto",
+        labels={"color": "Correlation"}
     )
     return fig
@@ -0,0 +1,141 @@
+"""
+Watcher for the data files listed in DATA_FILES.
+
+Uses watchdog's native observer (inotify on Linux) when watchdog is
+installed, and otherwise polls file sizes and modification times.
+Bursts of events (e.g. a CSV being rewritten in several writes) are
+debounced into a single callback with the set of changed paths.
+"""
+import logging
+import os
+import threading
+
+from .config import DATA_WATCH_POLL_SECONDS, DATA_WATCH_DEBOUNCE_SECONDS
+
+logger = logging.getLogger(__name__)
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:  # Optional: stat polling is used without it
+    FileSystemEventHandler = object
+    Observer = None
+
+
+def _stat(path):
+    try:
+        stat = os.stat(path)
+        return stat.st_size, stat.st_mtime_ns
+    except OSError:
+        return None
+
+
+class _Debouncer:
+    """
+    Collects changed paths and calls `callback` once they stop changing.
+    """
+
+    def __init__(self, callback, delay):
+        self._callback = callback
+        self._delay = delay
+        self._pending = set()
+        self._timer = None
+        self._lock = threading.Lock()
+
+    def add(self, path):
+        with self._lock:
+            self._pending.add(path)
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(self._delay, self._fire)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _fire(self):
+        with self._lock:
+            paths, self._pending, self._timer = self._pending, set(), None
+        if paths:
+            try:
+                self._callback(paths)
+            except Exception as e:
+                logger.exception("Data watcher callback failed: %s", e)
+
+    def cancel(self):
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+
+
+class _EventHandler(FileSystemEventHandler):
+    def __init__(self, paths, debouncer):
+        super().__init__()
+        self._paths = paths
+        self._debouncer = debouncer
+
+    def on_any_event(self, event):
+        # Atomic replacements show up as moves onto the watched path
+        for path in (event.src_path, getattr(event, "dest_path", "")):
+            path = os.path.abspath(os.fsdecode(path)) if path else ""
+            if path in self._paths:
+                self._debouncer.add(path)
+
+
+class DataWatcher:
+    """
+    Calls `on_change(paths)` when any of the given files is created,
+    rewritten, replaced or deleted.
+
+    Args:
+        paths: Files to watch (their directories are watched)
+        on_change: Callback receiving the set of changed absolute paths
+        poll_interval: Seconds between stat scans when polling
+        debounce: Quiet period before changes are reported
+    """
+
+    def __init__(self, paths, on_change, poll_interval: float = DATA_WATCH_POLL_SECONDS,
+                 debounce: float = DATA_WATCH_DEBOUNCE_SECONDS):
+        self.paths = {os.path.abspath(path) for path in paths}
+        self.poll_interval = poll_interval
+        self._debouncer = _Debouncer(on_change, debounce)
+        self._stop = threading.Event()
+        self._observer = None
+        self._thread = None
+
+    @property
+    def mode(self) -> str:
+        return "native" if self._observer is not None else "polling"
+
+    def start(self):
+        directories = {os.path.dirname(path) for path in self.paths}
+        if Observer is not None:
+            try:
+                observer = Observer()
+                handler = _EventHandler(self.paths, self._debouncer)
+                for directory in directories:
+                    if os.path.isdir(directory):
+                        observer.schedule(handler, directory, recursive=False)
+                observer.daemon = True
+                observer.start()
+                self._observer = observer
+                return self
+            except OSError as e:  # e.g. inotify watch limit reached
+                logger.warning("Native file watching unavailable (%s); polling instead", e)
+        self._thread = threading.Thread(target=self._poll, name="data-watcher", daemon=True)
+        self._thread.start()
+        return self
+
+    def _poll(self):
+        last = {path: _stat(path) for path in self.paths}
+        while not self._stop.wait(self.poll_interval):
+            for path in self.paths:
+                current = _stat(path)
+                if current != last[path]:
+                    last[path] = current
+                    self._debouncer.add(path)
+
+    def stop(self):
+        self._stop.set()
+        self._debouncer.cancel()
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join()
@@ -0,0 +1,142 @@
+"""
+Date-range aggregates from per-state prefix sums over months.
+
+compute_prefix_sums lays the monthly rows out on a (state, month) grid
+and stores running totals along the months: row count, months with data,
+update intensity and its square, decay signal, total updates and total
+enrolment. Any window [start, end] is then the difference of two
+columns of each grid, so the mean, standard deviation and totals of
+every state for any date range cost O(states), without rescanning rows.
+
+window_priority turns one window into a priority table (classification
+and risk rank, as notebook 05 does for all time) plus the matching risk
+components, for the dashboard's date-range filter.
+"""
+import numpy as np
+import pandas as pd
+
+from .metrics import classify_states, compute_risk_scores
+
+# Prefix grid -> monthly feature column summed into it
+PREFIX_COLUMNS = {
+    "intensity": "update_intensity",
+    "decay": "update_decay_signal",
+    "updates": "total_updates",
+    "enrolment": "total_enrolment",
+}
+
+RECENT_MONTHS = 3  # Latest months of a window averaged for recent intensity (as in notebook 05)
+
+
+def compute_prefix_sums(df: pd.DataFrame) -> dict:
+    """
+    Per-state cumulative sums over months.
+
+    Args:
+        df: Monthly feature data (state, year_month and PREFIX_COLUMNS)
+
+    Returns:
+        Dictionary with states, months, shift (each state's mean intensity,
+        subtracted before summing to keep the squares well conditioned) and
+        one (states x months + 1) grid per statistic; column m holds the
+        total over months before months[m]
+    """
+    df = df[df["year_month"].notna()]
+    state_codes, states = pd.factorize(df["state"], sort=True)
+    month_codes, months = pd.factorize(df["year_month"], sort=True)
+    n_states, n_months = len(states), len(months)
+    cells = state_codes * n_months + month_codes
+
+    def prefix(values):
+        grid = np.bincount(cells, weights=values, minlength=n_states * n_months).reshape(n_states, n_months)
+        return np.concatenate([np.zeros((n_states, 1)), np.cumsum(grid, axis=1)], axis=1)
+
+    intensity = df["update_intensity"].to_numpy(dtype=float)
+    valid = np.isfinite(intensity)
+    counts = np.bincount(state_codes[valid], minlength=n_states)
+    shift = np.bincount(state_codes[valid], weights=intensity[valid], minlength=n_states) / np.maximum(counts, 1)
+    centred = np.where(valid, intensity - shift[state_codes], 0.0)
+
+    sums = {"rows": prefix(valid.astype(float)), "intensity_sq": prefix(centred ** 2)}
+    sums["intensity"] = prefix(centred)
+    for name, column in PREFIX_COLUMNS.items():
+        if name != "intensity":
+            sums[name] = prefix(np.nan_to_num(df[column].to_numpy(dtype=float), posinf=0.0, neginf=0.0))
+    present = np.bincount(cells, minlength=n_states * n_months).reshape(n_states, n_months) > 0
+    sums["active"] = np.concatenate([np.zeros((n_states, 1)), np.cumsum(present, axis=1)], axis=1)
+
+    return {"states": states.to_numpy(), "months": months.to_numpy(), "shift": shift, **sums}
+
+
+def _month_range(prefix, start, end):
+    """Grid column bounds [first, last) of the months within [start, end]."""
+    months = prefix["months"]
+    first = 0 if start is None else int(np.searchsorted(months, pd.Timestamp(start).to_datetime64(), "left"))
+    last = len(months) if end is None else int(np.searchsorted(months, pd.Timestamp(end).to_datetime64(), "right"))
+    return first, max(first, last)
+
+
+def window_summary(prefix: dict, start=None, end=None) -> pd.DataFrame:
+    """
+    Per-state aggregates over the months in [start, end] (None: open end).
+
+    Returns:
+        DataFrame with state, avg/recent/std update intensity, average decay
+        signal, total updates and enrolment, and active months. States with
+        no data in the window have NaN averages and zero totals.
+    """
+    first, last = _month_range(prefix, start, end)
+    recent_first = max(first, last - RECENT_MONTHS)
+
+    def total(name, lo=first):
+        return prefix[name][:, last] - prefix[name][:, lo]
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        n = total("rows")
+        s1, s2 = total("intensity"), total("intensity_sq")
+        variance = np.maximum(s2 - s1 * s1 / n, 0.0) / (n - 1)
+        recent_n = total("rows", recent_first)
+        return pd.DataFrame({
+            "state": prefix["states"],
+            "avg_update_intensity": np.where(n > 0, prefix["shift"] + s1 / n, np.nan),
+            "recent_update_intensity": np.where(
+                recent_n > 0, prefix["shift"] + total("intensity", recent_first) / recent_n, np.nan),
+            "std_update_intensity": np.where(n > 1, np.sqrt(variance), np.nan),
+            "avg_decay_signal": np.where(n > 0, total("decay") / n, np.nan),
+            "total_updates": total("updates"),
+            "total_enrolment": total("enrolment"),
+            "active_months": total("active").astype(int),
+        })
+
+
+def window_priority(prefix: dict, start=None, end=None, weights: dict = None):
+    """
+    Priority table and risk components for a date window.
+
+    Status uses the dashboard classification (classify_states); the risk
+    score uses the notebook 05 components with update volatility taken as
+    the std of update intensity within the window.
+
+    Returns:
+        Tuple of (priority DataFrame with the priority table's columns plus
+        the window totals, risk components as from compute_risk_components)
+    """
+    summary = window_summary(prefix, start, end)
+    summary = summary[summary["active_months"] > 0].reset_index(drop=True)
+    components = {
+        "states": summary["state"].to_numpy(),
+        "decay": -summary["avg_decay_signal"].to_numpy(),
+        "volatility": summary["std_update_intensity"].to_numpy(),
+        "recency": 1.0 / (summary["recent_update_intensity"].to_numpy() + 1.0),
+    }
+    summary["state_status"] = classify_states(
+        summary["avg_update_intensity"].to_numpy(),
+        summary["recent_update_intensity"].to_numpy(),
+        summary["avg_decay_signal"].to_numpy(),
+    )
+    summary["priority_rank"] = pd.Series(compute_risk_scores(components, weights)).rank(
+        ascending=False, method="dense").astype(int)
+    columns = ["priority_rank", "state", "state_status", "avg_update_intensity", "recent_update_intensity",
+               "active_months", "std_update_intensity", "total_updates", "total_enrolment"]
+    priority = summary.sort_values("priority_rank", kind="stable")[columns].reset_index(drop=True)
+    return priority, components
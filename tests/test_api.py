@@ -0,0 +1,53 @@
+"""
+Request framing and response headers of the JSON API.
+"""
+import pytest
+
+from src.api import AnalyticsAPI, _content_length, _encode, _error
+from src.config import API_MAX_BODY_BYTES
+
+
+@pytest.mark.parametrize("headers, expected", [
+    ({}, 0),
+    ({"content-length": ""}, 0),
+    ({"content-length": "0"}, 0),
+    ({"content-length": " 12 "}, 12),
+    ({"content-length": str(API_MAX_BODY_BYTES)}, API_MAX_BODY_BYTES),
+])
+def test_valid_content_length(headers, expected):
+    assert _content_length(headers) == expected
+
+
+@pytest.mark.parametrize("value", ["abc", "-5", "1.5", "0x10", "²", str(API_MAX_BODY_BYTES + 1)])
+def test_invalid_content_length(value):
+    with pytest.raises(ValueError):
+        _content_length({"content-length": value})
+
+
+def _head(raw: bytes):
+    head, _, body = raw.partition(b"\r\n\r\n")
+    status_line, *lines = head.decode("latin-1").split("\r\n")
+    headers = dict(line.split(": ", 1) for line in lines)
+    return int(status_line.split()[1]), headers, body
+
+
+def test_method_not_allowed_lists_allowed_methods():
+    raw = AnalyticsAPI._serialize(_error(405, "Method POST not allowed"), {}, "POST", False)
+    status, headers, body = _head(raw)
+    assert status == 405
+    assert headers["Allow"] == "GET, HEAD"
+    assert headers["Content-Length"] == str(len(body))
+
+
+def test_not_modified_has_no_content_length():
+    response = _encode(200, {"ok": True})
+    status, headers, body = _head(AnalyticsAPI._serialize(response, {}, "GET", True))
+    assert status == 200
+    assert headers["Content-Length"] == str(len(body))
+
+    raw = AnalyticsAPI._serialize(response, {"if-none-match": headers["ETag"]}, "GET", True)
+    status, headers, body = _head(raw)
+    assert status == 304
+    assert "Content-Length" not in headers
+    assert "Allow" not in headers
+    assert body == b""
@@ -0,0 +1,59 @@
+"""
+Percentile and BCa bootstrap intervals of per-state means.
+"""
+import numpy as np
+import pandas as pd
+
+from src.bootstrap import bootstrap_confidence_intervals, bootstrap_means, build_samples
+
+
+def _frame(samples):
+    return pd.DataFrame([(state, value) for state, values in samples.items() for value in values],
+                        columns=["state", "update_intensity"])
+
+
+def test_normal_sample_interval_contains_mean():
+    rng = np.random.default_rng(7)
+    df = _frame({"A": rng.normal(10, 2, 40), "B": rng.normal(-3, 1, 25)})
+    result = bootstrap_confidence_intervals(df, n_resamples=4000, seed=11, n_jobs=1).set_index("state")
+
+    for state, group in df.groupby("state"):
+        row = result.loc[state]
+        sample = group["update_intensity"]
+        assert row["n"] == len(sample)
+        assert np.isclose(row["mean"], sample.mean())
+        assert row["ci_lower"] < row["mean"] < row["ci_upper"]
+        assert row["bca_lower"] < row["mean"] < row["bca_upper"]
+        # Roughly the normal-theory interval for a symmetric sample
+        half_width = 1.96 * sample.std() / np.sqrt(len(sample))
+        assert np.isclose(row["ci_upper"] - row["ci_lower"], 2 * half_width, rtol=0.15)
+        assert np.isclose(row["bca_upper"] - row["bca_lower"], 2 * half_width, rtol=0.15)
+
+
+def test_same_seed_same_intervals():
+    rng = np.random.default_rng(3)
+    df = _frame({"A": rng.exponential(5, 12), "B": rng.exponential(1, 9)})
+    first = bootstrap_confidence_intervals(df, n_resamples=2000, seed=5, n_jobs=1)
+    second = bootstrap_confidence_intervals(df, n_resamples=2000, seed=5, n_jobs=1)
+    pd.testing.assert_frame_equal(first, second)
+
+
+def test_constant_sample_collapses_both_intervals():
+    df = _frame({"FLAT": [4.0] * 12, "ONE": [9.0]})
+    result = bootstrap_confidence_intervals(df, n_resamples=1000, seed=1, n_jobs=1).set_index("state")
+
+    flat = result.loc["FLAT"]
+    # No spread: zero acceleration and clipped bias correction, not NaN
+    for column in ["ci_lower", "ci_upper", "bca_lower", "bca_upper"]:
+        assert flat[column] == 4.0
+    # A single observation has no interval
+    assert result.loc["ONE", ["ci_lower", "ci_upper", "bca_lower", "bca_upper"]].isna().all()
+
+
+def test_resamples_ignore_padding():
+    df = _frame({"LONG": [1.0, 2.0, 3.0, 4.0], "SHORT": [100.0, 100.0]})
+    states, values, counts = build_samples(df)
+    boot = bootstrap_means(values, counts, n_resamples=500, seed=2, n_jobs=1)
+    assert boot.shape == (2, 500)
+    assert boot[0].min() >= 1.0 and boot[0].max() <= 4.0
+    assert np.all(boot[1] == 100.0)
@@ -0,0 +1,47 @@
+"""
+PELT against exhaustive search over every segmentation of short series.
+"""
+import itertools
+
+import numpy as np
+import pytest
+
+from src.changepoint import pelt
+
+
+def segmentation_cost(x, ends, penalty):
+    start, cost = 0, 0.0
+    for end in ends:
+        segment = x[start:end]
+        cost += ((segment - segment.mean()) ** 2).sum() + penalty
+        start = end
+    return cost
+
+
+def brute_force_cost(x, penalty, min_size):
+    n = len(x)
+    best = segmentation_cost(x, [n], penalty)
+    for k in range(1, n // min_size):
+        for splits in itertools.combinations(range(min_size, n - min_size + 1), k):
+            bounds = (0,) + splits + (n,)
+            if all(b - a >= min_size for a, b in zip(bounds, bounds[1:])):
+                best = min(best, segmentation_cost(x, list(splits) + [n], penalty))
+    return best
+
+
+@pytest.mark.parametrize("min_size", [1, 2, 3])
+def test_pelt_matches_brute_force(min_size):
+    rng = np.random.default_rng(min_size)
+    for _ in range(150):
+        n = int(rng.integers(2 * min_size, 12))
+        x = rng.normal(size=n) * rng.uniform(0.5, 5)
+        x[rng.integers(1, n):] += rng.normal() * 3
+        penalty = float(rng.uniform(0.1, 10))
+        ends = pelt(x, penalty, min_size)
+        assert ends[-1] == n
+        assert all(b - a >= min_size for a, b in zip([0] + ends, ends))
+        assert segmentation_cost(x, ends, penalty) == pytest.approx(brute_force_cost(x, penalty, min_size))
+
+
+def test_short_series_is_one_segment():
+    assert pelt(np.array([1.0, 5.0, 2.0]), penalty=0.1, min_size=2) == [3]
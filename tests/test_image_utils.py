@@ -0,0 +1,30 @@
+"""
+Derivative generation from RGB and transparent sources.
+"""
+import pytest
+from PIL import Image
+
+from src.image_utils import generate_image_derivatives, get_image_derivative
+
+
+@pytest.mark.parametrize("mode, color, ext", [
+    ("RGB", (200, 30, 30), "png"),
+    ("RGB", (200, 30, 30), "jpg"),
+    ("RGBA", (200, 30, 30, 0), "png"),
+    ("P", 3, "png"),
+])
+def test_generate_derivatives(tmp_path, mode, color, ext):
+    source = tmp_path / f"chart.{ext}"
+    Image.new(mode, (1000, 500), color).save(source)
+    out = tmp_path / "derivatives"
+
+    paths = generate_image_derivatives(str(source), widths=(480, 1440), formats=("jpeg",),
+                                       derivative_dir=str(out))
+
+    assert len(paths) == 2
+    sizes = [Image.open(path).size for path in paths]
+    assert sizes == [(480, 240), (1000, 500)]
+    if mode == "RGBA":
+        # Fully transparent pixels are composited onto white
+        assert Image.open(paths[0]).convert("RGB").getpixel((10, 10)) == (255, 255, 255)
+    assert get_image_derivative(str(source), 1000, derivative_dir=str(out)) == open(paths[1], "rb").read()
@@ -0,0 +1,53 @@
+"""
+Code digests of pipeline stages.
+"""
+import importlib
+import sys
+
+from src.pipeline import code_digest
+
+
+def _make_package(root):
+    package = root / "digestpkg"
+    package.mkdir()
+    (package / "__init__.py").write_text("")
+    (package / "helpers.py").write_text("SCALE = 2\n")
+    (package / "late.py").write_text("OFFSET = 1\n")
+    (package / "stages.py").write_text(
+        "from .helpers import SCALE\n"
+        "\n"
+        "def _double(x):\n"
+        "    return x * SCALE\n"
+        "\n"
+        "def stage(x):\n"
+        "    from . import late\n"
+        "    return _double(x) + late.OFFSET\n"
+    )
+    return package
+
+
+def _digest(package, monkeypatch):
+    for name in [m for m in sys.modules if m.startswith("digestpkg")]:
+        monkeypatch.delitem(sys.modules, name)
+    importlib.invalidate_caches()
+    return code_digest(importlib.import_module("digestpkg.stages").stage)
+
+
+def test_digest_follows_helpers_and_imported_modules(tmp_path, monkeypatch):
+    monkeypatch.syspath_prepend(str(tmp_path))
+    package = _make_package(tmp_path)
+    baseline = _digest(package, monkeypatch)
+    assert _digest(package, monkeypatch) == baseline
+
+    edits = [
+        ("stages.py", "    return x * SCALE\n", "    return x * SCALE + 0\n"),
+        ("helpers.py", "SCALE = 2\n", "SCALE = 3\n"),
+        ("late.py", "OFFSET = 1\n", "OFFSET = 5\n"),
+    ]
+    seen = {baseline}
+    for filename, old, new in edits:
+        path = package / filename
+        path.write_text(path.read_text().replace(old, new))
+        digest = _digest(package, monkeypatch)
+        assert digest not in seen, filename
+        seen.add(digest)
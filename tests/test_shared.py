@@ -0,0 +1,90 @@
+"""
+Write paths on shared (frozen) frames: every one must raise before the
+frame, or the frame it was frozen from, changes.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.shared import ReadOnlyFrame, freeze, freeze_frame
+
+
+@pytest.fixture
+def source():
+    return pd.DataFrame({
+        "state": ["KERALA", "GOA", "ASSAM"],
+        "avg_update_intensity": [1.5, 2.5, 0.5],
+        "active_months": [12, 11, 10],
+    })
+
+
+@pytest.fixture
+def shared(source):
+    return freeze_frame(source)
+
+
+WRITES = {
+    "setitem": lambda f: f.__setitem__("state", "X"),
+    "setitem_new": lambda f: f.__setitem__("new", 1),
+    "delitem": lambda f: f.__delitem__("state"),
+    "loc": lambda f: f.loc.__setitem__((0, "state"), "X"),
+    "loc_numeric": lambda f: f.loc.__setitem__((0, "avg_update_intensity"), 9.0),
+    "loc_row": lambda f: f.loc.__setitem__(5, ["X", 1.0, 1]),
+    "iloc": lambda f: f.iloc.__setitem__((0, 0), "X"),
+    "at": lambda f: f.at.__setitem__((0, "state"), "X"),
+    "iat": lambda f: f.iat.__setitem__((0, 0), "X"),
+    "attribute": lambda f: setattr(f, "state", "X"),
+    "columns": lambda f: setattr(f, "columns", ["a", "b", "c"]),
+    "index": lambda f: setattr(f, "index", [7, 8, 9]),
+    "insert": lambda f: f.insert(0, "new", 1),
+    "pop": lambda f: f.pop("state"),
+    "update": lambda f: f.update(pd.DataFrame({"state": ["X"]})),
+    "rename": lambda f: f.rename(columns={"state": "name"}, inplace=True),
+    "reset_index": lambda f: f.reset_index(inplace=True),
+    "set_index": lambda f: f.set_index("state", inplace=True),
+    "drop": lambda f: f.drop(columns="state", inplace=True),
+    "fillna": lambda f: f.fillna(0, inplace=True),
+    "replace": lambda f: f.replace("GOA", "X", inplace=True),
+    "sort_values": lambda f: f.sort_values("state", inplace=True),
+    "sort_index": lambda f: f.sort_index(ascending=False, inplace=True),
+    "query": lambda f: f.query("active_months > 10", inplace=True),
+    "eval": lambda f: f.eval("x = active_months * 2", inplace=True),
+}
+
+
+@pytest.mark.parametrize("write", list(WRITES))
+def test_write_paths_raise_without_mutating(source, shared, write):
+    before = source.copy()
+    with pytest.raises(TypeError):
+        WRITES[write](shared)
+    pd.testing.assert_frame_equal(pd.DataFrame(shared), before)
+    pd.testing.assert_frame_equal(source, before)
+
+
+def test_numeric_arrays_are_read_only(shared):
+    with pytest.raises(ValueError):
+        shared["avg_update_intensity"].to_numpy()[0] = 9.0
+
+
+def test_reads_and_derived_frames_work(shared):
+    assert shared.loc[0, "state"] == "KERALA"
+    assert shared.iloc[1]["state"] == "GOA"
+    assert shared.at[2, "active_months"] == 10
+    assert shared.loc[shared["active_months"] > 10, "state"].tolist() == ["KERALA", "GOA"]
+    derived = shared[shared["avg_update_intensity"] > 1]
+    assert type(derived) is pd.DataFrame
+    derived.loc[:, "state"] = "X"
+    renamed = shared.rename(columns={"state": "name"})
+    assert "name" in renamed and "state" in shared
+    assert shared.sort_values("state")["state"].tolist() == ["ASSAM", "GOA", "KERALA"]
+    assert shared.copy().assign(x=1).shape == (3, 4)
+
+
+def test_freeze_nested_containers(source):
+    frozen = freeze({"table": source, "values": np.arange(3), "rows": [source]})
+    assert isinstance(frozen["table"], ReadOnlyFrame)
+    assert isinstance(frozen["rows"][0], ReadOnlyFrame)
+    with pytest.raises(TypeError):
+        frozen["new"] = 1
+    with pytest.raises(ValueError):
+        frozen["values"][0] = 5
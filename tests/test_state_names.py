@@ -0,0 +1,44 @@
+"""
+Fuzzy state-name resolution.
+"""
+import pytest
+
+from src.preprocessing import INVALID_STATE_ENTRIES, STATE_NAME_MAPPING
+from src.state_names import StateNameResolver
+
+
+@pytest.fixture(scope="module")
+def resolver():
+    return StateNameResolver(aliases=STATE_NAME_MAPPING, invalid=INVALID_STATE_ENTRIES, lookup_path=None)
+
+
+@pytest.mark.parametrize("raw, expected", [
+    ("WESTBENGAL", "WEST BENGAL"),
+    ("west  bengal", "WEST BENGAL"),
+    ("KERELA", "KERALA"),
+    ("ANDAMAN AND NICOBAR ISLAND", "ANDAMAN AND NICOBAR ISLANDS"),
+])
+def test_close_spellings_resolve(resolver, raw, expected):
+    assert resolver.resolve(raw) == expected
+
+
+@pytest.mark.parametrize("raw", [
+    "ANDAMAN AND NICOBAR ISLANDS 0001",
+    "DADRA AND NAGAR HAVELI AND DAMAN AND DIU 0001",
+    "SYN0001 DADRA AND NAGAR HAVELI AND DAMAN AND DIU",
+])
+def test_suffixed_long_names_stay_unresolved(resolver, raw):
+    assert resolver.resolve(raw) == raw
+    assert resolver.score(raw)["method"] == "unresolved"
+
+
+def test_lookup_file_written_and_reused(tmp_path):
+    path = tmp_path / "lookup.json"
+    first = StateNameResolver(lookup_path=str(path))
+    assert first.resolve("WESTBENGAL") == "WEST BENGAL"
+    assert path.exists()
+    second = StateNameResolver(lookup_path=str(path))
+    assert second._entries["WESTBENGAL"]["state"] == "WEST BENGAL"
+    stricter = StateNameResolver(lookup_path=str(path), max_edits=0)
+    assert "WESTBENGAL" not in stricter._entries
+    assert stricter.resolve("WESTBENGAL") == "WESTBENGAL"